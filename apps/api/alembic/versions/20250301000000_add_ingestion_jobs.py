@@ -0,0 +1,53 @@
+"""Add ingestion_jobs table (durable queue consumed by app.worker)."""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250301000000"
+down_revision: Union[str, None] = "20250228140000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.Uuid(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("document_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", name="ingestionjobstatus"),
+            server_default="queued",
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_attempts", sa.Integer(), server_default="5", nullable=False),
+        sa.Column("run_after", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("locked_by", sa.Text(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ingestion_jobs_status_run_after",
+        "ingestion_jobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_ingestion_jobs_document_id",
+        "ingestion_jobs",
+        ["document_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_jobs_document_id", table_name="ingestion_jobs")
+    op.drop_index("ix_ingestion_jobs_status_run_after", table_name="ingestion_jobs")
+    op.drop_table("ingestion_jobs")
+    op.execute("DROP TYPE IF EXISTS ingestionjobstatus")
@@ -0,0 +1,27 @@
+"""Add embedding_cache keyed by (model, dim, content_hash)."""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+revision: str = "20250302000000"
+down_revision: Union[str, None] = "20250301000000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("dim", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.Text(), nullable=False),
+        sa.Column("embedding", Vector(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("model", "dim", "content_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
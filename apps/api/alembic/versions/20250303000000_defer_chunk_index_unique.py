@@ -0,0 +1,41 @@
+"""Make UNIQUE(document_id, chunk_index) deferrable.
+
+Incremental reingest rewrites chunk_index in place; checking the constraint at
+commit lets rows swap positions without a temporary renumbering pass.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "20250303000000"
+down_revision: Union[str, None] = "20250302000000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(
+        "uq_document_chunks_document_id_chunk_index",
+        "document_chunks",
+        type_="unique",
+    )
+    op.create_unique_constraint(
+        "uq_document_chunks_document_id_chunk_index",
+        "document_chunks",
+        ["document_id", "chunk_index"],
+        deferrable=True,
+        initially="DEFERRED",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_document_chunks_document_id_chunk_index",
+        "document_chunks",
+        type_="unique",
+    )
+    op.create_unique_constraint(
+        "uq_document_chunks_document_id_chunk_index",
+        "document_chunks",
+        ["document_id", "chunk_index"],
+    )
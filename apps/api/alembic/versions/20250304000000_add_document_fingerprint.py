@@ -0,0 +1,26 @@
+"""Add documents.content_sha256 and pipeline_version for whole-document dedupe."""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20250304000000"
+down_revision: Union[str, None] = "20250303000000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("content_sha256", sa.String(64), nullable=True))
+    op.add_column("documents", sa.Column("pipeline_version", sa.String(), nullable=True))
+    op.create_index(
+        "ix_documents_content_sha256_pipeline_version",
+        "documents",
+        ["content_sha256", "pipeline_version"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_content_sha256_pipeline_version", table_name="documents")
+    op.drop_column("documents", "pipeline_version")
+    op.drop_column("documents", "content_sha256")
@@ -0,0 +1,69 @@
+"""Replace the float32 HNSW index on document_chunks.embedding with one on embedding_short.
+
+embedding_short is the 256-dim Matryoshka prefix of embedding, L2-normalised: what
+ingestion writes (shorten_matrix). Existing rows are backfilled with plain array
+arithmetic, so no pgvector >= 0.7 functions are needed. Retrieval
+(RETRIEVAL_QUANTIZATION=short) takes candidates from the prefix index and reranks
+them on the float32 vectors by id.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+revision: str = "20250306000000"
+down_revision: Union[str, None] = "20250304000000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SHORT_EMBEDDING_DIM = 256
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_chunks",
+        sa.Column("embedding_short", Vector(SHORT_EMBEDDING_DIM), nullable=True),
+    )
+    # Zero prefixes stay zero, as in shorten_matrix
+    op.execute(
+        f"""
+        UPDATE document_chunks c
+        SET embedding_short = CAST(
+            ARRAY(
+                SELECT u.x / COALESCE(NULLIF(n.norm, 0), 1)
+                FROM unnest(p.prefix) WITH ORDINALITY AS u(x, i)
+                ORDER BY u.i
+            ) AS vector({SHORT_EMBEDDING_DIM})
+        )
+        FROM (
+            SELECT id, (CAST(embedding AS real[]))[1:{SHORT_EMBEDDING_DIM}] AS prefix
+            FROM document_chunks
+            WHERE embedding IS NOT NULL
+        ) p
+        CROSS JOIN LATERAL (SELECT sqrt(sum(x * x)) AS norm FROM unnest(p.prefix) AS x) n
+        WHERE c.id = p.id
+        """
+    )
+    op.create_index(
+        "ix_document_chunks_embedding_short_hnsw",
+        "document_chunks",
+        ["embedding_short"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding_short": "vector_cosine_ops"},
+    )
+    op.drop_index("ix_document_chunks_embedding_hnsw", table_name="document_chunks")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_document_chunks_embedding_hnsw",
+        "document_chunks",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+    op.drop_index("ix_document_chunks_embedding_short_hnsw", table_name="document_chunks")
+    op.drop_column("document_chunks", "embedding_short")
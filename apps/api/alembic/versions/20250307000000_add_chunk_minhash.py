@@ -0,0 +1,37 @@
+"""Add document_chunks.minhash / minhash_bands (near-duplicate detection) with a GIN index.
+
+Existing rows are not backfilled here: signatures are computed in Python, so rows
+written before this revision get them the next time their document is ingested
+(chunk sync fills them in on kept rows). Until then they are never found as
+near-duplicates.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "20250307000000"
+down_revision: Union[str, None] = "20250306000000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("document_chunks", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "document_chunks",
+        sa.Column("minhash_bands", postgresql.ARRAY(sa.BigInteger()), nullable=True),
+    )
+    op.create_index(
+        "ix_document_chunks_minhash_bands",
+        "document_chunks",
+        ["minhash_bands"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_chunks_minhash_bands", table_name="document_chunks")
+    op.drop_column("document_chunks", "minhash_bands")
+    op.drop_column("document_chunks", "minhash")
@@ -0,0 +1,212 @@
+"""
+Command-line tools.
+
+    python -m app.cli ingest-dir <path> --user-id <uuid> [--concurrency N] [--enqueue]
+
+ingest-dir stores every *.pdf in a directory, creates its document rows, and
+ingests them in this process: documents run concurrently through run_ingestion
+and share one PDF worker pool and one coalescing embedding engine, so chunks
+from different documents go out in the same embedding requests. --enqueue
+hands the documents to app.worker instead. Prints docs/sec and failures.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.models import Document, User
+from app.services.embedding_cache import get_cache_stats
+from app.services.embedding_providers import get_embedding_provider
+from app.services.embeddings import CoalescingEmbeddingEngine, EmbeddingEngine
+from app.services.ingestion import run_ingestion
+from app.services.job_queue import enqueue_ingestions
+from app.services.openai_client import close_openai_client
+from app.services.pdf_pool import shutdown_extraction_pool
+from app.services.storage import get_storage, make_document_key
+
+logger = logging.getLogger("app.cli")
+
+
+@dataclass
+class IngestReport:
+    total: int = 0
+    succeeded: int = 0
+    failures: list[tuple[str, str]] = field(default_factory=list)  # (filename, error)
+    elapsed_s: float = 0.0
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.succeeded / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def _find_pdfs(path: Path) -> list[Path]:
+    return sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+async def _ensure_user(user_id: uuid.UUID) -> None:
+    async with async_session_maker() as db:
+        result = await db.execute(select(User).where(User.id == user_id))
+        if not result.scalar_one_or_none():
+            db.add(User(id=user_id, email=f"{user_id}@temp.local"))
+            await db.commit()
+
+
+async def _register(
+    files: list[Path], user_id: uuid.UUID, concurrency: int, report: IngestReport
+) -> dict[uuid.UUID, str]:
+    """Create document rows and copy files into storage. Returns {document_id: filename} stored."""
+    storage = get_storage()
+    max_bytes = settings.max_pdf_mb * 1024 * 1024
+    sem = asyncio.Semaphore(concurrency)
+
+    async with async_session_maker() as db:
+        docs = []
+        for f in files:
+            if f.stat().st_size > max_bytes:
+                report.failures.append((f.name, f"PDF too large (max {settings.max_pdf_mb} MB)"))
+                continue
+            doc = Document(user_id=user_id, filename=f.name, s3_key="", status="pending")
+            db.add(doc)
+            docs.append((doc, f))
+        await db.flush()
+
+        async def _upload(doc: Document, f: Path) -> None:
+            doc.s3_key = make_document_key(user_id, doc.id, f.name)
+            try:
+                async with sem:
+                    await asyncio.to_thread(storage.upload_file, doc.s3_key, str(f))
+            except Exception as e:
+                doc.status = "failed"
+                doc.error_message = f"Upload failed: {e}"[:2000]
+                report.failures.append((f.name, doc.error_message))
+                return
+            doc.status = "processing"
+
+        await asyncio.gather(*(_upload(doc, f) for doc, f in docs))
+        await db.commit()
+    return {doc.id: f.name for doc, f in docs if doc.status == "processing"}
+
+
+async def _ingest_all(
+    stored: dict[uuid.UUID, str],
+    concurrency: int,
+    report: IngestReport,
+    engine: EmbeddingEngine,
+) -> None:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(document_id: uuid.UUID) -> None:
+        async with sem:
+            try:
+                await run_ingestion(document_id, raise_errors=True, engine=engine)
+            except Exception:
+                pass  # recorded on the document; collected below
+
+    await asyncio.gather(*(_one(d) for d in stored))
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Document.id, Document.status, Document.error_message).where(
+                Document.id.in_(list(stored))
+            )
+        )
+        for row in result:
+            if row.status == "ready":
+                report.succeeded += 1
+            else:
+                report.failures.append((stored[row.id], row.error_message or row.status))
+
+
+async def ingest_dir(
+    path: Path,
+    user_id: uuid.UUID,
+    concurrency: int,
+    enqueue: bool = False,
+    coalesce_ms: float = 20.0,
+) -> IngestReport:
+    files = _find_pdfs(path)
+    report = IngestReport(total=len(files))
+    started = time.perf_counter()
+    await _ensure_user(user_id)
+    stored = await _register(files, user_id, concurrency, report)
+
+    if enqueue:
+        async with async_session_maker() as db:
+            await enqueue_ingestions(db, list(stored))
+            await db.commit()
+        logger.info("enqueued %s documents for app.worker", len(stored))
+    else:
+        try:
+            engine = CoalescingEmbeddingEngine(window_ms=coalesce_ms)
+            await _ingest_all(stored, concurrency, report, engine)
+        finally:
+            await shutdown_extraction_pool()
+            await close_openai_client()
+        logger.info("embedding cache: %s", get_cache_stats())
+    report.elapsed_s = time.perf_counter() - started
+    return report
+
+
+def _print_report(report: IngestReport, enqueued: bool) -> None:
+    if enqueued:
+        print(f"files={report.total} enqueued={report.total - len(report.failures)}")
+    else:
+        print(
+            f"files={report.total} ready={report.succeeded} failed={len(report.failures)} "
+            f"elapsed={report.elapsed_s:.1f}s docs/sec={report.docs_per_sec:.2f}"
+        )
+    for filename, error in report.failures:
+        print(f"  FAILED {filename}: {error}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Command-line tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("ingest-dir", help="Store and ingest every PDF in a directory")
+    p.add_argument("path", type=Path)
+    p.add_argument("--user-id", type=uuid.UUID, required=True, help="Owner of the new documents")
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(4, settings.worker_concurrency),
+        help="Documents ingested (and files uploaded) at once",
+    )
+    p.add_argument(
+        "--coalesce-ms",
+        type=float,
+        default=20.0,
+        help="Window for merging concurrent documents' chunks into shared embedding requests",
+    )
+    p.add_argument("--enqueue", action="store_true", help="Enqueue jobs for app.worker instead")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(name)s - %(message)s")
+    if not args.path.is_dir():
+        parser.error(f"not a directory: {args.path}")
+    provider = get_embedding_provider()
+    if not provider.is_configured():
+        parser.error(provider.not_configured_detail)
+    report = asyncio.run(
+        ingest_dir(
+            args.path,
+            args.user_id,
+            max(1, args.concurrency),
+            enqueue=args.enqueue,
+            coalesce_ms=args.coalesce_ms,
+        )
+    )
+    _print_report(report, args.enqueue)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,10 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 _ROOT = Path(__file__).resolve().parent.parent.parent.parent
 _ROOT_ENV = str(_ROOT / ".env")
 
+# Matryoshka prefix stored in document_chunks.embedding_short and searched by the ANN
+# index: the first N dims of the embedding, re-normalised. Fixed by the schema.
+SHORT_EMBEDDING_DIM = 256
+
 
 class Settings(BaseSettings):
     # Load root .env so OPENAI_API_KEY etc work when API runs from apps/api/ or project root
@@ -25,24 +29,62 @@ class Settings(BaseSettings):
     s3_bucket: str | None = None
     aws_access_key_id: str | None = None
     aws_secret_access_key: str | None = None
+    s3_parallel_threshold_mb: int = 4  # S3_PARALLEL_THRESHOLD_MB (ranged GETs at/above this size)
+    s3_part_size_mb: int = 2  # S3_PART_SIZE_MB (bytes per ranged GET)
+    s3_download_concurrency: int = 8  # S3_DOWNLOAD_CONCURRENCY (ranged GETs in flight)
 
     # Hard limits (config via env)
     max_pdf_mb: int = 10  # MAX_PDF_MB
-    max_pdf_pages: int = 20  # MAX_PDF_PAGES
+    max_pdf_pages: int = 100  # MAX_PDF_PAGES
     max_chunks_per_doc: int = 300  # MAX_CHUNKS_PER_DOC
     top_k_max: int = 8  # TOP_K_MAX
     max_completion_tokens: int = 500  # MAX_COMPLETION_TOKENS
+    ingest_documents_per_day: int = 3  # INGEST_DOCUMENTS_PER_DAY (per user, /ingest)
+    ingest_batch_documents_per_day: int = 5000  # INGEST_BATCH_DOCUMENTS_PER_DAY (per user, /ingest-batch backfills)
 
     # Chunking (JD uses jd_chunking; these retained for potential generic docs)
     chunk_size: int = 512  # CHUNK_SIZE (legacy)
     min_chunk_chars: int = 25  # MIN_CHUNK_CHARS
     top_n_candidates: int = 50  # Fetch N by pgvector similarity before MMR
     mmr_lambda: float = 0.7  # MMR: lambda*sim(q,d) - (1-lambda)*max_sim(d,selected)
+    retrieval_quantization: str = "short"  # RETRIEVAL_QUANTIZATION (short: the ANN index | none: exact scan)
+    retrieval_rerank_factor: int = 4  # RETRIEVAL_RERANK_FACTOR (quantized candidates per final candidate)
+
+    # PDF extraction worker pool
+    pdf_workers: int = 2  # PDF_WORKERS (pre-warmed extraction processes)
+    pdf_min_pages_per_job: int = 10  # PDF_MIN_PAGES_PER_JOB (split page ranges across workers above this)
+    pdf_job_timeout_s: float = 60.0  # PDF_JOB_TIMEOUT_S (wall clock per job)
+    pdf_job_cpu_s: int = 30  # PDF_JOB_CPU_S (CPU time per job)
+    pdf_worker_memory_mb: int = 1024  # PDF_WORKER_MEMORY_MB (address-space cap per worker)
+
+    # Ingestion job queue (python -m app.worker)
+    worker_concurrency: int = 2  # WORKER_CONCURRENCY (jobs in flight per worker process)
+    job_lease_s: float = 120.0  # JOB_LEASE_S (heartbeat renews every lease/3)
+    job_max_attempts: int = 5  # JOB_MAX_ATTEMPTS
+    job_retry_base_s: float = 5.0  # JOB_RETRY_BASE_S (exponential backoff base)
+    job_retry_max_s: float = 600.0  # JOB_RETRY_MAX_S
+    job_poll_interval_s: float = 1.0  # JOB_POLL_INTERVAL_S (idle sleep between claims)
+    worker_drain_timeout_s: float = 300.0  # WORKER_DRAIN_TIMEOUT_S (finish in-flight jobs on shutdown)
+    worker_coalesce_ms: float = 20.0  # WORKER_COALESCE_MS (concurrency > 1: jobs share embedding batches; 0 disables)
 
     # OpenAI embeddings
     openai_api_key: str | None = None  # OPENAI_API_KEY
+    openai_max_connections: int = 20  # OPENAI_MAX_CONNECTIONS (shared HTTP pool, per process)
+    openai_max_keepalive: int = 10  # OPENAI_MAX_KEEPALIVE (idle connections kept warm)
+    openai_keepalive_s: float = 60.0  # OPENAI_KEEPALIVE_S
+    openai_timeout_s: float = 60.0  # OPENAI_TIMEOUT_S
+    openai_max_retries: int = 2  # OPENAI_MAX_RETRIES
+    embedding_provider: str = "openai"  # EMBEDDING_PROVIDER (openai | hashing: local, deterministic, offline)
     openai_embedding_model: str = "text-embedding-3-small"  # OPENAI_EMBEDDING_MODEL
     openai_embedding_dim: int = 1536  # OPENAI_EMBEDDING_DIM (must match DB vector column)
+    embedding_batch_max_tokens: int = 50000  # EMBEDDING_BATCH_MAX_TOKENS (estimated tokens per request)
+    embedding_batch_max_inputs: int = 256  # EMBEDDING_BATCH_MAX_INPUTS (API hard cap is 2048)
+    embedding_concurrency: int = 4  # EMBEDDING_CONCURRENCY (batches in flight at once)
+    embedding_coalesce_ms: float = 0.0  # EMBEDDING_COALESCE_MS (>0: merge concurrent callers' texts into shared batches)
+    ingest_embed_batch_chunks: int = 32  # INGEST_EMBED_BATCH_CHUNKS (new chunks per pipeline embed batch)
+    ingest_queue_size: int = 4  # INGEST_QUEUE_SIZE (batches buffered between pipeline stages)
+    near_dup_threshold: float = 0.85  # NEAR_DUP_THRESHOLD (estimated Jaccard; 0 disables near-duplicate lookups)
+    near_dup_boilerplate_docs: int = 3  # NEAR_DUP_BOILERPLATE_DOCS (near-dups in this many other files of the same user -> boilerplate)
 
     # OpenAI chat (Q&A)
     openai_chat_model: str = "gpt-4o-mini"  # OPENAI_CHAT_MODEL
@@ -4,13 +4,23 @@ from collections import defaultdict
 from time import time
 from typing import Literal
 
-RouteKey = Literal["ask", "retrieve", "documents/ingest", "documents/presign", "documents/confirm"]
+from app.core.config import settings
+
+RouteKey = Literal[
+    "ask",
+    "retrieve",
+    "documents/ingest",
+    "documents/ingest-batch",
+    "documents/presign",
+    "documents/confirm",
+]
 
 # (limit, window_seconds)
 RATE_LIMITS: dict[str, tuple[int, int]] = {
     "ask": (10, 3600),  # 10 per hour
     "retrieve": (60, 3600),  # 60 per hour
     "documents/ingest": (3, 86400),  # 3 per day
+    "documents/ingest-batch": (5, 86400),  # 5 per day (documents also count against INGEST_BATCH_DOCUMENTS_PER_DAY)
     "documents/presign": (10, 86400),  # 10 per day
     "documents/confirm": (20, 86400),  # 20 per day
 }
@@ -26,6 +36,8 @@ def _path_to_route(path: str) -> RouteKey | None:
         return "documents/presign"
     if path == "/documents/confirm":
         return "documents/confirm"
+    if path == "/documents/ingest-batch":
+        return "documents/ingest-batch"
     # /documents/{uuid}/ingest
     if path.startswith("/documents/") and path.endswith("/ingest"):
         return "documents/ingest"
@@ -81,3 +93,46 @@ def check_rate_limit(
 
     timestamps.append(now)
     return True, None
+
+
+# Embedding cost scales with documents, not calls: each ingest route draws from a
+# per-user budget of documents per window. /documents/ingest-batch has its own,
+# larger budget so backfills don't compete with single ingests
+INGEST_DOCUMENTS_WINDOW_S = 86400
+
+
+def _ingest_budget(user_id: str, batch: bool) -> tuple[str, int]:
+    """(store key, limit) of the user's /ingest or /ingest-batch document budget."""
+    if batch:
+        return f"{user_id}:ingest-batch-documents", settings.ingest_batch_documents_per_day
+    return f"{user_id}:ingest-documents", settings.ingest_documents_per_day
+
+
+def consume_ingest_budget(user_id: str, documents: int, batch: bool = False) -> tuple[bool, int | None, int]:
+    """
+    Take `documents` from the user's ingest budget (INGEST_DOCUMENTS_PER_DAY, or
+    INGEST_BATCH_DOCUMENTS_PER_DAY with batch=True), all or nothing. Returns
+    (allowed, retry_after_seconds or None if allowed, remaining).
+    """
+    key, limit = _ingest_budget(user_id, batch)
+    now = time()
+    timestamps = _prune(_store[key], INGEST_DOCUMENTS_WINDOW_S)
+    _store[key] = timestamps
+    remaining = max(0, limit - len(timestamps))
+
+    if documents > remaining:
+        if documents > limit:
+            return False, INGEST_DOCUMENTS_WINDOW_S, remaining
+        # Wait until enough of the oldest entries leave the window
+        oldest_needed = sorted(timestamps)[len(timestamps) + documents - limit - 1]
+        return False, max(1, int(INGEST_DOCUMENTS_WINDOW_S - (now - oldest_needed))), remaining
+
+    timestamps.extend([now] * documents)
+    return True, None, remaining - documents
+
+
+def release_ingest_budget(user_id: str, documents: int, batch: bool = False) -> None:
+    """Give back `documents` taken by consume_ingest_budget whose jobs were never queued."""
+    key, _ = _ingest_budget(user_id, batch)
+    timestamps = _store[key]
+    del timestamps[max(0, len(timestamps) - documents) :]
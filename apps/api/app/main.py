@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
@@ -18,8 +19,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.middleware import DemoGateMiddleware, RateLimitMiddleware
 from app.routers import ask, documents, retrieve
+from app.services.openai_client import close_openai_client, get_openai_client
+from app.services.pdf_pool import extraction_pool_stats, shutdown_extraction_pool
 
-app = FastAPI(title="RAG Assistant API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.openai_api_key:
+        get_openai_client()
+    yield
+    await close_openai_client()
+    await shutdown_extraction_pool()
+
+
+app = FastAPI(title="RAG Assistant API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -48,11 +61,18 @@ async def _check_db() -> tuple[bool, str | None]:
 @app.get("/health")
 async def health():
     ok, err = await _check_db()
+    # Queue depth, worker counts and recent job timings (None until the first extraction)
+    pdf_pool = extraction_pool_stats()
     if ok:
-        return {"status": "ok", "database": "connected"}
+        return {"status": "ok", "database": "connected", "pdf_pool": pdf_pool}
     return JSONResponse(
         status_code=503,
-        content={"status": "error", "database": "disconnected", "detail": err or "unknown"},
+        content={
+            "status": "error",
+            "database": "disconnected",
+            "detail": err or "unknown",
+            "pdf_pool": pdf_pool,
+        },
     )
 
 
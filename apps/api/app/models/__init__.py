@@ -1,6 +1,8 @@
 from app.models.base import Base
 from app.models.document import Document, DocumentStatus
 from app.models.document_chunk import DocumentChunk
+from app.models.embedding_cache import EmbeddingCache
+from app.models.ingestion_job import IngestionJob
 from app.models.user import User
 
-__all__ = ["Base", "User", "Document", "DocumentStatus", "DocumentChunk"]
+__all__ = ["Base", "User", "Document", "DocumentStatus", "DocumentChunk", "EmbeddingCache", "IngestionJob"]
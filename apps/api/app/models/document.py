@@ -4,7 +4,7 @@ from enum import Enum
 
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import ForeignKey, text
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,6 +21,9 @@ class DocumentStatus(str, Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_content_sha256_pipeline_version", "content_sha256", "pipeline_version"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -43,6 +46,9 @@ class Document(Base):
     page_count: Mapped[int | None] = mapped_column(nullable=True)
     error_message: Mapped[str | None] = mapped_column(nullable=True)
     jd_extraction_json: Mapped[dict | None] = mapped_column(JSONB(), nullable=True)
+    # SHA-256 of the stored PDF and the pipeline that produced its chunks (whole-document dedupe)
+    content_sha256: Mapped[str | None] = mapped_column(sa.String(64), nullable=True)
+    pipeline_version: Mapped[str | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         server_default=text("now()"),
         nullable=False,
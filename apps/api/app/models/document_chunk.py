@@ -2,10 +2,11 @@ import uuid
 from datetime import datetime
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import ForeignKey, Index, text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import BigInteger, ForeignKey, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.core.config import SHORT_EMBEDDING_DIM
 from app.models.base import Base
 
 # OpenAI text-embedding-ada-002 dimension; adjust if using a different model
@@ -41,19 +42,29 @@ class DocumentChunk(Base):
         Vector(EMBEDDING_DIM),
         nullable=False,
     )
+    embedding_short: Mapped[list[float] | None] = mapped_column(
+        Vector(SHORT_EMBEDDING_DIM),
+        nullable=True,
+    )
+    # MinHash signature of the content and its LSH band keys (app.services.near_dup)
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary(), nullable=True)
+    minhash_bands: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger()), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         server_default=text("now()"),
         nullable=False,
     )
 
     __table_args__ = (
+        # The only ANN index (RETRIEVAL_QUANTIZATION=short). The float32 embedding is
+        # read by id for the rerank and carries no HNSW index of its own.
         Index(
-            "ix_document_chunks_embedding_hnsw",
-            "embedding",
+            "ix_document_chunks_embedding_short_hnsw",
+            "embedding_short",
             postgresql_using="hnsw",
             postgresql_with={"m": 16, "ef_construction": 64},
-            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_ops={"embedding_short": "vector_cosine_ops"},
         ),
+        Index("ix_document_chunks_minhash_bands", "minhash_bands", postgresql_using="gin"),
         Index("ix_document_chunks_doc_low_signal", "document_id", "is_low_signal"),
         Index("ix_document_chunks_section_type", "document_id", "section_type"),
         Index("ix_document_chunks_doc_domain", "doc_domain"),
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EmbeddingCache(Base):
+    """Embedding vectors keyed by (model, dim, content_hash); shared across documents."""
+
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(primary_key=True)
+    dim: Mapped[int] = mapped_column(primary_key=True)
+    content_hash: Mapped[str] = mapped_column(primary_key=True)
+    # Unsized so one table can hold any model/dimension
+    embedding: Mapped[list[float]] = mapped_column(Vector(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=text("now()"),
+        nullable=False,
+    )
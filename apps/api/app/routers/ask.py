@@ -77,7 +77,7 @@ async def ask(
 
     # Retrieve relevant chunks
     try:
-        query_embedding = embed_query(body.question)
+        query_embedding = await embed_query(body.question)
     except Exception as e:
         logger.exception("embed_query failed")
         raise HTTPException(status_code=503, detail=f"Embedding failed: {str(e)[:200]}")
@@ -104,7 +104,7 @@ async def ask(
 
     # Generate grounded answer (or fallback if no chunks)
     try:
-        answer, citations = generate_grounded_answer(
+        answer, citations = await generate_grounded_answer(
             question=body.question,
             chunks=chunks,
             max_tokens=settings.max_completion_tokens,
@@ -1,17 +1,19 @@
-import re
 import uuid
+from contextlib import contextmanager
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import delete, select, text
+from sqlalchemy import delete, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.rate_limit import consume_ingest_budget, release_ingest_budget
 from app.db.session import get_db
-from app.models import Document, DocumentChunk, User
-from app.services.ingestion import run_ingestion
-from app.services.storage import get_storage
+from app.models import Document, DocumentChunk, IngestionJob, User
+from app.services.embedding_providers import get_embedding_provider
+from app.services.job_queue import enqueue_ingestion, enqueue_ingestions
+from app.services.storage import get_storage, make_document_key
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -115,11 +117,6 @@ def _validate_pdf_size(file_size_bytes: int) -> None:
         )
 
 
-def _make_s3_key(user_id: uuid.UUID, document_id: uuid.UUID, filename: str) -> str:
-    safe_name = re.sub(r"[^\w\.\-]", "_", filename)
-    return f"documents/{user_id}/{document_id}/{safe_name}"
-
-
 @router.post("/presign", response_model=PresignOutput)
 async def presign(
     body: PresignInput,
@@ -146,7 +143,7 @@ async def presign(
     db.add(doc)
     await db.flush()
 
-    s3_key = _make_s3_key(body.user_id, doc.id, body.filename)
+    s3_key = make_document_key(body.user_id, doc.id, body.filename)
     doc.s3_key = s3_key
 
     storage = get_storage()
@@ -218,17 +215,51 @@ class IngestInput(BaseModel):
     user_id: uuid.UUID
 
 
+class ReingestInput(IngestInput):
+    full_rebuild: bool = Field(
+        False,
+        description="Delete all chunks first instead of diffing by content_hash",
+    )
+
+
+@contextmanager
+def _ingest_budget(user_id: uuid.UUID, documents: int, batch: bool = False):
+    """
+    Charge documents to the user's daily ingest budget (429 if they don't fit) for
+    the enqueue in the with-block. If it raises, nothing was queued and the
+    documents are given back.
+    """
+    allowed, retry_after, remaining = consume_ingest_budget(str(user_id), documents, batch)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": "Daily ingest document limit exceeded",
+                "limit": settings.ingest_batch_documents_per_day if batch else settings.ingest_documents_per_day,
+                "requested": documents,
+                "remaining": remaining,
+                "retry_after_seconds": retry_after,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+    try:
+        yield
+    except BaseException:
+        release_ingest_budget(str(user_id), documents, batch)
+        raise
+
+
 @router.post("/{document_id}/ingest")
 async def ingest(
     document_id: uuid.UUID,
     body: IngestInput,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Start document ingestion. Rate limit: 3/day.
+    Start document ingestion. Rate limit: 3/day, and one document from the
+    user's INGEST_DOCUMENTS_PER_DAY budget.
     Checks: doc ownership, status must be uploaded.
-    Sets status=processing and runs ingestion in background.
+    Sets status=processing and enqueues an ingestion job for app.worker.
     """
     result = await db.execute(
         select(Document).where(
@@ -246,31 +277,137 @@ async def ingest(
             detail=f"Document must be uploaded to ingest; current status: {doc.status}",
         )
 
-    if not settings.openai_api_key:
-        raise HTTPException(
-            status_code=503,
-            detail="OpenAI API not configured; set OPENAI_API_KEY",
+    provider = get_embedding_provider()
+    if not provider.is_configured():
+        raise HTTPException(status_code=503, detail=provider.not_configured_detail)
+
+    with _ingest_budget(body.user_id, 1):
+        doc.status = "processing"
+        doc.error_message = None
+        await enqueue_ingestion(db, document_id)
+        await db.commit()
+
+    return {"status": "processing", "document_id": str(document_id)}
+
+
+MAX_BATCH_DOCUMENTS = 1000
+
+
+class BatchIngestInput(BaseModel):
+    user_id: uuid.UUID
+    document_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=MAX_BATCH_DOCUMENTS)
+
+
+@router.post("/ingest-batch")
+async def ingest_batch(
+    body: BatchIngestInput,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Start ingestion for many uploaded documents in one call. Rate limit: 5/day,
+    and every queued document counts against the user's INGEST_BATCH_DOCUMENTS_PER_DAY
+    budget (separate from /ingest's); a batch that doesn't fit is rejected whole (429).
+    Documents the user doesn't own or that aren't uploaded are skipped with a reason.
+    Jobs are enqueued in one transaction; poll /documents/ingest-batch/status.
+    """
+    provider = get_embedding_provider()
+    if not provider.is_configured():
+        raise HTTPException(status_code=503, detail=provider.not_configured_detail)
+
+    document_ids = list(dict.fromkeys(body.document_ids))
+    result = await db.execute(
+        select(Document).where(
+            Document.id.in_(document_ids),
+            Document.user_id == body.user_id,
         )
+    )
+    docs = {d.id: d for d in result.scalars()}
+
+    queued: list[uuid.UUID] = []
+    skipped: list[dict] = []
+    for document_id in document_ids:
+        doc = docs.get(document_id)
+        if not doc:
+            skipped.append({"document_id": str(document_id), "reason": "not found"})
+        elif doc.status != "uploaded":
+            skipped.append({"document_id": str(document_id), "reason": f"status {doc.status}"})
+        else:
+            queued.append(document_id)
+    with _ingest_budget(body.user_id, len(queued), batch=True):
+        for document_id in queued:
+            docs[document_id].status = "processing"
+            docs[document_id].error_message = None
+        await enqueue_ingestions(db, queued)
+        await db.commit()
 
-    doc.status = "processing"
-    doc.error_message = None
-    await db.commit()
+    return {
+        "status": "processing",
+        "queued": len(queued),
+        "document_ids": [str(d) for d in queued],
+        "skipped": skipped,
+    }
 
-    background_tasks.add_task(run_ingestion, document_id)
 
-    return {"status": "processing", "document_id": str(document_id)}
+class BatchStatusInput(BaseModel):
+    user_id: uuid.UUID
+    document_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=MAX_BATCH_DOCUMENTS)
+
+
+@router.post("/ingest-batch/status")
+async def ingest_batch_status(
+    body: BatchStatusInput,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Progress of a batch: document counts by status, failures with their errors,
+    and throughput (ready documents per second since the first job was queued).
+    """
+    result = await db.execute(
+        select(Document.id, Document.status, Document.error_message).where(
+            Document.id.in_(body.document_ids),
+            Document.user_id == body.user_id,
+        )
+    )
+    rows = result.all()
+    by_status: dict[str, int] = {}
+    for r in rows:
+        by_status[r.status] = by_status.get(r.status, 0) + 1
+
+    jobs = await db.execute(
+        select(
+            func.min(IngestionJob.created_at),
+            func.max(IngestionJob.updated_at).filter(IngestionJob.status == "succeeded"),
+        ).where(IngestionJob.document_id.in_([r.id for r in rows]))
+    )
+    first_queued, last_done = jobs.one()
+    docs_per_sec = None
+    if first_queued and last_done and last_done > first_queued:
+        docs_per_sec = round(by_status.get("ready", 0) / (last_done - first_queued).total_seconds(), 3)
+
+    return {
+        "total": len(rows),
+        "by_status": by_status,
+        "docs_per_sec": docs_per_sec,
+        "failures": [
+            {"document_id": str(r.id), "error_message": r.error_message}
+            for r in rows
+            if r.status == "failed"
+        ],
+    }
 
 
 @router.post("/{document_id}/reingest")
 async def reingest(
     document_id: uuid.UUID,
-    body: IngestInput,
-    background_tasks: BackgroundTasks,
+    body: ReingestInput,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Re-run ingestion for an existing document (dev utility).
-    Deletes existing chunks, resets status, runs ingestion.
+    Resets status and enqueues an ingestion job. Ingestion diffs new chunks against
+    stored rows by content_hash, so unchanged chunks keep their embeddings.
+    Chunks from another pipeline version (e.g. embedding model) are rebuilt
+    automatically; full_rebuild=true deletes existing chunks first regardless.
     Doc must be uploaded or ready; file must exist in storage.
     """
     result = await db.execute(
@@ -289,20 +426,18 @@ async def reingest(
             detail=f"Document must be uploaded or ready to reingest; current: {doc.status}",
         )
 
-    if not settings.openai_api_key:
-        raise HTTPException(
-            status_code=503,
-            detail="OpenAI API not configured; set OPENAI_API_KEY",
-        )
+    provider = get_embedding_provider()
+    if not provider.is_configured():
+        raise HTTPException(status_code=503, detail=provider.not_configured_detail)
 
-    await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+    if body.full_rebuild:
+        await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
     doc.status = "processing"
     doc.error_message = None
     doc.page_count = None
+    await enqueue_ingestion(db, document_id)
     await db.commit()
 
-    background_tasks.add_task(run_ingestion, document_id)
-
     return {"status": "processing", "document_id": str(document_id)}
 
 
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.db.session import get_db
 from app.models import Document
+from app.services.embedding_providers import get_embedding_provider
 from app.services.retrieval import (
     embed_query,
     retrieve_chunks,
@@ -89,14 +90,12 @@ async def retrieve(
             detail=f"Document must be ready to retrieve; current status: {doc.status}",
         )
 
-    if not settings.openai_api_key:
-        raise HTTPException(
-            status_code=503,
-            detail="OpenAI API not configured; set OPENAI_API_KEY",
-        )
+    provider = get_embedding_provider()
+    if not provider.is_configured():
+        raise HTTPException(status_code=503, detail=provider.not_configured_detail)
 
     try:
-        query_embedding = embed_query(body.query)
+        query_embedding = await embed_query(body.query)
     except Exception as e:
         logger.exception("embed_query failed")
         raise HTTPException(status_code=503, detail=f"Embedding failed: {str(e)[:200]}")
@@ -0,0 +1,67 @@
+"""
+Columnar batch of new document_chunks rows for the ingestion hot path.
+
+Metadata is held as one list per column and embeddings as a single contiguous
+(n, dim) float32 matrix, so a batch costs a handful of objects instead of a
+dict per row plus ~1.5k boxed floats per embedding. The matrix is what the
+embedding providers decode into and what the writer encodes to pgvector's
+binary format in one pass.
+"""
+
+import numpy as np
+
+# Row columns besides id, document_id and the embeddings (chunk_row_values keys,
+# plus the near-duplicate signature added in the embed stage)
+ROW_COLUMNS = (
+    "chunk_index",
+    "content",
+    "page_number",
+    "section",
+    "is_boilerplate",
+    "quality_score",
+    "is_low_signal",
+    "content_hash",
+    "section_type",
+    "skills_detected",
+    "doc_domain",
+    "minhash",
+    "minhash_bands",
+)
+
+
+class ChunkBatch:
+    """Parallel column lists + float32 embedding matrix (set once embedded)."""
+
+    __slots__ = ("columns", "embeddings")
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list] = {c: [] for c in ROW_COLUMNS}
+        self.embeddings: np.ndarray | None = None
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], embeddings=None) -> "ChunkBatch":
+        """Batch of chunk_row_values dicts (missing columns are None)."""
+        batch = cls()
+        for row in rows:
+            batch.append(row)
+        if embeddings is not None:
+            batch.set_embeddings(embeddings)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.columns["content"])
+
+    def append(self, row: dict) -> None:
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+
+    def row(self, i: int) -> dict:
+        """Row i as a dict (tests, logging; the write path stays columnar)."""
+        return {name: values[i] for name, values in self.columns.items()}
+
+    def set_embeddings(self, embeddings) -> None:
+        """Store embeddings (matrix or sequence of vectors) as (len(self), dim) float32."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(self):
+            raise ValueError(f"Expected {len(self)} embeddings, got shape {matrix.shape}")
+        self.embeddings = np.ascontiguousarray(matrix)
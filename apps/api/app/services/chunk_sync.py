@@ -0,0 +1,204 @@
+"""
+Incremental chunk sync: diff new chunk results against stored rows by content_hash.
+
+Only valid while the stored rows come from the current pipeline version (which
+includes the embedding model and dim): a content_hash match reuses the stored
+vector, so rows embedded by another model are discarded instead of diffed.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DocumentChunk
+from app.services.doc_dedupe import current_pipeline_version
+from app.services.near_dup import signature_columns
+
+logger = logging.getLogger(__name__)
+
+# Columns rewritten in place when a chunk's content is unchanged
+META_FIELDS = (
+    "chunk_index",
+    "page_number",
+    "section",
+    "section_type",
+    "quality_score",
+    "is_low_signal",
+    "skills_detected",
+    "doc_domain",
+)
+
+
+def chunk_row_values(cr, chunk_index: int) -> dict:
+    """Column values (minus embedding) for a ChunkResult / JDChunkResult at chunk_index."""
+    section_type = getattr(cr, "section_type", None)
+    return {
+        "chunk_index": chunk_index,
+        "content": cr.content,
+        "page_number": cr.page_number,
+        "section": section_type,
+        "is_boilerplate": False,
+        "quality_score": cr.quality_score,
+        "is_low_signal": cr.is_low_signal,
+        "content_hash": cr.content_hash,
+        "section_type": section_type,
+        "skills_detected": getattr(cr, "skills_detected", None),
+        "doc_domain": getattr(cr, "doc_domain", None),
+    }
+
+
+@dataclass
+class ChunkSyncPlan:
+    kept: int = 0  # rows whose content (and embedding) is reused
+    updates: list[dict] = field(default_factory=list)  # {"id", <changed META_FIELDS>}
+    inserts: list[int] = field(default_factory=list)  # positions in new_rows to embed + insert
+    deletes: list[uuid.UUID] = field(default_factory=list)
+    # Kept rows stored as boilerplate, for resolve_boilerplate: {"id", "content", "is_low_signal"}
+    boilerplate_checks: list[dict] = field(default_factory=list)
+
+
+class ChunkSyncPlanner:
+    """
+    Incremental plan_chunk_sync: feed new rows one at a time (as they are chunked)
+    and learn immediately whether each needs embedding + insert. Deletes are only
+    known once every new row has been seen, in finish().
+    """
+
+    def __init__(self, existing: list[dict]):
+        self._existing = existing
+        self._pool: dict[str, list[dict]] = defaultdict(list)
+        for row in sorted(existing, key=lambda r: r["chunk_index"]):
+            if row["content_hash"]:
+                self._pool[row["content_hash"]].append(row)
+            # Rows without a hash predate content_hash and can't be matched
+        self._matched: set[uuid.UUID] = set()
+        self.plan = ChunkSyncPlan()
+
+    def add(self, pos: int, new: dict) -> bool:
+        """Match new row `pos`; returns True when it must be embedded and inserted."""
+        candidates = self._pool.get(new["content_hash"])
+        if not candidates:
+            self.plan.inserts.append(pos)
+            return True
+        old = candidates.pop(0)
+        self._matched.add(old["id"])
+        self.plan.kept += 1
+        changed = {f: new[f] for f in META_FIELDS if old[f] != new[f]}
+        if old.get("is_boilerplate"):
+            # Marked as boilerplate by near_dup; stays low-signal unless resolve_boilerplate clears it
+            changed.pop("is_low_signal", None)
+            self.plan.boilerplate_checks.append(
+                {"id": old["id"], "content": new["content"], "is_low_signal": new["is_low_signal"]}
+            )
+        if old.get("has_minhash") is False:
+            # Written before near-duplicate signatures existed
+            changed.update(signature_columns(new["content"]))
+        if changed:
+            self.plan.updates.append({"id": old["id"], **changed})
+        return False
+
+    def finish(self) -> ChunkSyncPlan:
+        self.plan.deletes = [r["id"] for r in self._existing if r["id"] not in self._matched]
+        return self.plan
+
+
+def plan_chunk_sync(existing: list[dict], new_rows: list[dict]) -> ChunkSyncPlan:
+    """
+    Match new rows to existing rows by content_hash (as a multiset, lowest chunk_index first).
+    Matched rows keep their id and embedding and only get changed metadata rewritten;
+    unmatched new rows are inserted; unmatched existing rows are deleted.
+    """
+    planner = ChunkSyncPlanner(existing)
+    for pos, new in enumerate(new_rows):
+        planner.add(pos, new)
+    return planner.finish()
+
+
+def resolve_boilerplate(plan: ChunkSyncPlan, still_boilerplate: list[bool]) -> int:
+    """
+    Settle plan.boilerplate_checks: rows that are no longer boilerplate get
+    is_boilerplate cleared and their new is_low_signal back. Returns rows cleared.
+    """
+    updates = {u["id"]: u for u in plan.updates}
+    cleared = 0
+    for check, still in zip(plan.boilerplate_checks, still_boilerplate, strict=True):
+        if still:
+            continue
+        update = updates.get(check["id"])
+        if update is None:
+            update = updates[check["id"]] = {"id": check["id"]}
+            plan.updates.append(update)
+        update.update(is_boilerplate=False, is_low_signal=check["is_low_signal"])
+        cleared += 1
+    return cleared
+
+
+def stored_chunks_reusable(stored_pipeline_version: str | None) -> bool:
+    """True when a document's stored chunks were written by the current pipeline version."""
+    return stored_pipeline_version == current_pipeline_version()
+
+
+async def load_existing_chunks(
+    db: AsyncSession,
+    document_id: uuid.UUID,
+    stored_pipeline_version: str | None,
+) -> list[dict]:
+    """
+    Stored rows to diff against, or [] after deleting them (in the caller's
+    transaction) when they come from another pipeline version, e.g. another
+    embedding model. The rebuild re-embeds through the embedding cache, which is
+    keyed by model, so a chunking-only change still costs no API calls.
+    """
+    if not stored_chunks_reusable(stored_pipeline_version):
+        result = await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        if result.rowcount:
+            logger.info(
+                "chunk sync: document_id=%s pipeline_version %s -> %s, rebuilding %s rows",
+                document_id,
+                stored_pipeline_version,
+                current_pipeline_version(),
+                result.rowcount,
+            )
+        return []
+    cols = [getattr(DocumentChunk, f) for f in META_FIELDS]
+    result = await db.execute(
+        select(
+            DocumentChunk.id,
+            DocumentChunk.content_hash,
+            DocumentChunk.is_boilerplate,
+            DocumentChunk.minhash.is_not(None).label("has_minhash"),
+            *cols,
+        ).where(
+            DocumentChunk.document_id == document_id
+        )
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def apply_chunk_changes(
+    db: AsyncSession,
+    document_id: uuid.UUID,
+    plan: ChunkSyncPlan,
+) -> None:
+    """
+    Write the plan's deletes and metadata updates in the caller's transaction
+    (inserts are written by the caller as their embeddings arrive).
+    uq(document_id, chunk_index) is deferred, so in-place index moves and
+    inserts that reuse a to-be-deleted index can't collide.
+    """
+    if plan.deletes:
+        await db.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(plan.deletes)))
+    if plan.updates:
+        await db.execute(update(DocumentChunk), plan.updates)
+    logger.info(
+        "chunk sync: document_id=%s kept=%s updated=%s inserted=%s deleted=%s",
+        document_id,
+        plan.kept,
+        len(plan.updates),
+        len(plan.inserts),
+        len(plan.deletes),
+    )
@@ -0,0 +1,170 @@
+"""
+Bulk writes of document_chunks rows without ORM objects.
+
+Rows arrive as a ChunkBatch. On asyncpg they are streamed with binary COPY:
+the whole float32 embedding matrix is converted to pgvector's big-endian wire
+format in one NumPy pass and the per-row bytes are handed to COPY as-is. Other
+drivers get one multi-row INSERT ... VALUES per batch. Either way it runs in
+the caller's transaction.
+"""
+
+import json
+import logging
+import struct
+import sys
+import uuid
+from array import array
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DocumentChunk
+from app.services.chunk_batch import ChunkBatch
+from app.services.embeddings import shorten_matrix
+
+logger = logging.getLogger(__name__)
+
+COPY_COLUMNS = (
+    "id",
+    "document_id",
+    "chunk_index",
+    "content",
+    "page_number",
+    "section",
+    "is_boilerplate",
+    "quality_score",
+    "is_low_signal",
+    "content_hash",
+    "section_type",
+    "skills_detected",
+    "doc_domain",
+    "embedding",
+    "embedding_short",
+    "minhash",
+    "minhash_bands",
+)
+INSERT_BATCH_ROWS = 100
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def encode_vector(value) -> bytes:
+    """pgvector binary format: uint16 dim, uint16 unused, dim x float32 big-endian."""
+    floats = array("f", value)
+    if not _BIG_ENDIAN:
+        floats.byteswap()
+    return struct.pack(">HH", len(floats), 0) + floats.tobytes()
+
+
+def encode_vectors(matrix: np.ndarray) -> list[bytes]:
+    """encode_vector for every row of a 2-D matrix, with one byte-order conversion."""
+    big = np.ascontiguousarray(matrix, dtype=">f4")
+    header = struct.pack(">HH", big.shape[1], 0)
+    return [header + row.tobytes() for row in big]
+
+
+def _passthrough(data: bytes) -> bytes:
+    return data
+
+
+def decode_vector(data: bytes) -> list[float]:
+    dim, _ = struct.unpack_from(">HH", data)
+    floats = array("f", data[4 : 4 + 4 * dim])
+    if not _BIG_ENDIAN:
+        floats.byteswap()
+    return floats.tolist()
+
+
+async def _asyncpg_connection(db: AsyncSession):
+    """The driver-level asyncpg connection behind the session, or None for other drivers."""
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    if type(driver).__module__.startswith("asyncpg"):
+        return driver
+    return None
+
+
+async def _copy_rows(driver, records: list[tuple]) -> None:
+    # Binary vector codec only for the COPY (records carry pre-encoded vectors);
+    # SQLAlchemy binds vectors as text elsewhere
+    await driver.set_type_codec(
+        "vector",
+        encoder=_passthrough,
+        decoder=decode_vector,
+        format="binary",
+    )
+    try:
+        await driver.copy_records_to_table(
+            DocumentChunk.__tablename__,
+            records=records,
+            columns=COPY_COLUMNS,
+        )
+    finally:
+        await driver.reset_type_codec("vector")
+
+
+async def insert_chunk_rows(
+    db: AsyncSession,
+    document_id: uuid.UUID,
+    batch: ChunkBatch,
+) -> int:
+    """
+    Insert an embedded batch (and the embedding_short prefix derived from its
+    embeddings). Returns rows written.
+    """
+    n = len(batch)
+    if not n:
+        return 0
+    if batch.embeddings is None:
+        raise ValueError("ChunkBatch has no embeddings")
+    short = shorten_matrix(batch.embeddings)
+    cols = batch.columns
+    driver = await _asyncpg_connection(db)
+    if driver is not None:
+        skills = [None if s is None else json.dumps(s) for s in cols["skills_detected"]]
+        records = list(
+            zip(
+                [uuid.uuid4() for _ in range(n)],
+                [document_id] * n,
+                cols["chunk_index"],
+                cols["content"],
+                cols["page_number"],
+                cols["section"],
+                cols["is_boilerplate"],
+                cols["quality_score"],
+                cols["is_low_signal"],
+                cols["content_hash"],
+                cols["section_type"],
+                skills,
+                cols["doc_domain"],
+                encode_vectors(batch.embeddings),
+                encode_vectors(short),
+                cols["minhash"],
+                cols["minhash_bands"],
+            )
+        )
+        await _copy_rows(driver, records)
+    else:
+        values = [
+            {
+                **batch.row(i),
+                "document_id": document_id,
+                "embedding": batch.embeddings[i],
+                "embedding_short": short[i],
+            }
+            for i in range(n)
+        ]
+        for i in range(0, n, INSERT_BATCH_ROWS):
+            await db.execute(insert(DocumentChunk).values(values[i : i + INSERT_BATCH_ROWS]))
+    return n
+
+
+async def count_document_chunks(db: AsyncSession, document_id: uuid.UUID) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(DocumentChunk).where(
+            DocumentChunk.document_id == document_id
+        )
+    )
+    return result.scalar() or 0
@@ -3,7 +3,8 @@
 import hashlib
 import logging
 import re
-from collections import Counter
+import string
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -162,18 +163,44 @@ def _chunk_by_paragraphs(
     return chunks
 
 
+WORD_RE = re.compile(r"\w+")  # same matches as \b\w+\b: a maximal \w run always sits on boundaries
+_ASCII_LETTERS = string.ascii_letters.encode()
+_ASCII_DIGITS = string.digits.encode()
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+# PHONE_RE needs 10 digits, so fewer str.isdigit() chars (a superset of \d) rules it out
+_PHONE_MIN_DIGITS = 10
+
+
+def _char_counts(text: str) -> tuple[int, int, int]:
+    """(non-whitespace, alpha, digit) character counts, per str.isspace/isalpha/isdigit."""
+    # str.split() splits on exactly the str.isspace() characters
+    compact = "".join(text.split())
+    total = len(compact)
+    # ASCII part counted by deleting the class in C (ASCII isalpha/isdigit are exactly letters/0-9)
+    ascii_part = compact.encode("ascii", "ignore")
+    alpha = len(ascii_part) - len(ascii_part.translate(None, _ASCII_LETTERS))
+    digit = len(ascii_part) - len(ascii_part.translate(None, _ASCII_DIGITS))
+    if len(ascii_part) != total:
+        # Only the (usually few) non-ASCII chars go through the Unicode predicates
+        rest = "".join(_NON_ASCII_RE.findall(compact))
+        alpha += sum(map(str.isalpha, rest))
+        digit += sum(map(str.isdigit, rest))
+    return total, alpha, digit
+
+
 def _compute_quality_metrics(text: str) -> dict:
-    """Compute document-agnostic quality metrics for a chunk."""
-    non_ws = [c for c in text if not c.isspace()]
-    total = len(non_ws)
-    alpha = sum(1 for c in non_ws if c.isalpha())
-    digit = sum(1 for c in non_ws if c.isdigit())
+    """
+    Compute document-agnostic quality metrics for a chunk.
+    Character classes are counted in C; each contact regex only runs when a cheap
+    precheck ("@", "http"/"www.", enough digits) says it could match.
+    """
+    total, alpha, digit = _char_counts(text)
     alpha_ratio = alpha / total if total else 0.0
     digit_ratio = digit / total if total else 0.0
-    url_count = len(URL_RE.findall(text))
-    email_count = len(EMAIL_RE.findall(text))
-    phone_count = len(PHONE_RE.findall(text))
-    words = re.findall(r"\b\w+\b", text.lower())
+    url_count = len(URL_RE.findall(text)) if "http" in text or "www." in text else 0
+    email_count = len(EMAIL_RE.findall(text)) if "@" in text else 0
+    phone_count = len(PHONE_RE.findall(text)) if digit >= _PHONE_MIN_DIGITS else 0
+    words = WORD_RE.findall(text.lower())
     unique = len(set(words))
     unique_word_ratio = unique / len(words) if words else 0.0
     length_chars = len(text)
@@ -239,7 +266,7 @@ def _is_low_signal(metrics: dict) -> bool:
     return False
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkResult:
     page_number: int
     content: str
@@ -249,25 +276,50 @@ class ChunkResult:
     content_hash: str
 
 
-def chunk_pages(
-    page_texts: list[tuple[int, str]],
+# Short chunks (headers/footers) repeated this often across a document are low-signal
+REPEAT_MAX_CHARS = 200
+REPEAT_MIN_COUNT = 3
+
+
+class RepeatedContentMarker:
+    """
+    Document-level follow-up to iter_chunk_pages: short chunks whose content
+    repeats REPEAT_MIN_COUNT+ times are low-signal, which is only known once every
+    chunk is seen. add() each chunk as it is yielded; finish() returns the
+    chunk_index values to mark. Holds one hash and index per short chunk.
+    """
+
+    def __init__(self) -> None:
+        self._short: dict[str, list[int]] = {}
+
+    def add(self, chunk: ChunkResult) -> None:
+        if len(chunk.content) <= REPEAT_MAX_CHARS:
+            self._short.setdefault(chunk.content_hash, []).append(chunk.chunk_index)
+
+    def finish(self) -> list[int]:
+        return sorted(i for idxs in self._short.values() if len(idxs) >= REPEAT_MIN_COUNT for i in idxs)
+
+
+def iter_chunk_pages(
+    page_texts: Iterable[tuple[int, str]],
     chunk_size: int = 1400,
     overlap_paragraphs: int = 1,
     min_chars: int = 25,
     max_chunks: int = 300,
     stats: dict | None = None,
-) -> list[ChunkResult]:
+) -> Iterator[ChunkResult]:
     """
-    Paragraph-based chunking. Document-agnostic.
-    Uses blank-line paragraphs; fallback line-based grouping for single-block PDFs.
-    Marks is_low_signal including repeated-content (hash appears >= 2x).
-    Returns ChunkResult with quality_score, is_low_signal, content_hash.
+    chunk_pages, lazily: pages are consumed one at a time and each page's chunks
+    yielded before the next page is read. is_low_signal covers the per-chunk
+    metrics only; the repeated-content pass is RepeatedContentMarker's follow-up.
+    stats gets "pages" and "total_paragraphs" once the pages are exhausted.
     """
-    results: list[ChunkResult] = []
     chunk_idx = 0
     total_paras = 0
+    pages = 0
 
     for page_num, text in page_texts:
+        pages += 1
         text = normalize_text(text)
         if not text:
             continue
@@ -296,31 +348,55 @@ def chunk_pages(
             qs = _quality_score(metrics)
             low = _is_low_signal(metrics)
             chash = _content_hash(content)
-            results.append(ChunkResult(
+            yield ChunkResult(
                 page_number=page_num,
                 content=content,
                 chunk_index=chunk_idx,
                 quality_score=round(qs, 4),
                 is_low_signal=low,
                 content_hash=chash,
-            ))
+            )
             chunk_idx += 1
 
+    if stats is not None:
+        stats["pages"] = pages
+        stats["total_paragraphs"] = total_paras
+
+
+def chunk_pages(
+    page_texts: Iterable[tuple[int, str]],
+    chunk_size: int = 1400,
+    overlap_paragraphs: int = 1,
+    min_chars: int = 25,
+    max_chunks: int = 300,
+    stats: dict | None = None,
+) -> list[ChunkResult]:
+    """
+    Paragraph-based chunking. Document-agnostic.
+    Uses blank-line paragraphs; fallback line-based grouping for single-block PDFs.
+    Marks is_low_signal including repeated-content (hash appears >= 2x).
+    Returns ChunkResult with quality_score, is_low_signal, content_hash.
+    """
+    page_stats: dict = {}
+    repeats = RepeatedContentMarker()
+    results: list[ChunkResult] = []
+    for r in iter_chunk_pages(page_texts, chunk_size, overlap_paragraphs, min_chars, max_chunks, page_stats):
+        repeats.add(r)
+        results.append(r)
+
     # Repeated-content: only mark SHORT duplicates (headers/footers) as low-signal.
-    hash_counts = Counter(r.content_hash for r in results)
-    for r in results:
-        if len(r.content) <= 200 and hash_counts[r.content_hash] >= 3:
-            r.is_low_signal = True
+    for i in repeats.finish():
+        results[i].is_low_signal = True
 
     low_count = sum(1 for r in results if r.is_low_signal)
     if stats is not None:
-        stats["total_paragraphs"] = total_paras
+        stats["total_paragraphs"] = page_stats["total_paragraphs"]
         stats["chunks_produced"] = len(results)
         stats["low_signal"] = low_count
     logger.info(
         "chunk_pages done: pages=%s total_paragraphs=%s chunks_produced=%s low_signal=%s",
-        len(page_texts),
-        total_paras,
+        page_stats["pages"],
+        page_stats["total_paragraphs"],
         len(results),
         low_count,
     )
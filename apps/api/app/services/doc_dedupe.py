@@ -0,0 +1,95 @@
+"""
+Whole-document dedupe: fingerprint the stored PDF and clone a ready twin's results.
+
+A document matches when its SHA-256 and pipeline version equal those of a ready
+document of the same user; its chunks (with embeddings), page_count and jd_extraction_json are
+then copied with one INSERT ... SELECT instead of re-running the pipeline.
+"""
+
+import hashlib
+import logging
+
+from sqlalchemy import delete, insert, literal, select
+
+from app.core.config import settings
+from app.models import Document, DocumentChunk
+from app.services.embedding_providers import get_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction, normalization, chunking or chunk metadata change output
+PIPELINE_VERSION = 2
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def current_pipeline_version() -> str:
+    """Pipeline version plus the settings that change chunk or embedding output."""
+    provider = get_embedding_provider()
+    return (
+        f"{PIPELINE_VERSION}:{provider.model_name}:{provider.dim}"
+        f":pages={settings.max_pdf_pages}:min={settings.min_chunk_chars}:max={settings.max_chunks_per_doc}"
+    )
+
+
+def sha256_file(path: str) -> str:
+    """Streamed SHA-256 of a local file (hex)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def find_ready_duplicate(db, doc: Document) -> Document | None:
+    """
+    Oldest ready document of doc's user (other than doc) with doc's fingerprint and
+    pipeline version. Same user only: cloned chunks carry per-user near-duplicate flags.
+    """
+    if not doc.content_sha256:
+        return None
+    result = await db.execute(
+        select(Document)
+        .where(
+            Document.user_id == doc.user_id,
+            Document.content_sha256 == doc.content_sha256,
+            Document.pipeline_version == doc.pipeline_version,
+            Document.status == "ready",
+            Document.id != doc.id,
+        )
+        .order_by(Document.created_at)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def clone_document_results(db, source: Document, target: Document) -> int:
+    """
+    Replace target's chunks with copies of source's (set-based, in the caller's
+    transaction) and copy page_count / jd_extraction_json. Returns rows copied.
+    Chunk flags computed per user (is_boilerplate, is_low_signal) are copied as-is,
+    so source must belong to target's user (find_ready_duplicate).
+    """
+    copied = [
+        c
+        for c in DocumentChunk.__table__.columns
+        if c.name not in ("id", "document_id", "created_at")
+    ]
+    await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == target.id))
+    result = await db.execute(
+        insert(DocumentChunk).from_select(
+            ["document_id", *(c.name for c in copied)],
+            select(literal(target.id, DocumentChunk.document_id.type), *copied).where(
+                DocumentChunk.document_id == source.id
+            ),
+        )
+    )
+    target.page_count = source.page_count
+    target.jd_extraction_json = source.jd_extraction_json
+    logger.info(
+        "document dedupe: document_id=%s cloned_from=%s rows=%s",
+        target.id,
+        source.id,
+        result.rowcount,
+    )
+    return result.rowcount
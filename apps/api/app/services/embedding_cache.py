@@ -0,0 +1,139 @@
+"""Persistent embedding cache keyed by (provider model, dim, content_hash). Checked before any API call."""
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import EmbeddingCache
+from app.services.embedding_providers import get_embedding_provider
+from app.services.embeddings import EmbeddingEngine, get_embedding_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Process-lifetime counters. api_ms / api_texts gives the cost a hit avoids."""
+
+    texts: int = 0  # texts requested
+    deduped: int = 0  # repeats within a call, sent once
+    hits: int = 0  # unique hashes served from the cache
+    misses: int = 0  # unique hashes sent to the API
+    api_calls: int = 0  # embed() calls that reached the API
+    api_ms: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def est_ms_saved(self) -> float:
+        """Embedding latency avoided by hits and in-call dedupe, at the observed per-text cost."""
+        if not self.misses:
+            return 0.0
+        return (self.hits + self.deduped) * (self.api_ms / self.misses)
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "hit_rate": round(self.hit_rate, 4),
+            "est_ms_saved": round(self.est_ms_saved, 1),
+        }
+
+
+_stats = EmbeddingCacheStats()
+
+
+def get_cache_stats() -> dict:
+    return _stats.to_dict()
+
+
+def _unique_in_order(texts: list[str], hashes: list[str]) -> dict[str, str]:
+    """hash -> first text with that hash, preserving first-seen order."""
+    unique: dict[str, str] = {}
+    for t, h in zip(texts, hashes):
+        if h not in unique:
+            unique[h] = t
+    return unique
+
+
+async def embed_with_cache(
+    texts: list[str],
+    hashes: list[str],
+    engine: EmbeddingEngine | None = None,
+) -> np.ndarray:
+    """
+    Embed texts, reusing cached vectors by content hash. Returns a
+    (len(texts), dim) float32 matrix in input order.
+    Identical hashes in one call are embedded once; new vectors are written back.
+    Hits are read and misses written in short sessions of their own, so no pooled
+    connection is held during the API call and paid-for vectors persist even if
+    the caller rolls back.
+    """
+    from app.db.base import async_session_maker
+
+    engine = engine or get_embedding_engine()
+    provider = get_embedding_provider()
+    if not texts:
+        return np.empty((0, provider.dim), dtype=np.float32)
+    model = provider.model_name
+    dim = provider.dim
+    unique = _unique_in_order(texts, hashes)
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(EmbeddingCache.content_hash, EmbeddingCache.embedding).where(
+                EmbeddingCache.model == model,
+                EmbeddingCache.dim == dim,
+                EmbeddingCache.content_hash.in_(list(unique)),
+            )
+        )
+        found = {row.content_hash: row.embedding for row in result}
+
+    # No connection is held while the API call runs; misses are written in a new session
+    miss_hashes = [h for h in unique if h not in found]
+    api_ms = 0.0
+    if miss_hashes:
+        started = time.perf_counter()
+        vectors = await engine.embed_matrix([unique[h] for h in miss_hashes])
+        api_ms = (time.perf_counter() - started) * 1000
+        async with async_session_maker() as db:
+            await db.execute(
+                insert(EmbeddingCache)
+                .values(
+                    [
+                        {"model": model, "dim": dim, "content_hash": h, "embedding": v}
+                        for h, v in zip(miss_hashes, vectors)
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+            await db.commit()
+        found.update(zip(miss_hashes, vectors))
+
+    _stats.texts += len(texts)
+    _stats.deduped += len(texts) - len(unique)
+    _stats.hits += len(unique) - len(miss_hashes)
+    _stats.misses += len(miss_hashes)
+    _stats.api_calls += 1 if miss_hashes else 0
+    _stats.api_ms += api_ms
+    logger.info(
+        "embedding cache: texts=%s unique=%s hits=%s misses=%s api_ms=%.1f "
+        "lifetime_hit_rate=%.3f lifetime_est_ms_saved=%.0f",
+        len(texts),
+        len(unique),
+        len(unique) - len(miss_hashes),
+        len(miss_hashes),
+        api_ms,
+        _stats.hit_rate,
+        _stats.est_ms_saved,
+    )
+    out = np.empty((len(hashes), dim), dtype=np.float32)
+    for i, h in enumerate(hashes):
+        out[i] = found[h]
+    return out
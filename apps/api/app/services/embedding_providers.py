@@ -0,0 +1,152 @@
+"""
+Embedding providers: what turns a batch of texts into vectors. Selected by EMBEDDING_PROVIDER.
+
+openai  - OpenAI embeddings API (needs OPENAI_API_KEY).
+hashing - local and deterministic: hashed word and character n-grams projected to
+          openai_embedding_dim with NumPy. No network, no key; similar texts still
+          land near each other, so ingestion, retrieval and benchmarks run end to end
+          offline at production vector sizes. Not a substitute for real embeddings.
+"""
+
+import asyncio
+import base64
+import re
+import zlib
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.openai_client import get_openai_client
+
+
+class EmbeddingProvider(ABC):
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Identifies the vector space (embedding cache key, pipeline version)."""
+        ...
+
+    @property
+    def dim(self) -> int:
+        return settings.openai_embedding_dim
+
+    def is_configured(self) -> bool:
+        return True
+
+    @property
+    def not_configured_detail(self) -> str:
+        """What to tell the client (503) when is_configured() is False."""
+        return f"Embedding provider {settings.embedding_provider!r} not configured"
+
+    @abstractmethod
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed one batch. Returns a (len(texts), dim) float32 matrix in input order."""
+        ...
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    @property
+    def model_name(self) -> str:
+        return settings.openai_embedding_model
+
+    def is_configured(self) -> bool:
+        return bool(settings.openai_api_key)
+
+    @property
+    def not_configured_detail(self) -> str:
+        return "OpenAI embeddings not configured; set OPENAI_API_KEY (or EMBEDDING_PROVIDER=hashing)"
+
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY is not configured")
+
+        # text-embedding-3 models support dimensions param; older models do not.
+        # base64: the response carries raw little-endian float32, decoded below
+        # straight into the matrix instead of via ~1.5k JSON floats per vector
+        create_kwargs: dict = {
+            "input": texts,
+            "model": settings.openai_embedding_model,
+            "encoding_format": "base64",
+        }
+        if settings.openai_embedding_model.startswith("text-embedding-3"):
+            create_kwargs["dimensions"] = settings.openai_embedding_dim
+        response = await get_openai_client().embeddings.create(**create_kwargs)
+
+        # Preserve order; response.data carries the input index
+        out = np.empty((len(texts), settings.openai_embedding_dim), dtype=np.float32)
+        for item in response.data:
+            out[item.index] = _decode_embedding(item.embedding)
+        return out
+
+
+def _decode_embedding(value) -> np.ndarray:
+    """A base64 embedding (float32 little-endian), or a float list from a client that decoded it."""
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype="<f4")
+    return np.asarray(value, dtype=np.float32)
+
+
+_WORD_RE = re.compile(r"\w+")
+# Feature weights: whole words dominate; character trigrams make near-spellings overlap
+_WORD_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.7
+_TRIGRAM_WEIGHT = 0.35
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Signed feature hashing (crc32) of words, word bigrams and char trigrams, L2-normalised."""
+
+    VERSION = 1
+
+    @property
+    def model_name(self) -> str:
+        return f"hashing-ngram-v{self.VERSION}"
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """(len(texts), dim) float32 matrix of unit vectors."""
+        dim = self.dim
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD_RE.findall(text.lower())
+            feats = [(w, _WORD_WEIGHT) for w in words]
+            feats += [(f"{a} {b}", _BIGRAM_WEIGHT) for a, b in zip(words, words[1:])]
+            for w in words:
+                padded = f"#{w}#"
+                feats += [(padded[i : i + 3], _TRIGRAM_WEIGHT) for i in range(len(padded) - 2)]
+            if not feats:
+                out[row, 0] = 1.0  # pgvector cosine is undefined for a zero vector
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode()) for f, _ in feats), dtype=np.uint32, count=len(feats)
+            )
+            weights = np.fromiter((wt for _, wt in feats), dtype=np.float32, count=len(feats))
+            signs = np.where((hashes >> 31) & 1, -1.0, 1.0).astype(np.float32)
+            vec = np.bincount(hashes % dim, weights=weights * signs, minlength=dim)
+            norm = np.linalg.norm(vec)
+            if norm:
+                out[row] = vec / norm
+            else:  # every feature cancelled out
+                out[row, 0] = 1.0
+        return out
+
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        # CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self.embed_texts, texts)
+
+
+_PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    "openai": OpenAIEmbeddingProvider,
+    "hashing": HashingEmbeddingProvider,
+}
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Return the configured embedding provider (EMBEDDING_PROVIDER)."""
+    try:
+        return _PROVIDERS[settings.embedding_provider]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown EMBEDDING_PROVIDER {settings.embedding_provider!r}; "
+            f"expected one of {sorted(_PROVIDERS)}"
+        ) from None
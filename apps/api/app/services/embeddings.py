@@ -0,0 +1,217 @@
+"""Embedding engine: token-aware batching, bounded concurrency, results in input order."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+
+from app.core.config import SHORT_EMBEDDING_DIM, settings
+from app.services.embedding_providers import get_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+# OpenAI tokenizers average ~4 chars/token on English; 3 keeps estimates on the safe side
+CHARS_PER_TOKEN = 3
+
+# Providers return a float32 matrix; plain lists of vectors are accepted too
+EmbedBatchFn = Callable[[list[str]], Awaitable[np.ndarray | list[list[float]]]]
+
+
+def shorten_matrix(vectors, dim: int = SHORT_EMBEDDING_DIM) -> np.ndarray:
+    """
+    Matryoshka prefix: the first `dim` components of each vector, L2-normalised,
+    as a float32 matrix. text-embedding-3 vectors keep most of their ranking
+    quality truncated this way. Zero prefixes are returned as-is (same as
+    pgvector's l2_normalize).
+    """
+    prefix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)[:, :dim]
+    norms = np.linalg.norm(prefix, axis=1, keepdims=True)
+    return np.divide(prefix, norms, out=prefix.copy(), where=norms > 0)
+
+
+def shorten_embeddings(vectors, dim: int = SHORT_EMBEDDING_DIM) -> list[list[float]]:
+    """shorten_matrix as lists of floats."""
+    return shorten_matrix(vectors, dim).tolist()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap upper-bound token estimate (no tokenizer dependency)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def pack_batches(
+    texts: list[str],
+    max_tokens: int,
+    max_inputs: int,
+) -> list[list[int]]:
+    """
+    Greedily pack texts (in order) into batches of indices.
+    A batch closes when adding the next text would exceed max_tokens or max_inputs.
+    A single text over max_tokens gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i, t in enumerate(texts):
+        n = estimate_tokens(t)
+        if current and (current_tokens + n > max_tokens or len(current) >= max_inputs):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += n
+    if current:
+        batches.append(current)
+    return batches
+
+
+class EmbeddingEngine:
+    """
+    Packs texts into batches by token budget and input count, sends up to
+    `concurrency` batches at once, and reassembles vectors in input order.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn | None = None,
+        max_tokens: int | None = None,
+        max_inputs: int | None = None,
+        concurrency: int | None = None,
+    ):
+        # None: the configured EmbeddingProvider, looked up per call
+        self._embed_batch = embed_batch
+        self.max_tokens = max_tokens or settings.embedding_batch_max_tokens
+        self.max_inputs = max_inputs or settings.embedding_batch_max_inputs
+        self.concurrency = max(1, concurrency or settings.embedding_concurrency)
+
+    @property
+    def dim(self) -> int:
+        """Width of the vectors returned (OPENAI_EMBEDDING_DIM, for every provider)."""
+        return settings.openai_embedding_dim
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts. Returns one vector per input, in input order."""
+        if not texts:
+            return []
+        return [
+            vec.tolist() if isinstance(vec, np.ndarray) else vec
+            for vectors in await self._embed_batches(texts)
+            for vec in vectors
+        ]
+
+    async def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        """embed() as one (len(texts), dim) float32 matrix, without per-float Python objects."""
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.concatenate(
+            [np.asarray(vectors, dtype=np.float32) for vectors in await self._embed_batches(texts)]
+        )
+
+    async def _embed_batches(self, texts: list[str]) -> list:
+        """Provider output for each packed batch, in batch order (batches are contiguous)."""
+        batches = pack_batches(texts, self.max_tokens, self.max_inputs)
+        results: list = [None] * len(batches)
+        sem = asyncio.Semaphore(self.concurrency)
+
+        embed_batch = self._embed_batch or get_embedding_provider().embed_batch
+
+        async def _run(b: int, indices: list[int]) -> None:
+            async with sem:
+                vectors = await embed_batch([texts[i] for i in indices])
+            if len(vectors) != len(indices):
+                raise ValueError(
+                    f"Embedding count mismatch: {len(vectors)} != {len(indices)}"
+                )
+            results[b] = vectors
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_run(b, indices) for b, indices in enumerate(batches)))
+        logger.info(
+            "embed done: texts=%s batches=%s concurrency=%s elapsed_ms=%.1f",
+            len(texts),
+            len(batches),
+            self.concurrency,
+            (time.perf_counter() - started) * 1000,
+        )
+        return results
+
+
+class CoalescingEmbeddingEngine(EmbeddingEngine):
+    """
+    EmbeddingEngine that merges concurrent embed() calls (e.g. several documents
+    ingesting at once) into shared API batches. Calls arriving within window_ms
+    of the first pending one are packed together; each caller gets its own slice.
+    """
+
+    def __init__(self, *args, window_ms: float | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.window_s = (window_ms if window_ms is not None else settings.embedding_coalesce_ms) / 1000
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return (await self.embed_matrix(texts)).tolist()
+
+    async def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((texts, fut))
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self.max_inputs * self.concurrency:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_texts = self._pending, [], 0
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, pending: list[tuple[list[str], asyncio.Future]]) -> None:
+        try:
+            vectors = await super().embed_matrix([t for texts, _ in pending for t in texts])
+        except Exception as e:
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled (shutdown, loop teardown): callers would otherwise wait forever
+            for _, fut in pending:
+                fut.cancel()
+            raise
+        logger.info("embed coalesced: callers=%s texts=%s", len(pending), len(vectors))
+        start = 0
+        for texts, fut in pending:
+            if not fut.done():  # caller may have been cancelled
+                fut.set_result(vectors[start : start + len(texts)])
+            start += len(texts)
+
+
+_engine: EmbeddingEngine | None = None
+
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """
+    Return the shared embedding engine (configured from settings). With
+    EMBEDDING_COALESCE_MS > 0, concurrent callers share API batches.
+    """
+    global _engine
+    if _engine is None:
+        if settings.embedding_coalesce_ms > 0:
+            _engine = CoalescingEmbeddingEngine()
+        else:
+            _engine = EmbeddingEngine()
+    return _engine
@@ -0,0 +1,252 @@
+"""
+Streaming ingestion pipeline: extract -> chunk -> embed -> write, overlapped.
+
+Stages run as tasks joined by bounded queues. Embedding starts with the first
+batch of new chunks and rows are COPYed as each embedding batch returns, so a
+document takes roughly as long as its slowest stage, and memory is bounded by
+queue size x batch size. The chunk stage normalises and sectionizes pages as
+they arrive (JDChunkStream) and hands each closed section's chunks on; only
+structured extraction waits for the last page.
+
+With a near_dup_lookup, the embed stage first looks each new chunk up among
+other documents' chunks (MinHash LSH, see near_dup): near-duplicates reuse the
+stored embedding instead of being embedded, and chunks repeated across many
+sources are marked boilerplate / low-signal. Kept rows already marked
+boilerplate are looked up again once chunking is done, and cleared when that
+no longer holds.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_sync import ChunkSyncPlan, ChunkSyncPlanner, chunk_row_values, resolve_boilerplate
+from app.services.chunk_writer import insert_chunk_rows
+from app.services.embedding_cache import embed_with_cache
+from app.services.embeddings import EmbeddingEngine
+from app.services.jd_chunking import JDChunkStream
+from app.services.jd_extraction import extract_scanned_fields
+from app.services.near_dup import NearDupMatch, is_boilerplate, signature_columns
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class PipelineResult:
+    pages: int = 0
+    page_lengths: list[int] = field(default_factory=list)
+    chunks: int = 0
+    low_signal: int = 0
+    near_dup_reused: int = 0  # inserted rows that took a near-duplicate's embedding
+    boilerplate: int = 0  # inserted rows marked boilerplate (near-dups in many sources)
+    boilerplate_cleared: int = 0  # kept rows no longer boilerplate
+    jd_struct: dict | None = None
+    plan: ChunkSyncPlan | None = None
+    busy_ms: dict[str, float] = field(default_factory=dict)  # per stage, excluding queue waits
+    wall_ms: float = 0.0
+
+
+async def _recheck_boilerplate(
+    document_id: uuid.UUID,
+    plan: ChunkSyncPlan,
+    near_dup_lookup: Callable[[uuid.UUID, ChunkBatch], Awaitable[list[NearDupMatch | None]]] | None,
+) -> int:
+    """Look kept boilerplate rows up again (none still hold with lookups off); returns rows cleared."""
+    checks = plan.boilerplate_checks
+    still = [False] * len(checks)
+    if near_dup_lookup is not None:
+        batch = ChunkBatch.from_rows([{"content": c["content"], **signature_columns(c["content"])} for c in checks])
+        still = [is_boilerplate(m) for m in await near_dup_lookup(document_id, batch)]
+    return resolve_boilerplate(plan, still)
+
+
+async def run_ingest_pipeline(
+    db: AsyncSession,
+    document_id: uuid.UUID,
+    page_parts: AsyncIterator[list[tuple[int, str]]],
+    existing: list[dict],
+    *,
+    min_chars: int,
+    max_chunks: int,
+    batch_size: int | None = None,
+    queue_size: int | None = None,
+    embed_workers: int | None = None,
+    near_dup_lookup: Callable[[uuid.UUID, ChunkBatch], Awaitable[list[NearDupMatch | None]]] | None = None,
+    engine: EmbeddingEngine | None = None,
+) -> PipelineResult:
+    """
+    Run the stages over page_parts (lists of (page_number, text), in page order).
+    Chunks are planned against `existing` rows as they are produced: only new
+    content is embedded and inserted (in db's transaction). The caller applies
+    result.plan's updates and deletes and commits. New rows travel between stages
+    as ChunkBatches. near_dup_lookup(document_id, batch) returns one match (or
+    None) per row; it must not use db, which the write stage is using concurrently.
+    engine defaults to the shared get_embedding_engine().
+    """
+    batch_size = batch_size or settings.ingest_embed_batch_chunks
+    queue_size = queue_size or settings.ingest_queue_size
+    embed_workers = embed_workers or settings.embedding_concurrency
+    pages_q: asyncio.Queue = asyncio.Queue(queue_size)
+    embed_q: asyncio.Queue = asyncio.Queue(queue_size)
+    write_q: asyncio.Queue = asyncio.Queue(queue_size)
+    planner = ChunkSyncPlanner(existing)
+    result = PipelineResult()
+    busy: dict[str, float] = defaultdict(float)
+
+    async def extract_stage() -> None:
+        async with aclosing(page_parts) as parts:
+            started = time.perf_counter()
+            async for part in parts:
+                busy["extract"] += time.perf_counter() - started
+                await pages_q.put(part)
+                started = time.perf_counter()
+        await pages_q.put(_DONE)
+
+    async def chunk_stage() -> None:
+        # Sections are chunked as soon as they close, so embedding starts while
+        # later pages are still being extracted; extraction runs on the kept parse
+        stream = JDChunkStream(min_chars, max_chunks, scan_fields=True)
+        batch = ChunkBatch()
+        busy_s = 0.0
+
+        async def _add(chunks: list) -> None:
+            nonlocal batch, busy_s
+            started = time.perf_counter()
+            for cr in chunks:
+                row = chunk_row_values(cr, result.chunks)
+                if planner.add(result.chunks, row):
+                    batch.append(row)
+                result.chunks += 1
+                result.low_signal += cr.is_low_signal
+                if len(batch) >= batch_size:
+                    busy_s += time.perf_counter() - started
+                    await embed_q.put(batch)
+                    batch = ChunkBatch()
+                    started = time.perf_counter()
+            busy_s += time.perf_counter() - started
+
+        while (part := await pages_q.get()) is not _DONE:
+            for page_num, text in part:
+                result.pages += 1
+                result.page_lengths.append(len(text))
+                started = time.perf_counter()
+                chunks = stream.feed(page_num, text)
+                busy_s += time.perf_counter() - started
+                await _add(chunks)
+        started = time.perf_counter()
+        chunks = stream.finish()
+        if result.pages:
+            result.jd_struct = extract_scanned_fields(stream.fields)
+        busy_s += time.perf_counter() - started
+        await _add(chunks)
+        busy["chunk"] += busy_s
+        if batch:
+            await embed_q.put(batch)
+        for _ in range(embed_workers):
+            await embed_q.put(_DONE)
+
+    def _apply_near_dups(batch: ChunkBatch, matches: list[NearDupMatch | None]) -> dict[int, np.ndarray]:
+        """Mark boilerplate rows; returns reusable embeddings by row position."""
+        reused: dict[int, np.ndarray] = {}
+        low_signal, boilerplate = batch.columns["is_low_signal"], batch.columns["is_boilerplate"]
+        for i, match in enumerate(matches):
+            if match is None:
+                continue
+            if is_boilerplate(match):
+                result.low_signal += not low_signal[i]
+                result.boilerplate += 1
+                boilerplate[i] = low_signal[i] = True
+            if match.embedding is not None:
+                reused[i] = match.embedding
+        result.near_dup_reused += len(reused)
+        return reused
+
+    async def embed_stage() -> None:
+        while (batch := await embed_q.get()) is not _DONE:
+            started = time.perf_counter()
+            cols = batch.columns
+            signatures = [signature_columns(c) for c in cols["content"]]
+            cols["minhash"] = [sig["minhash"] for sig in signatures]
+            cols["minhash_bands"] = [sig["minhash_bands"] for sig in signatures]
+            reused: dict[int, np.ndarray] = {}
+            if near_dup_lookup is not None:
+                reused = _apply_near_dups(batch, await near_dup_lookup(document_id, batch))
+            busy["near_dup"] += time.perf_counter() - started
+            started = time.perf_counter()
+            pending = [i for i in range(len(batch)) if i not in reused]
+            embedded = []
+            if pending:
+                embedded = await embed_with_cache(
+                    [cols["content"][i] for i in pending],
+                    [cols["content_hash"][i] for i in pending],
+                    engine=engine,
+                )
+            busy["embed"] += time.perf_counter() - started
+            if len(embedded) != len(pending):
+                raise RuntimeError(f"Embedding count mismatch: {len(embedded)} != {len(pending)}")
+            if reused:
+                matrix = np.empty((len(batch), len(next(iter(reused.values())))), dtype=np.float32)
+                matrix[list(reused)] = list(reused.values())
+                if pending:
+                    matrix[pending] = embedded
+                embedded = matrix
+            batch.set_embeddings(embedded)
+            await write_q.put(batch)
+        await write_q.put(_DONE)
+
+    async def write_stage() -> None:
+        remaining = embed_workers
+        while remaining:
+            item = await write_q.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            started = time.perf_counter()
+            await insert_chunk_rows(db, document_id, item)
+            busy["write"] += time.perf_counter() - started
+
+    wall_started = time.perf_counter()
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(extract_stage())
+            tg.create_task(chunk_stage())
+            for _ in range(embed_workers):
+                tg.create_task(embed_stage())
+            tg.create_task(write_stage())
+    except ExceptionGroup as eg:
+        # Surface the stage's own error (the others were cancelled because of it)
+        raise eg.exceptions[0] from None
+
+    result.plan = planner.finish()
+    if result.plan.boilerplate_checks:
+        started = time.perf_counter()
+        result.boilerplate_cleared = await _recheck_boilerplate(document_id, result.plan, near_dup_lookup)
+        busy["near_dup"] += time.perf_counter() - started
+    result.wall_ms = round((time.perf_counter() - wall_started) * 1000, 1)
+    result.busy_ms = {stage: round(secs * 1000, 1) for stage, secs in busy.items()}
+    logger.info(
+        "ingest pipeline done: document_id=%s pages=%s chunks=%s embedded=%s near_dup_reused=%s "
+        "boilerplate=%s boilerplate_cleared=%s wall_ms=%s busy_ms=%s",
+        document_id,
+        result.pages,
+        result.chunks,
+        len(result.plan.inserts) - result.near_dup_reused,
+        result.near_dup_reused,
+        result.boilerplate,
+        result.boilerplate_cleared,
+        result.wall_ms,
+        result.busy_ms,
+    )
+    return result
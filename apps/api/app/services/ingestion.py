@@ -1,75 +1,61 @@
 """Document ingestion: PDF extraction, chunking, embeddings."""
 
+import asyncio
 import logging
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import select
 
 from app.core.config import settings
-from app.models import Document, DocumentChunk
-from app.services.jd_chunking import chunk_jd_pages
-from app.services.jd_extraction import extract_jd_struct
-from app.services.jd_sections import normalize_jd_text
+from app.models import Document
+from app.services.chunk_sync import apply_chunk_changes, load_existing_chunks
+from app.services.chunk_writer import count_document_chunks
+from app.services.doc_dedupe import (
+    clone_document_results,
+    current_pipeline_version,
+    find_ready_duplicate,
+    sha256_file,
+)
+from app.services.embeddings import EmbeddingEngine
+from app.services.ingest_pipeline import run_ingest_pipeline
+from app.services.near_dup import lookup_near_duplicates
+from app.services.pdf_pool import get_extraction_pool
 from app.services.storage import get_storage
 
 logger = logging.getLogger(__name__)
 
 
-def _extract_text_per_page(pdf_bytes: bytes) -> list[tuple[int, str]]:
-    """Extract text per page using PyMuPDF. Returns [(page_number, text), ...]."""
-    import fitz  # PyMuPDF
-
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+@asynccontextmanager
+async def _local_pdf(storage, key: str) -> AsyncIterator[str]:
+    """storage.local_path() with the (blocking) download and cleanup run off the event loop."""
+    cm = storage.local_path(key)
+    path = await asyncio.to_thread(cm.__enter__)
     try:
-        result = []
-        limit = min(len(doc), settings.max_pdf_pages)
-        for i in range(limit):
-            page = doc[i]
-            text = page.get_text()
-            result.append((i + 1, text))
-            logger.debug(
-                "PDF extraction page=%s text_len=%s",
-                i + 1,
-                len(text),
-            )
-        logger.info(
-            "PDF extraction done: pages_extracted=%s per_page_lengths=%s",
-            len(result),
-            [len(t) for _, t in result],
-        )
-        return result
+        yield path
     finally:
-        doc.close()
-
-
-def _create_embeddings(texts: list[str]) -> list[list[float]]:
-    """Create embeddings via OpenAI API. Returns list of embedding vectors."""
-    from openai import OpenAI
-
-    if not settings.openai_api_key:
-        raise ValueError("OPENAI_API_KEY is not configured")
-
-    client = OpenAI(api_key=settings.openai_api_key)
-
-    # text-embedding-3 models support dimensions param; older models do not
-    create_kwargs: dict = {
-        "input": texts,
-        "model": settings.openai_embedding_model,
-    }
-    if settings.openai_embedding_model.startswith("text-embedding-3"):
-        create_kwargs["dimensions"] = settings.openai_embedding_dim
-    response = client.embeddings.create(**create_kwargs)
-
-    # Preserve order; response.data is in order of input
-    by_index = {item.index: item.embedding for item in response.data}
-    return [by_index[i] for i in range(len(texts))]
+        await asyncio.to_thread(cm.__exit__, None, None, None)
 
 
-async def run_ingestion(document_id: uuid.UUID) -> None:
+async def run_ingestion(
+    document_id: uuid.UUID,
+    raise_errors: bool = False,
+    engine: EmbeddingEngine | None = None,
+) -> None:
     """
-    Background ingestion: download PDF, extract, chunk, embed, store.
+    Background ingestion: download PDF, extract, chunk, embed, store
+    (as overlapped stages; see ingest_pipeline).
+    A PDF identical to a ready document (same SHA-256 and pipeline version)
+    has that document's results cloned instead.
+    Chunks are synced against stored rows by content_hash: unchanged chunks keep
+    their row and embedding; only new chunks are embedded and inserted. Rows from
+    another pipeline version (e.g. embedding model) are replaced wholesale.
     On success: update document page_count and status=ready.
     On failure: update status=failed and error_message.
+    raise_errors: re-raise unexpected errors after recording them (job worker retries).
+    engine: embedding engine for new chunks (default: the shared get_embedding_engine()).
     """
     from app.db.base import async_session_maker
 
@@ -82,110 +68,81 @@ async def run_ingestion(document_id: uuid.UUID) -> None:
             if not doc:
                 return
 
-            storage = get_storage()
-            pdf_bytes = storage.download(doc.s3_key)
-
-            page_texts = _extract_text_per_page(pdf_bytes)
-            if not page_texts:
-                doc.status = "failed"
-                doc.error_message = "No text extracted from PDF"
+            async with _local_pdf(get_storage(), doc.s3_key) as pdf_path:
+                doc.content_sha256 = await asyncio.to_thread(sha256_file, pdf_path)
+                stored_version = doc.pipeline_version
+                doc.pipeline_version = current_pipeline_version()
+                twin = await find_ready_duplicate(db, doc)
+                if twin is None:
+                    # Diff against stored rows: unchanged chunks keep their row and embedding
+                    # (rows from another pipeline version / embedding model are rebuilt)
+                    existing = await load_existing_chunks(db, document_id, stored_version)
+                    near_dup_lookup = None
+                    if settings.near_dup_threshold > 0:
+                        # The lookup's own session can't see this transaction's content_sha256
+                        near_dup_lookup = partial(
+                            lookup_near_duplicates, user_id=doc.user_id, content_sha256=doc.content_sha256
+                        )
+                    run = await run_ingest_pipeline(
+                        db,
+                        document_id,
+                        get_extraction_pool().iter_extract(pdf_path, settings.max_pdf_pages),
+                        existing,
+                        min_chars=settings.min_chunk_chars,
+                        max_chunks=settings.max_chunks_per_doc,
+                        near_dup_lookup=near_dup_lookup,
+                        engine=engine,
+                    )
+
+            if twin is not None:
+                # Same bytes, same pipeline: copy the finished results, no extraction or embeddings
+                await clone_document_results(db, twin, doc)
+                doc.status = "ready"
+                doc.error_message = None
                 await db.commit()
                 return
 
-            full_text = "\n\n".join(t for _, t in page_texts)
-            norm_text = normalize_jd_text(full_text)
-            jd_struct = extract_jd_struct(norm_text)
-            doc.jd_extraction_json = jd_struct
-
-            chunk_results = chunk_jd_pages(
-                page_texts,
-                min_chars=settings.min_chunk_chars,
-                max_chunks=settings.max_chunks_per_doc,
+            logger.info(
+                "PDF extraction done: pages_extracted=%s per_page_lengths=%s",
+                run.pages,
+                run.page_lengths,
             )
-            chunk_stats = {"chunks_produced": len(chunk_results), "total_paragraphs": 0}
-            if not chunk_results:
+            if not run.pages:
                 doc.status = "failed"
-                doc.error_message = "No chunks produced after extraction"
+                doc.error_message = "No text extracted from PDF"
                 await db.commit()
                 return
 
-            low_signal_count = sum(1 for c in chunk_results if c.is_low_signal)
-
-            logger.info(
-                "ingestion BEFORE insert: pages_extracted=%s num_paragraphs=%s num_chunks_generated=%s "
-                "num_chunks_marked_low_signal=%s num_chunks_to_insert=%s",
-                len(page_texts),
-                chunk_stats.get("total_paragraphs", "?"),
-                chunk_stats.get("chunks_produced", len(chunk_results)),
-                low_signal_count,
-                len(chunk_results),
-            )
-
-            texts = [c.content for c in chunk_results]
-            embeddings = _create_embeddings(texts)
-
-            if len(embeddings) != len(chunk_results):
-                logger.error(
-                    "embedding count mismatch: chunks=%s embeddings=%s",
-                    len(chunk_results),
-                    len(embeddings),
-                )
+            doc.jd_extraction_json = run.jd_struct
+            if not run.chunks:
                 doc.status = "failed"
-                doc.error_message = f"Embedding count mismatch: {len(embeddings)} != {len(chunk_results)}"
+                doc.error_message = "No chunks produced after extraction"
                 await db.commit()
                 return
 
-            await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
-
-            inserted = 0
-            for i, (cr, embedding) in enumerate(zip(chunk_results, embeddings)):
-                chunk = DocumentChunk(
-                    document_id=document_id,
-                    chunk_index=i,
-                    content=cr.content,
-                    page_number=cr.page_number,
-                    section=cr.section_type,
-                    is_boilerplate=False,
-                    quality_score=cr.quality_score,
-                    is_low_signal=cr.is_low_signal,
-                    content_hash=cr.content_hash,
-                    section_type=cr.section_type,
-                    skills_detected=cr.skills_detected,
-                    doc_domain=cr.doc_domain,
-                    embedding=embedding,
-                )
-                db.add(chunk)
-                inserted += 1
+            plan = run.plan
+            await apply_chunk_changes(db, document_id, plan)
+            num_rows = run.chunks
 
             logger.info(
-                "ingestion AFTER insert: num_rows_inserted=%s document_id=%s",
-                inserted,
+                "ingestion AFTER insert: num_rows=%s (inserted=%s low_signal=%s) document_id=%s",
+                num_rows,
+                len(plan.inserts),
+                run.low_signal,
                 document_id,
             )
-            doc.page_count = len(page_texts)
+            # Verify before commit so a short write rolls back instead of leaving a partial doc
+            num_rows_in_db = await count_document_chunks(db, document_id)
+            if num_rows_in_db != num_rows:
+                raise RuntimeError(
+                    f"Chunk row count mismatch: expected {num_rows}, found {num_rows_in_db}"
+                )
+
+            doc.page_count = run.pages
             doc.status = "ready"
             doc.error_message = None
             await db.commit()
 
-            count_result = await db.execute(
-                select(func.count()).select_from(DocumentChunk).where(
-                    DocumentChunk.document_id == document_id
-                )
-            )
-            num_rows_in_db = count_result.scalar() or 0
-            logger.info(
-                "ingestion AFTER commit: num_rows_in_db=%s (inserted=%s) document_id=%s",
-                num_rows_in_db,
-                inserted,
-                document_id,
-            )
-            if num_rows_in_db != inserted:
-                logger.warning(
-                    "ingestion row count mismatch: inserted=%s but DB has %s",
-                    inserted,
-                    num_rows_in_db,
-                )
-
         except Exception as e:
             await db.rollback()
             # Use fresh session to persist failure status
@@ -198,3 +155,5 @@ async def run_ingestion(document_id: uuid.UUID) -> None:
                     doc.status = "failed"
                     doc.error_message = str(e)[:2000]  # Cap error length
                 await db2.commit()
+            if raise_errors:
+                raise
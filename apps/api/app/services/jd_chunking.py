@@ -3,6 +3,7 @@
 import hashlib
 import logging
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
 from app.core.config import settings
@@ -12,8 +13,8 @@ from app.services.chunking import (
     _is_low_signal,
     _quality_score,
 )
-from app.services.jd_extraction import _extract_skills_from_text
-from app.services.jd_sections import normalize_jd_text, sectionize_jd_text
+from app.services.jd_extraction import JDFieldScan, ParsedJD, _extract_skills_from_text
+from app.services.jd_sections import JDSectionStream
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ JD_DOMAIN = "job_description"
 MAX_CHARS_PER_CHUNK = 500  # Split larger sections for more granular retrieval
 
 
-@dataclass
+@dataclass(slots=True)
 class JDChunkResult:
     page_number: int
     content: str
@@ -74,55 +75,151 @@ def _split_section_into_chunks(
     return [(b, section_type) for b in blocks if len(b) >= 25]
 
 
-def chunk_jd_pages(
-    page_texts: list[tuple[int, str]],
+def _section_chunks(
+    section_type: str,
+    content: str,
+    first_index: int,
+    min_chars: int,
+    max_chunks: int,
+    section_skills,
+) -> list[JDChunkResult]:
+    """Chunks of one section, indexed from first_index (none at or past max_chunks)."""
+    out: list[JDChunkResult] = []
+    chunk_idx = first_index
+    sub_chunks = _split_section_into_chunks(
+        section_type, content, page_num=1, max_chars=MAX_CHARS_PER_CHUNK
+    )
+    for chunk_content, sec in sub_chunks:
+        if chunk_idx >= max_chunks or len(chunk_content) < min_chars:
+            continue
+        metrics = _compute_quality_metrics(chunk_content)
+        qs = _quality_score(metrics)
+        low = _is_low_signal(metrics)
+        chash = _content_hash(chunk_content)
+        # A section that fits in one chunk shares its skill hits with extraction
+        if chunk_content == content:
+            skills = section_skills()
+        else:
+            skills = _extract_skills_from_text(chunk_content)
+
+        out.append(JDChunkResult(
+            page_number=1,
+            content=chunk_content,
+            chunk_index=chunk_idx,
+            quality_score=round(qs, 4),
+            is_low_signal=low,
+            content_hash=chash,
+            section_type=sec,
+            skills_detected=skills,
+            doc_domain=JD_DOMAIN,
+        ))
+        chunk_idx += 1
+    return out
+
+
+class JDChunkStream:
+    """
+    JD chunking over pages as they arrive: feed() returns the chunks of every
+    section closed so far, finish() the rest. Same chunks as chunk_jd_pages of all
+    pages, while holding only the open section (JDSectionStream). scan_fields=True
+    also collects what structured extraction reads (self.fields, a JDFieldScan,
+    complete after finish()), sharing the skill hits of single-chunk sections.
+    """
+
+    def __init__(self, min_chars: int = 25, max_chunks: int = 300, scan_fields: bool = False):
+        self.min_chars = min_chars
+        self.max_chunks = max_chunks
+        self.sections = 0
+        self.chunks = 0
+        self.fields: JDFieldScan | None = JDFieldScan() if scan_fields else None
+        self._stream = JDSectionStream(on_text=self.fields.feed if scan_fields else None)
+        self._pages = 0
+
+    def _chunk(self, sections: list[tuple[str, str]]) -> list[JDChunkResult]:
+        out: list[JDChunkResult] = []
+        for section_type, content in sections:
+            self.sections += 1
+            hits: list[list[str]] = []
+
+            def skills(content=content, hits=hits) -> list[str]:
+                if not hits:
+                    hits.append(_extract_skills_from_text(content))
+                return hits[0]
+
+            if self.fields is not None:
+                self.fields.add_section(section_type, content, skills)
+            if self.chunks >= self.max_chunks:
+                continue
+            chunks = _section_chunks(section_type, content, self.chunks, self.min_chars, self.max_chunks, skills)
+            self.chunks += len(chunks)
+            out.extend(chunks)
+        return out
+
+    def feed(self, page_number: int, text: str) -> list[JDChunkResult]:
+        """Add the next page (pages are joined by a blank line, as in chunk_jd_pages)."""
+        piece = text if not self._pages else "\n\n" + text
+        self._pages += 1
+        return self._chunk(self._stream.feed(piece))
+
+    def finish(self) -> list[JDChunkResult]:
+        return self._chunk(self._stream.finish())
+
+
+def iter_jd_chunks(
+    page_texts: Iterable[tuple[int, str]],
     min_chars: int = 25,
     max_chunks: int = 300,
-) -> list[JDChunkResult]:
+    stats: dict | None = None,
+    parsed: ParsedJD | None = None,
+) -> Iterator[JDChunkResult]:
     """
-    Chunk JD text by semantic section. Keeps bullet lists intact.
-    Tags each chunk with section_type, skills_detected, doc_domain=job_description.
+    Yield JD chunks by semantic section, in order, as each is built.
+    Keeps bullet lists intact. Tags each chunk with section_type,
+    skills_detected, doc_domain=job_description. stats gets "sections".
+    page_texts may be any iterable: pages are consumed lazily and a section's
+    chunks are yielded as soon as it closes (JDChunkStream).
+    Pass `parsed` (parse_jd of the pages joined by blank lines) to reuse a parse.
     """
-    full_text = "\n\n".join(t for _, t in page_texts)
-    norm_text = normalize_jd_text(full_text)
-    sections = sectionize_jd_text(norm_text)
+    if parsed is None:
+        stream = JDChunkStream(min_chars, max_chunks)
+        for page_num, text in page_texts:
+            yield from stream.feed(page_num, text)
+        yield from stream.finish()
+        if stats is not None:
+            stats["sections"] = stream.sections
+        return
+
+    sections = parsed.sections
+    if stats is not None:
+        stats["sections"] = len(sections)
 
-    results: list[JDChunkResult] = []
     chunk_idx = 0
-
-    for section_type, content in sections:
+    for section_idx, (section_type, content) in enumerate(sections):
         if chunk_idx >= max_chunks:
             break
-        sub_chunks = _split_section_into_chunks(
-            section_type, content, page_num=1, max_chars=MAX_CHARS_PER_CHUNK
+        chunks = _section_chunks(
+            section_type, content, chunk_idx, min_chars, max_chunks,
+            lambda i=section_idx: parsed.section_skills(i),
         )
-        for chunk_content, sec in sub_chunks:
-            if chunk_idx >= max_chunks or len(chunk_content) < min_chars:
-                continue
-            metrics = _compute_quality_metrics(chunk_content)
-            qs = _quality_score(metrics)
-            low = _is_low_signal(metrics)
-            chash = _content_hash(chunk_content)
-            skills = _extract_skills_from_text(chunk_content)
+        chunk_idx += len(chunks)
+        yield from chunks
 
-            results.append(
-                JDChunkResult(
-                    page_number=1,
-                    content=chunk_content,
-                    chunk_index=chunk_idx,
-                    quality_score=round(qs, 4),
-                    is_low_signal=low,
-                    content_hash=chash,
-                    section_type=sec,
-                    skills_detected=skills,
-                    doc_domain=JD_DOMAIN,
-                )
-            )
-            chunk_idx += 1
+
+def chunk_jd_pages(
+    page_texts: Iterable[tuple[int, str]],
+    min_chars: int = 25,
+    max_chunks: int = 300,
+) -> list[JDChunkResult]:
+    """
+    Chunk JD text by semantic section. Keeps bullet lists intact.
+    Tags each chunk with section_type, skills_detected, doc_domain=job_description.
+    """
+    stats: dict = {}
+    results = list(iter_jd_chunks(page_texts, min_chars, max_chunks, stats))
 
     logger.info(
         "chunk_jd_pages done: sections=%s chunks=%s (max_chars=%s)",
-        len(sections),
+        stats["sections"],
         len(results),
         MAX_CHARS_PER_CHUNK,
     )
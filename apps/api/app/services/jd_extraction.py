@@ -1,10 +1,13 @@
 """Rule-based structured extraction from JD text. No LLM."""
 
 import re
+from collections.abc import Callable
 from dataclasses import asdict, dataclass, field
+from functools import cached_property
 
-from app.services.jd_sections import sectionize_jd_text
+from app.services.jd_sections import sectionize_jd_lines
 from app.services.jd_sections import normalize_jd_text
+from app.services.phrase_matcher import PhraseMatcher
 
 
 @dataclass
@@ -44,17 +47,45 @@ EDUCATION_RE = re.compile(
     r"(?:bachelor|b\.?s\.?|master|m\.?s\.?|phd|mba|degree)\s*(?:in\s+)?[\w\s,]+",
     re.IGNORECASE,
 )
-# Common skills / tools keywords
+LOCATION_RE = re.compile(r"([A-Za-z\s]+,\s*[A-Za-z]{2})|(remote|hybrid|onsite)", re.IGNORECASE)
+# Full-text searches, each with a class of every char it can consume (same flags)
+_SEARCHES: dict[str, tuple[re.Pattern, re.Pattern]] = {
+    "salary": (SALARY_RE, re.compile(r"[\s\d$,.\-–—/adeklnoprstuy]", re.IGNORECASE)),
+    "experience": (YEAR_RE, re.compile(r"[\s\d+acefinoprsxy]", re.IGNORECASE)),
+    "education": (EDUCATION_RE, re.compile(r"[\w\s,.]", re.IGNORECASE)),
+    "location": (LOCATION_RE, re.compile(r"[A-Za-z\s,]", re.IGNORECASE)),
+}
+# Common skills / tools keywords (entries may be phrases)
 SKILL_KEYWORDS = frozenset(
-    "python java javascript typescript sql spark aws azure gcp "
-    "machine learning ml ai llm tensorflow pytorch sklearn "
-    "react node api rest api agile scrum".split()
+    {
+        *"python java javascript typescript sql spark aws azure gcp".split(),
+        *"ml ai llm tensorflow pytorch sklearn react node api agile scrum".split(),
+        "machine learning",
+        "rest api",
+    }
 )
 TOOL_KEYWORDS = frozenset(
     "jupyter pandas numpy docker kubernetes git jenkins "
     "postgres mysql mongodb redis s3 lambda".split()
 )
-CLOUD_KEYWORDS = frozenset("aws azure gcp google cloud".split())
+# Cloud mention -> platform
+CLOUD_TERMS: dict[str, str] = {
+    "aws": "aws",
+    "amazon web services": "aws",
+    "azure": "azure",
+    "microsoft azure": "azure",
+    "gcp": "gcp",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+}
+
+# One automaton for every skill, tool and cloud term, built at import
+_TERM_MATCHER = PhraseMatcher(
+    sorted(
+        [(t, ("skill", t)) for t in SKILL_KEYWORDS | TOOL_KEYWORDS]
+        + [(phrase, ("cloud", platform)) for phrase, platform in CLOUD_TERMS.items()]
+    )
+)
 
 
 def _extract_bullets(text: str) -> list[str]:
@@ -73,29 +104,180 @@ def _extract_bullets(text: str) -> list[str]:
     return [b for b in bullets if len(b) > 10]
 
 
+def _extract_terms(text: str, kind: str) -> list[str]:
+    """Distinct terms of one kind ("skill" | "cloud") in text, by first occurrence."""
+    return [name for k, name in _TERM_MATCHER.find(text) if k == kind]
+
+
 def _extract_skills_from_text(text: str) -> list[str]:
-    """Extract skill-like tokens from text."""
-    words = re.findall(r"\b[A-Za-z][a-zA-Z0-9.#+]+\b", text.lower())
-    seen: set[str] = set()
-    result = []
-    for w in words:
-        if w in SKILL_KEYWORDS or w in TOOL_KEYWORDS:
-            if w not in seen:
-                seen.add(w)
-                result.append(w)
-    return result
+    """Extract skill and tool terms (words and phrases) from text."""
+    return _extract_terms(text, "skill")
 
 
 def _extract_cloud(text: str) -> list[str]:
-    """Extract cloud platform mentions."""
-    t = text.lower()
-    result = []
-    for c in CLOUD_KEYWORDS:
-        if c in t:
-            result.append(c)
-    if "gcp" in t or "google cloud" in t:
-        result.append("gcp")
-    return list(dict.fromkeys(result))  # preserve order, no dupes
+    """Extract cloud platform mentions (canonical platform names)."""
+    return _extract_terms(text, "cloud")
+
+
+@dataclass
+class ParsedJD:
+    """
+    A JD normalised, split into lines and sectionised once, shared by structured
+    extraction and chunking. Skill hits are computed per section on first use.
+    """
+
+    text: str
+    lines: list[str]
+    sections: list[tuple[str, str]]
+    _section_skills: dict[int, list[str]] = field(default_factory=dict, repr=False)
+
+    @cached_property
+    def line_offsets(self) -> list[int]:
+        """Char offset in text of each line start."""
+        offsets, pos = [], 0
+        for ln in self.lines:
+            offsets.append(pos)
+            pos += len(ln) + 1
+        return offsets
+
+    @cached_property
+    def section_map(self) -> dict[str, str]:
+        """section_type -> content (the last section of each type wins)."""
+        return {k: v for k, v in self.sections}
+
+    @cached_property
+    def _last_section_index(self) -> dict[str, int]:
+        return {k: i for i, (k, _) in enumerate(self.sections)}
+
+    def section_skills(self, index: int) -> list[str]:
+        """Skill and tool terms in sections[index]."""
+        if index not in self._section_skills:
+            self._section_skills[index] = _extract_skills_from_text(self.sections[index][1])
+        return self._section_skills[index]
+
+    def skills_in(self, section_type: str) -> list[str]:
+        """Skill and tool terms in section_map[section_type]."""
+        return self.section_skills(self._last_section_index[section_type])
+
+
+# _FirstSearch tail cap (chars) when no barrier arrives
+MAX_SEARCH_TAIL = 1 << 16
+
+
+class _FirstSearch:
+    """
+    pattern.search(text) over text arriving in pieces, holding only the tail
+    where the first match can still start. A match can't run past a char that
+    `chars` doesn't match (a barrier), so once one arrives, the text before it
+    either holds the first match, found exactly as in the whole text, or none
+    and is dropped. Fallback: past MAX_SEARCH_TAIL chars with no barrier (e.g. a
+    wall of plain words for EDUCATION_RE) the oldest are dropped, and a match
+    starting in them is missed.
+    """
+
+    __slots__ = ("pattern", "_last_barrier", "_tail", "match")
+
+    def __init__(self, pattern: re.Pattern, chars: re.Pattern):
+        self.pattern = pattern
+        # Greedy prefix, so the match ends just past the last barrier
+        self._last_barrier = re.compile(rf"[\s\S]*(?!{chars.pattern})[\s\S]", chars.flags)
+        self._tail = ""
+        self.match: str | None = None
+
+    def feed(self, text: str) -> None:
+        if self.match is not None:
+            return
+        start = len(self._tail)
+        self._tail += text
+        barrier = self._last_barrier.match(self._tail, start)
+        if barrier is not None:
+            m = self.pattern.search(self._tail, 0, barrier.end() - 1)
+            if m is not None:
+                self.match, self._tail = m.group(0), ""
+                return
+            self._tail = self._tail[barrier.end() :]
+        if len(self._tail) > MAX_SEARCH_TAIL:
+            self._tail = self._tail[-MAX_SEARCH_TAIL:]
+
+    def finish(self) -> str | None:
+        if self.match is None:
+            m = self.pattern.search(self._tail)
+            self.match = m.group(0) if m else None
+            self._tail = ""
+        return self.match
+
+
+# Sections extract_jd_fields reads (the last one of each type)
+EXTRACTED_SECTIONS = frozenset(
+    {"location", "responsibilities", "qualifications", "tools_technologies", "preferred_qualifications"}
+)
+_HEAD_CHARS = 500
+_HEAD_LINES = 20
+
+
+class JDFieldScan:
+    """
+    What extract_jd_fields reads, collected as the normalised text arrives in
+    segments (joined by "\\n") and sections close: the first 500 chars and 20
+    lines, the last section of each EXTRACTED_SECTIONS type with its skill hits,
+    the first match of each full-text search (_FirstSearch) and cloud terms by
+    first occurrence. Memory doesn't grow with the document.
+    """
+
+    def __init__(self) -> None:
+        self.head = ""
+        self.lines: list[str] = []
+        self.section_map: dict[str, str] = {}
+        self._skills: dict[str, Callable[[], list[str]]] = {}
+        self._searches = {name: _FirstSearch(pattern, chars) for name, (pattern, chars) in _SEARCHES.items()}
+        self._cloud: dict[str, None] = {}
+        self._started = False
+
+    @classmethod
+    def of(cls, parsed: ParsedJD) -> "JDFieldScan":
+        """Scan of a whole parse, sharing its per-section skill hits."""
+        scan = cls()
+        scan.feed(parsed.text)
+        for i, (section_type, content) in enumerate(parsed.sections):
+            scan.add_section(section_type, content, lambda i=i: parsed.section_skills(i))
+        return scan
+
+    def feed(self, segment: str) -> None:
+        """The next normalised segment."""
+        text = "\n" + segment if self._started else segment
+        self._started = True
+        if len(self.head) < _HEAD_CHARS:
+            self.head = (self.head + text)[:_HEAD_CHARS]
+        if len(self.lines) < _HEAD_LINES:
+            # The text's lines are every segment's lines in turn ("\n" joins them)
+            self.lines.extend(segment.split("\n", _HEAD_LINES)[: _HEAD_LINES - len(self.lines)])
+        for search in self._searches.values():
+            search.feed(text)
+        # Phrases never span a line break, so segments can be scanned on their own
+        self._cloud.update(dict.fromkeys(_extract_cloud(segment)))
+
+    def add_section(self, section_type: str, content: str, skills: Callable[[], list[str]]) -> None:
+        """A closed section; skills() returns its skill and tool terms (computed once)."""
+        if section_type in EXTRACTED_SECTIONS:
+            self.section_map[section_type] = content
+            self._skills[section_type] = skills
+
+    def skills_in(self, section_type: str) -> list[str]:
+        return self._skills[section_type]()
+
+    def search(self, name: str) -> str | None:
+        return self._searches[name].finish()
+
+    @property
+    def cloud_platforms(self) -> list[str]:
+        return list(self._cloud)
+
+
+def parse_jd(text: str) -> ParsedJD:
+    """Normalise and sectionise raw JD text."""
+    norm_text = normalize_jd_text(text)
+    lines = norm_text.split("\n")
+    return ParsedJD(text=norm_text, lines=lines, sections=sectionize_jd_lines(lines))
 
 
 def extract_jd_struct(full_text: str) -> dict:
@@ -103,18 +285,26 @@ def extract_jd_struct(full_text: str) -> dict:
     Extract structured JSON from JD text. Rule-based, no LLM.
     Returns dict matching JDExtraction schema.
     """
-    norm_text = normalize_jd_text(full_text)
-    sections = sectionize_jd_text(norm_text)
-    section_map = {k: v for k, v in sections}
+    return extract_jd_fields(parse_jd(full_text))
+
+
+def extract_jd_fields(parsed: ParsedJD) -> dict:
+    """extract_jd_struct over an already parsed JD."""
+    return extract_scanned_fields(JDFieldScan.of(parsed))
+
+
+def extract_scanned_fields(scan: JDFieldScan) -> dict:
+    """extract_jd_struct from a JDFieldScan of the whole text."""
+    section_map = scan.section_map
 
     extraction = JDExtraction()
 
     # Role title: often first line or in position_summary / about
-    lines = norm_text.split("\n")
+    lines = scan.lines
     for i, ln in enumerate(lines[:15]):
         ln = ln.strip()
         if len(ln) > 10 and len(ln) < 120:
-            if not re.match(r"^[•\-*]\s", ln) and "job" in norm_text[:500].lower():
+            if not re.match(r"^[•\-*]\s", ln) and "job" in scan.head.lower():
                 # Heuristic: first substantial line might be title
                 if "engineer" in ln.lower() or "analyst" in ln.lower() or "manager" in ln.lower():
                     extraction.role_title = ln
@@ -133,38 +323,38 @@ def extract_jd_struct(full_text: str) -> dict:
         extraction.location = section_map["location"][:200].replace("\n", " ")
     # Fallback: search for city/state patterns
     if not extraction.location:
-        loc_m = re.search(r"([A-Za-z\s]+,\s*[A-Za-z]{2})|(remote|hybrid|onsite)", norm_text, re.IGNORECASE)
+        loc_m = scan.search("location")
         if loc_m:
-            extraction.location = loc_m.group(0)[:100]
+            extraction.location = loc_m[:100]
 
     # Salary
-    salary_m = SALARY_RE.search(norm_text)
+    salary_m = scan.search("salary")
     if salary_m:
-        extraction.salary_range = salary_m.group(0).strip()
+        extraction.salary_range = salary_m.strip()
 
     # Experience
-    exp_m = YEAR_RE.search(norm_text)
+    exp_m = scan.search("experience")
     if exp_m:
-        extraction.experience_years_required = exp_m.group(0).strip()
+        extraction.experience_years_required = exp_m.strip()
 
     # Education
-    edu_m = EDUCATION_RE.search(norm_text)
+    edu_m = scan.search("education")
     if edu_m:
-        extraction.education_requirements = edu_m.group(0).strip()
+        extraction.education_requirements = edu_m.strip()
 
     # Raw sections + skills from them
     if "responsibilities" in section_map:
         extraction.raw_sections["responsibilities"] = _extract_bullets(section_map["responsibilities"])
     if "qualifications" in section_map:
         extraction.raw_sections["qualifications"] = _extract_bullets(section_map["qualifications"])
-        extraction.required_skills = _extract_skills_from_text(section_map["qualifications"])
+        extraction.required_skills = scan.skills_in("qualifications")
     if "tools_technologies" in section_map or "qualifications" in section_map:
         combined = section_map.get("tools_technologies", "") + " " + section_map.get("qualifications", "")
         extraction.raw_sections["tools_technologies"] = _extract_bullets(combined)
         extraction.tools = _extract_skills_from_text(combined)
     if "preferred_qualifications" in section_map:
-        extraction.preferred_skills = _extract_skills_from_text(section_map["preferred_qualifications"])
+        extraction.preferred_skills = scan.skills_in("preferred_qualifications")
 
-    extraction.cloud_platforms = _extract_cloud(norm_text)
+    extraction.cloud_platforms = scan.cloud_platforms
 
     return extraction.to_json()
@@ -1,6 +1,7 @@
 """JD-aware section detection. Canonical section map + alias mapping."""
 
 import re
+from collections.abc import Callable
 
 # Canonical JD section keys (order hints for extraction)
 CANONICAL_SECTIONS = [
@@ -67,12 +68,43 @@ JD_SECTION_ALIASES: dict[str, str] = {
 }
 
 
+# Alias table compiled once for _match_section_heading. Position = dict order: the
+# original scan returned the first alias (in dict order) that matched, so every
+# lookup below keeps the lowest position.
+_ALIASES = list(JD_SECTION_ALIASES)
+_ALIAS_POS = {alias: i for i, alias in enumerate(_ALIASES)}
+# First word of an alias -> first alias with that first word (reversed so the earliest wins)
+_FIRST_WORD_POS = {a.split(" ", 1)[0]: i for i, a in reversed(list(enumerate(_ALIASES)))}
+# An alias is a prefix of norm iff norm[:len(alias)] is that alias
+_ALIAS_LENGTHS = sorted({len(a) for a in _ALIASES})
+
+_HEADING_PUNCT_RE = re.compile(r"[^\w\s&]")
+
+
 def _normalize_heading(text: str) -> str:
     """Normalize heading for alias lookup."""
     t = text.strip().lower()
-    t = re.sub(r"[^\w\s&]", "", t)  # remove punctuation except &
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+    t = _HEADING_PUNCT_RE.sub("", t)  # remove punctuation except &
+    # Collapse whitespace runs and strip (str.split() and \s agree on what whitespace is)
+    return " ".join(t.split())
+
+
+def _first_alias_match(norm: str, first: str) -> str | None:
+    """
+    Canonical section of the first alias (dict order) that either has `first` as
+    its first word or is a prefix of `norm`. One dict lookup per distinct alias
+    length plus one for the first word, however many aliases there are.
+    """
+    best = _FIRST_WORD_POS.get(first, len(_ALIASES))
+    for n in _ALIAS_LENGTHS:
+        if n > len(norm):
+            break
+        pos = _ALIAS_POS.get(norm[:n])
+        if pos is not None and pos < best:
+            best = pos
+    if best == len(_ALIASES):
+        return None
+    return JD_SECTION_ALIASES[_ALIASES[best]]
 
 
 def _match_section_heading(line: str) -> str | None:
@@ -96,12 +128,7 @@ def _match_section_heading(line: str) -> str | None:
     first = words[0] if words else ""
     if first in ("remote", "hybrid") and stripped_len > 15:
         return None
-    for alias, canonical in JD_SECTION_ALIASES.items():
-        if alias == first or alias.startswith(first + " "):
-            return canonical
-        if len(alias) <= len(norm) and norm.startswith(alias):
-            return canonical
-    return None
+    return _first_alias_match(norm, first)
 
 
 def sectionize_jd_text(text: str) -> list[tuple[str, str]]:
@@ -110,19 +137,42 @@ def sectionize_jd_text(text: str) -> list[tuple[str, str]]:
     Uses heading detection + alias mapping; falls back to keyword grouping.
     Returns list of (canonical_section, section_content).
     """
-    lines = text.split("\n")
+    return sectionize_jd_lines(text.split("\n"))
+
+
+def sectionize_jd_lines(lines: list[str]) -> list[tuple[str, str]]:
+    """sectionize_jd_text over text already split into lines."""
     sections: list[tuple[str, str]] = []
-    current_section = "about"  # default for content before first heading
-    current_content: list[str] = []
+    state = _new_section_state()
+    _sectionize_into(lines, state, sections)
+    _close_section(state, sections)
+    return sections
+
 
+def _new_section_state() -> list:
+    # [current_section, current_content]; content before the first heading is "about"
+    return ["about", []]
+
+
+def _close_section(state: list, sections: list[tuple[str, str]]) -> None:
+    if state[1]:
+        content = "\n".join(state[1]).strip()
+        if content:
+            sections.append((state[0], content))
+        state[1] = []
+
+
+def _sectionize_into(lines, state: list, sections: list[tuple[str, str]]) -> None:
+    """Feed lines through the section state machine, appending sections as they close."""
+    current_content = state[1]
     for ln in lines:
         stripped = ln.strip()
         if not stripped:
             if current_content:
                 content = "\n".join(current_content).strip()
                 if content:
-                    sections.append((current_section, content))
-                current_content = []
+                    sections.append((state[0], content))
+                current_content = state[1] = []
             continue
 
         matched = _match_section_heading(stripped)
@@ -130,43 +180,157 @@ def sectionize_jd_text(text: str) -> list[tuple[str, str]]:
             if current_content:
                 content = "\n".join(current_content).strip()
                 if content:
-                    sections.append((current_section, content))
-                current_content = []
-            current_section = matched
+                    sections.append((state[0], content))
+            state[0] = matched
             # Heading line: if short, treat as header only; if long, might be header + first line
             if len(stripped) < 50:
-                current_content = []  # header only
+                current_content = state[1] = []  # header only
             else:
-                current_content = [stripped]
+                current_content = state[1] = [stripped]
         else:
             current_content.append(stripped)
 
-    if current_content:
-        content = "\n".join(current_content).strip()
-        if content:
-            sections.append((current_section, content))
 
-    return sections
+# normalize_jd_text passes, compiled once
+_MOJIBAKE_BULLET_RE = re.compile("\u00e2\u20ac\u00a2|\u00e2\u00a2|\u0393\u00c7\u00f3")  # â€¢ â¢ ΓÇó
+# Runs of space/tab/NBSP that differ from a single " " (lone spaces are left alone)
+_HSPACE_RE = re.compile(r"[\t\u00a0][ \t\u00a0]*| [ \t\u00a0]+")
+_BULLET_RE = re.compile(r"^\s*[•\-*]\s+", re.MULTILINE)
+_TRIANGLE_BULLET_RE = re.compile(r"^\s*[\u2022\u2023]\s+", re.MULTILINE)
+_FOOTER_LINE_RE = re.compile(r"^\s*(?:Page\s+\d+\s+of\s+\d+|\d+)\s*$", re.MULTILINE)
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
 
 
 def normalize_jd_text(text: str) -> str:
-    """Normalize JD text: artifacts, bullets, repeated headers/footers."""
+    """
+    Normalize JD text: artifacts, bullets, repeated headers/footers.
+
+    Output is identical to the original one-replace-per-rule version (see
+    tests/test_jd_normalize.py), in fewer passes: NBSP folds into the space/tab
+    collapse, the three mojibake spellings are one alternation (skipped when their
+    lead chars are absent), "Page X of Y" and lone page numbers are one pattern,
+    and blank-line runs are collapsed once at the end (the bullet and footer
+    patterns absorb whole whitespace runs, so collapsing earlier changes nothing).
+    """
     if not text:
         return ""
-    t = text.replace("\u00a0", " ")
-    t = t.replace("Â", "")
-    # Fix UTF-8 bullet mojibake (• decoded wrong): â¢, â€¢, ΓÇó -> •
-    t = t.replace("\u00e2\u20ac\u00a2", "\u2022")  # â€¢
-    t = t.replace("\u00e2\u00a2", "\u2022")  # â¢
-    t = t.replace("\u0393\u00c7\u00f3", "\u2022")  # ΓÇó (U+0393 U+00C7 U+00F3)
-    t = re.sub(r"â¢|â€¢|ΓÇó", "\u2022", t)
-    t = re.sub(r"[ \t]+", " ", t)
-    t = re.sub(r"\n{3,}", "\n\n", t)
-    # Normalize bullets
-    t = re.sub(r"^\s*[•\-*]\s+", "• ", t, flags=re.MULTILINE)
-    t = re.sub(r"^\s*[\u2022\u2023]\s+", "• ", t, flags=re.MULTILINE)
-    # Collapse repeated "Page X of Y" / "Confidential" footer lines
-    t = re.sub(r"(?m)^\s*Page\s+\d+\s+of\s+\d+\s*$", "", t)
-    t = re.sub(r"(?m)^\s*\d+\s*$", "", t)  # lone page numbers
-    t = re.sub(r"\n{3,}", "\n\n", t)
-    return t.strip()
+    return _normalize_passes(text).strip()
+
+
+def _normalize_passes(text: str) -> str:
+    """Every normalize_jd_text pass except the final strip."""
+    t = text.replace("Â", "")
+    # Fix UTF-8 bullet mojibake (• decoded wrong) -> •
+    if "\u00e2" in t or "\u0393" in t:
+        t = _MOJIBAKE_BULLET_RE.sub("\u2022", t)
+    t = _HSPACE_RE.sub(" ", t)
+    # Normalize bullets; the second pass only ever changes lines once a ‣ is present
+    t = _BULLET_RE.sub("• ", t)
+    if "\u2023" in t:
+        t = _TRIANGLE_BULLET_RE.sub("• ", t)
+    # Collapse repeated "Page X of Y" / lone page number footer lines
+    t = _FOOTER_LINE_RE.sub("", t)
+    return _BLANK_RUN_RE.sub("\n\n", t)
+
+
+# A line that a pass can empty or read on past: a lone bullet, or any run of
+# "Page", "of" and numbers (a footer, or part of one whose \s+ spans lines)
+_UNSAFE_LINE = r"[^\S\n]*(?:[\u2022\u2023*\-]|(?:(?:Page|of|\d+)[^\S\n]*)+)[^\S\n]*\n"
+# A line break no normalize pass can act across: neither adjacent line is unsafe
+# or holds an Â (removing it can empty a line or complete a footer), the line
+# before ends in a char no pass rewrites (not whitespace, a bullet or a mojibake
+# tail) and the line after starts with non-whitespace
+_SAFE_BREAK_RE = re.compile(
+    rf"^(?!{_UNSAFE_LINE})[^\n\u00c2]*[^\s\u2022\u2023*\-\u00a2\u00f3\u00c2]\n"
+    rf"(?=(?!{_UNSAFE_LINE})[^\s\u00c2][^\n\u00c2]*\n)",
+    re.MULTILINE,
+)
+
+
+# _NormalizeStream buffer cap (chars): past it without a safe break, force a cut
+MAX_NORMALIZE_BUFFER = 1 << 18
+
+
+class _NormalizeStream:
+    """
+    normalize_jd_text over text arriving in pieces. Buffered text is cut at the
+    last safe line break and normalised up to it; "\\n".join of every segment
+    returned by feed() and finish() equals normalize_jd_text of the whole text.
+
+    Fallback: a buffer that reaches MAX_NORMALIZE_BUFFER with no safe break
+    (thousands of bullet-only or page-number lines, or one huge line) is cut at
+    its last line break anyway, or at its end if it has none. Passes then
+    can't act across that cut: a footer or blank-line run split by it may
+    normalise differently than in the whole text, and a cut with no line break
+    adds one.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._scan_from = 0  # breaks before this were already ruled out
+        self._started = False
+
+    def _emit(self, raw: str, last: bool) -> str:
+        seg = _normalize_passes(raw)
+        if not self._started:
+            seg = seg.lstrip()
+            self._started = True
+        return seg.rstrip() if last else seg
+
+    def feed(self, piece: str) -> list[str]:
+        old_len = len(self._buf)
+        self._buf += piece
+        cut = None
+        for m in _SAFE_BREAK_RE.finditer(self._buf, self._scan_from):
+            cut = m
+        if cut is not None:
+            end = cut.end()
+        elif len(self._buf) >= MAX_NORMALIZE_BUFFER:
+            end = self._buf.rfind("\n") + 1 or len(self._buf) + 1
+        else:
+            # A break found later needs its second line to end in new text: rescan
+            # from the start of the last two lines seen so far
+            prev = self._buf.rfind("\n", 0, max(old_len - 1, 0))
+            self._scan_from = self._buf.rfind("\n", 0, max(prev, 0)) + 1
+            return []
+        raw, self._buf = self._buf[: end - 1], self._buf[end:]
+        self._scan_from = 0
+        return [self._emit(raw, last=False)]
+
+    def finish(self) -> list[str]:
+        raw, self._buf = self._buf, ""
+        started = self._started
+        seg = self._emit(raw, last=True)
+        return [seg] if seg or started else []
+
+
+class JDSectionStream:
+    """
+    normalize_jd_text + sectionize_jd_text over text that arrives in pieces (e.g.
+    pages, with their "\\n\\n" joiners fed in between). feed() and finish() return
+    sections as they close; together they equal sectionize_jd_text(normalize_jd_text(text))
+    of the concatenated pieces. Memory is the open section plus the unsplit tail of
+    the input, not the document. on_text, if given, gets each normalised segment
+    as it is produced; "\\n".join of them is the normalised text.
+    """
+
+    def __init__(self, on_text: Callable[[str], None] | None = None) -> None:
+        self._normalizer = _NormalizeStream()
+        self._state = _new_section_state()
+        self._on_text = on_text
+
+    def _sectionize(self, segments: list[str]) -> list[tuple[str, str]]:
+        sections: list[tuple[str, str]] = []
+        for seg in segments:
+            if self._on_text is not None:
+                self._on_text(seg)
+            _sectionize_into(seg.split("\n"), self._state, sections)
+        return sections
+
+    def feed(self, piece: str) -> list[tuple[str, str]]:
+        return self._sectionize(self._normalizer.feed(piece))
+
+    def finish(self) -> list[tuple[str, str]]:
+        sections = self._sectionize(self._normalizer.finish())
+        _close_section(self._state, sections)
+        return sections
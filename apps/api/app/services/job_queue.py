@@ -0,0 +1,212 @@
+"""Durable ingestion job queue on Postgres. Producers enqueue; app.worker claims with SKIP LOCKED."""
+
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Document, IngestionJob
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimedJob:
+    id: uuid.UUID
+    document_id: uuid.UUID
+    attempts: int
+    max_attempts: int
+
+
+def backoff_seconds(attempts: int, base: float | None = None, cap: float | None = None) -> float:
+    """Exponential retry delay after `attempts` failed tries: base, 2*base, 4*base, ... capped."""
+    base = settings.job_retry_base_s if base is None else base
+    cap = settings.job_retry_max_s if cap is None else cap
+    return min(cap, base * 2 ** max(0, attempts - 1))
+
+
+def _lease_interval(seconds: float):
+    return text("now() + make_interval(secs => :lease_s)").bindparams(lease_s=seconds)
+
+
+def _lease_expired():
+    return (IngestionJob.status == "running") & (IngestionJob.lease_expires_at < func.now())
+
+
+def claim_statement(worker_id: str, lease_s: float):
+    """
+    Pick the oldest runnable job (queued and due, or running with an expired lease
+    and attempts left), lock it with FOR UPDATE SKIP LOCKED so concurrent workers
+    never block on each other, and mark it running under this worker's lease.
+    """
+    runnable = ((IngestionJob.status == "queued") & (IngestionJob.run_after <= func.now())) | (
+        _lease_expired() & (IngestionJob.attempts < IngestionJob.max_attempts)
+    )
+    next_id = (
+        select(IngestionJob.id)
+        .where(runnable)
+        .order_by(IngestionJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(IngestionJob)
+        .where(IngestionJob.id == next_id)
+        .values(
+            status="running",
+            attempts=IngestionJob.attempts + 1,
+            locked_by=worker_id,
+            lease_expires_at=_lease_interval(lease_s),
+            updated_at=func.now(),
+        )
+        .returning(
+            IngestionJob.id,
+            IngestionJob.document_id,
+            IngestionJob.attempts,
+            IngestionJob.max_attempts,
+        )
+    )
+
+
+def expire_exhausted_statement():
+    """
+    Fail running jobs whose lease expired on their last attempt. Their worker died
+    mid-job (OOM, RLIMIT, host loss), so fail_job never ran; without this they
+    would sit in running forever. Returns the affected document ids.
+    """
+    return (
+        update(IngestionJob)
+        .where(_lease_expired(), IngestionJob.attempts >= IngestionJob.max_attempts)
+        .values(
+            status="failed",
+            locked_by=None,
+            lease_expires_at=None,
+            last_error="Worker lost on final attempt (lease expired)",
+            updated_at=func.now(),
+        )
+        .returning(IngestionJob.document_id)
+    )
+
+
+async def enqueue_ingestion(db: AsyncSession, document_id: uuid.UUID) -> uuid.UUID:
+    """Add an ingestion job in the caller's transaction. Returns the job id."""
+    job = IngestionJob(document_id=document_id, max_attempts=settings.job_max_attempts)
+    db.add(job)
+    await db.flush()
+    return job.id
+
+
+async def enqueue_ingestions(db: AsyncSession, document_ids: list[uuid.UUID]) -> int:
+    """Add one ingestion job per document in the caller's transaction (one multi-row INSERT)."""
+    if not document_ids:
+        return 0
+    db.add_all(
+        IngestionJob(document_id=doc_id, max_attempts=settings.job_max_attempts)
+        for doc_id in document_ids
+    )
+    await db.flush()
+    return len(document_ids)
+
+
+async def claim_next_job(db: AsyncSession, worker_id: str) -> ClaimedJob | None:
+    """Fail exhausted expired jobs (and their documents), then claim the next runnable one."""
+    expired = (await db.execute(expire_exhausted_statement())).scalars().all()
+    if expired:
+        logger.warning("failed %s job(s) whose worker was lost on the final attempt", len(expired))
+        await db.execute(
+            update(Document)
+            .where(Document.id.in_(expired), Document.status == "processing")
+            .values(status="failed", error_message="Ingestion worker was lost on every attempt")
+        )
+    result = await db.execute(claim_statement(worker_id, settings.job_lease_s))
+    row = result.first()
+    await db.commit()
+    if row is None:
+        return None
+    return ClaimedJob(
+        id=row.id,
+        document_id=row.document_id,
+        attempts=row.attempts,
+        max_attempts=row.max_attempts,
+    )
+
+
+async def heartbeat(db: AsyncSession, job_id: uuid.UUID, worker_id: str) -> bool:
+    """Extend the lease. False if this worker no longer owns the job."""
+    result = await db.execute(
+        update(IngestionJob)
+        .where(
+            IngestionJob.id == job_id,
+            IngestionJob.locked_by == worker_id,
+            IngestionJob.status == "running",
+        )
+        .values(lease_expires_at=_lease_interval(settings.job_lease_s), updated_at=func.now())
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def complete_job(db: AsyncSession, job_id: uuid.UUID, worker_id: str) -> None:
+    await db.execute(
+        update(IngestionJob)
+        .where(IngestionJob.id == job_id, IngestionJob.locked_by == worker_id)
+        .values(status="succeeded", locked_by=None, lease_expires_at=None, updated_at=func.now())
+    )
+    await db.commit()
+
+
+async def fail_job(
+    db: AsyncSession,
+    job: ClaimedJob,
+    worker_id: str,
+    error: str,
+) -> bool:
+    """Record a failed attempt. Requeues with backoff if attempts remain. Returns True if requeued."""
+    retry = job.attempts < job.max_attempts
+    values: dict = {
+        "locked_by": None,
+        "lease_expires_at": None,
+        "last_error": error[:2000],
+        "updated_at": func.now(),
+    }
+    if retry:
+        delay = backoff_seconds(job.attempts)
+        values["status"] = "queued"
+        values["run_after"] = text("now() + make_interval(secs => :delay_s)").bindparams(delay_s=delay)
+        logger.info(
+            "job %s attempt %s/%s failed; retrying in %.0fs",
+            job.id,
+            job.attempts,
+            job.max_attempts,
+            delay,
+        )
+    else:
+        values["status"] = "failed"
+        logger.warning("job %s failed permanently after %s attempts", job.id, job.attempts)
+    await db.execute(
+        update(IngestionJob)
+        .where(IngestionJob.id == job.id, IngestionJob.locked_by == worker_id)
+        .values(**values)
+    )
+    await db.commit()
+    return retry
+
+
+async def release_job(db: AsyncSession, job: ClaimedJob, worker_id: str) -> None:
+    """Hand an unfinished job back (shutdown); the attempt is not counted."""
+    await db.execute(
+        update(IngestionJob)
+        .where(IngestionJob.id == job.id, IngestionJob.locked_by == worker_id)
+        .values(
+            status="queued",
+            attempts=IngestionJob.attempts - 1,
+            locked_by=None,
+            lease_expires_at=None,
+            updated_at=func.now(),
+        )
+    )
+    await db.commit()
@@ -0,0 +1,199 @@
+"""
+Near-duplicate chunks across the corpus: MinHash signatures + LSH banding.
+
+Every inserted chunk stores a 64-value MinHash signature of its word 3-shingles
+(document_chunks.minhash, 256 bytes) and 16 band keys derived from it
+(minhash_bands, GIN-indexed). Chunks sharing any band key are LSH neighbours;
+neighbours whose estimated Jaccard similarity reaches NEAR_DUP_THRESHOLD are
+near-duplicates. With 16 bands of 4 rows, pairs at J=0.85 become neighbours
+over 99.9% of the time and pairs at J=0.3 ~12% of the time (then dropped by the
+similarity check).
+
+At ingest, a new chunk with a near-duplicate in another document reuses that
+chunk's embedding instead of being embedded. One with near-duplicates in
+NEAR_DUP_BOILERPLATE_DOCS or more other sources (EEO statements, benefits
+blurbs that only differ by company name or date) is marked is_boilerplate and
+is_low_signal, which keeps it out of default retrieval.
+
+Lookups only see the uploading user's own documents: another user's uploads
+never demote (or lend embeddings to) their chunks. A source is a distinct file
+(content_sha256), so clones and re-uploads of one PDF count once, and copies of
+the document being ingested not at all.
+"""
+
+import hashlib
+import re
+import uuid
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.models.document_chunk import EMBEDDING_DIM
+from app.services.chunk_batch import ChunkBatch
+from app.services.doc_dedupe import current_pipeline_version
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_PRIME = np.uint64(4294967291)  # largest prime < 2**32: a*x + b stays below 2**64
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> set[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """NUM_PERM uint32 minimums of (a*h + b) mod p over the text's shingle hashes."""
+    shingles = _shingles(text)
+    if not shingles:
+        return _EMPTY.copy()
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_bands(signature: np.ndarray) -> list[int]:
+    """One signed 64-bit key per band (band number is part of the key)."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def signature_columns(text: str) -> dict:
+    """document_chunks column values (minhash, minhash_bands) for a chunk's content."""
+    sig = minhash_signature(text)
+    return {"minhash": sig.tobytes(), "minhash_bands": lsh_bands(sig)}
+
+
+def estimate_similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two stored signatures."""
+    return float(np.mean(np.frombuffer(a, dtype=np.uint32) == np.frombuffer(b, dtype=np.uint32)))
+
+
+@dataclass
+class NearDupMatch:
+    other_sources: int  # distinct other files (content_sha256) holding a near-duplicate
+    # Most similar near-duplicate from a document on the current pipeline version
+    # (same embedding model), whose embedding can be reused; None if there is none
+    chunk_id: uuid.UUID | None = None
+    similarity: float = 0.0
+    embedding: np.ndarray | None = None  # float32
+
+
+def is_boilerplate(match: NearDupMatch | None) -> bool:
+    """Near-duplicates in NEAR_DUP_BOILERPLATE_DOCS or more other sources."""
+    return match is not None and match.other_sources >= settings.near_dup_boilerplate_docs
+
+
+# One round trip per batch. Row pos's band keys are bands[(pos-1)*BANDS+1 : pos*BANDS]; its
+# LSH neighbours come from the GIN index and their estimated similarity is the share
+# of equal 4-byte minimums, as in estimate_similarity. Neighbours at or above the
+# threshold are grouped per row: distinct sources, plus the most similar reusable
+# chunk (ties broken by id) with its embedding.
+_LOOKUP_SQL = text(
+    f"""
+    WITH rows AS (
+        SELECT q.pos, q.minhash,
+               (CAST(:bands AS bigint[]))[(q.pos - 1) * {BANDS} + 1 : q.pos * {BANDS}] AS bands
+        FROM unnest(CAST(:minhashes AS bytea[])) WITH ORDINALITY AS q(minhash, pos)
+    ),
+    near AS (
+        SELECT r.pos, c.id, d.pipeline_version, s.similarity,
+               COALESCE(d.content_sha256, d.id::text) AS source
+        FROM rows r
+        JOIN document_chunks c ON c.minhash_bands && r.bands
+        JOIN documents d ON d.id = c.document_id
+        CROSS JOIN LATERAL (
+            SELECT count(*) / {NUM_PERM}.0 AS similarity
+            FROM generate_series(1, {NUM_PERM * 4}, 4) AS o
+            WHERE substring(c.minhash FROM o FOR 4) = substring(r.minhash FROM o FOR 4)
+        ) s
+        WHERE d.user_id = :user_id
+          AND d.id != :document_id
+          AND d.content_sha256 IS DISTINCT FROM CAST(:content_sha256 AS varchar)
+          AND s.similarity >= :threshold
+    ),
+    grouped AS (
+        SELECT pos,
+               count(DISTINCT source) AS sources,
+               (array_agg(id ORDER BY similarity DESC, id)
+                    FILTER (WHERE pipeline_version = :version))[1] AS chunk_id,
+               max(similarity) FILTER (WHERE pipeline_version = :version) AS similarity
+        FROM near
+        GROUP BY pos
+    )
+    SELECT g.pos, g.sources, g.chunk_id, g.similarity, c.embedding
+    FROM grouped g
+    LEFT JOIN document_chunks c ON c.id = g.chunk_id
+    ORDER BY g.pos
+    """
+).columns(embedding=Vector(EMBEDDING_DIM))
+
+
+async def find_near_duplicates(
+    db,
+    document_id: uuid.UUID,
+    batch: ChunkBatch,
+    *,
+    user_id: uuid.UUID,
+    content_sha256: str | None,
+    threshold: float | None = None,
+) -> list[NearDupMatch | None]:
+    """
+    For each row of batch (with its minhash columns set), its near-duplicates in
+    user_id's other documents with different content, or None. Matches with a
+    chunk_id carry that chunk's embedding.
+    """
+    threshold = settings.near_dup_threshold if threshold is None else threshold
+    matches: list[NearDupMatch | None] = [None] * len(batch)
+    if not batch:
+        return matches
+    result = await db.execute(
+        _LOOKUP_SQL,
+        {
+            "minhashes": batch.columns["minhash"],
+            "bands": [key for bands in batch.columns["minhash_bands"] for key in bands],
+            "user_id": user_id,
+            "document_id": document_id,
+            "content_sha256": content_sha256,
+            "version": current_pipeline_version(),
+            "threshold": threshold,
+        },
+    )
+    for row in result:
+        match = NearDupMatch(row.sources)
+        if row.chunk_id is not None:
+            match.chunk_id, match.similarity = row.chunk_id, float(row.similarity)
+            match.embedding = np.asarray(row.embedding, dtype=np.float32)
+        matches[row.pos - 1] = match
+    return matches
+
+
+async def lookup_near_duplicates(
+    document_id: uuid.UUID,
+    batch: ChunkBatch,
+    *,
+    user_id: uuid.UUID,
+    content_sha256: str | None,
+) -> list[NearDupMatch | None]:
+    """find_near_duplicates in a session of its own (safe next to the ingest transaction)."""
+    async with async_session_maker() as db:
+        return await find_near_duplicates(db, document_id, batch, user_id=user_id, content_sha256=content_sha256)
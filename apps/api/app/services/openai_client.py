@@ -0,0 +1,47 @@
+"""Application-wide AsyncOpenAI client over one pooled, keep-alive HTTP connection pool."""
+
+import logging
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Return the shared client. The API creates it at startup; workers and the CLI
+    create it on first use. Embeddings, query embeddings and chat all go through it,
+    so concurrent requests reuse warm TLS connections instead of opening new ones.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout_s,
+            max_retries=settings.openai_max_retries,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.openai_max_connections,
+                    max_keepalive_connections=settings.openai_max_keepalive,
+                    keepalive_expiry=settings.openai_keepalive_s,
+                ),
+            ),
+        )
+        logger.info(
+            "openai client created: max_connections=%s max_keepalive=%s",
+            settings.openai_max_connections,
+            settings.openai_max_keepalive,
+        )
+    return _client
+
+
+async def close_openai_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,411 @@
+"""
+PDF text extraction in a pool of pre-warmed worker processes.
+
+Keeps PyMuPDF off the API event loop. Each worker imports fitz once at start-up
+and runs jobs under a memory cap (RLIMIT_AS) and a per-job CPU budget
+(RLIMIT_CPU); the parent enforces a wall-clock limit. A worker that crashes,
+hangs or trips a limit is killed and replaced. If a replacement fails to start,
+its slot stays empty and the next job on it tries again (raising
+PDFExtractionError if it still fails), so the pool never shrinks.
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import signal
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Timings kept for stats()
+_RECENT_JOBS = 50
+_READY_TIMEOUT_S = 30.0
+# Start attempts when replacing a worker, with a linear backoff between them
+_SPAWN_ATTEMPTS = 3
+_SPAWN_BACKOFF_S = 0.5
+
+
+class PDFExtractionError(RuntimeError):
+    """Extraction job failed, timed out or killed its worker."""
+
+
+def _open_pdf(source: str | bytes):
+    """Open a PDF from a local path (memory-mapped by MuPDF, nothing copied) or from bytes."""
+    import fitz  # PyMuPDF
+
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def extract_text_per_page(
+    source: str | bytes, max_pages: int, first_page: int = 0
+) -> list[tuple[int, str]]:
+    """
+    Extract text per page using PyMuPDF. Returns [(page_number, text), ...]
+    for 0-based pages first_page .. max_pages-1 (page_number is 1-based).
+    """
+    doc = _open_pdf(source)
+    try:
+        result = []
+        limit = min(len(doc), max_pages)
+        for i in range(first_page, limit):
+            result.append((i + 1, doc[i].get_text()))
+        return result
+    finally:
+        doc.close()
+
+
+def count_pages(source: str | bytes) -> int:
+    doc = _open_pdf(source)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def split_page_ranges(num_pages: int, workers: int, min_pages: int) -> list[tuple[int, int]]:
+    """Contiguous [start, stop) ranges over num_pages: at most `workers`, each >= min_pages (but one)."""
+    parts = max(1, min(workers, num_pages // max(1, min_pages)))
+    base, extra = divmod(num_pages, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        stop = start + base + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+# Job kinds a worker accepts: (kind, args)
+_JOBS = {"extract": extract_text_per_page, "count": count_pages}
+
+
+def _apply_memory_limit(memory_mb: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Windows: wall-clock limit only
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow `seconds` more CPU time from now; the kernel sends SIGXCPU past it."""
+    try:
+        import resource
+    except ImportError:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_mb: int, cpu_seconds: int) -> None:
+    """Worker process loop: receive (kind, args) from _JOBS, send ("ok"|"error", payload)."""
+    import fitz  # noqa: F401  (pre-warm)
+
+    _apply_memory_limit(memory_mb)
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        _set_cpu_budget(cpu_seconds)
+        try:
+            kind, args = job
+            conn.send(("ok", _JOBS[kind](*args)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe. Methods block; call via to_thread."""
+
+    def __init__(self, ctx, memory_mb: int, cpu_seconds: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_mb, cpu_seconds),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(_READY_TIMEOUT_S):
+            self.kill()
+            raise PDFExtractionError("PDF worker failed to start")
+        self.conn.recv()
+
+    def run(self, job: tuple, timeout_s: float) -> tuple[str, object]:
+        self.conn.send(job)
+        if not self.conn.poll(timeout_s):
+            raise TimeoutError
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+class ExtractionPool:
+    """Fixed-size pool of extraction workers, driven from asyncio."""
+
+    def __init__(
+        self,
+        size: int | None = None,
+        timeout_s: float | None = None,
+        cpu_seconds: int | None = None,
+        memory_mb: int | None = None,
+    ):
+        self.size = max(1, size or settings.pdf_workers)
+        self.timeout_s = timeout_s or settings.pdf_job_timeout_s
+        self.cpu_seconds = cpu_seconds or settings.pdf_job_cpu_s
+        self.memory_mb = memory_mb or settings.pdf_worker_memory_mb
+        self._ctx = mp.get_context("spawn")
+        # Idle slots: a worker, or None for a slot whose worker failed to start
+        self._idle: asyncio.Queue[_Worker | None] | None = None
+        self._workers: set[_Worker] = set()
+        self._start_lock = asyncio.Lock()
+        self._closing = False
+        self._waiting = 0
+        self._running = 0
+        self._counters = {"completed": 0, "failed": 0, "timeouts": 0, "restarts": 0}
+        self._recent: deque[dict] = deque(maxlen=_RECENT_JOBS)
+        self._recycling: set[asyncio.Task] = set()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.memory_mb, self.cpu_seconds)
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._spawn) for _ in range(self.size)),
+                return_exceptions=True,
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if len(errors) == len(results):
+                raise errors[0]
+            self._idle = asyncio.Queue()
+            self._closing = False
+            for r in results:
+                if isinstance(r, _Worker):
+                    self._workers.add(r)
+                    self._idle.put_nowait(r)
+                else:
+                    logger.warning("pdf worker failed to start: %s", r)
+                    self._idle.put_nowait(None)
+            logger.info("pdf pool started: workers=%s failed=%s", self.size, len(errors))
+
+    async def _spawn_with_retry(self) -> _Worker:
+        for attempt in range(1, _SPAWN_ATTEMPTS + 1):
+            try:
+                worker = await asyncio.to_thread(self._spawn)
+            except Exception:
+                if attempt == _SPAWN_ATTEMPTS:
+                    raise
+                logger.warning("pdf worker failed to start (attempt %s), retrying", attempt)
+                await asyncio.sleep(_SPAWN_BACKOFF_S * attempt)
+            else:
+                self._workers.add(worker)
+                return worker
+
+    async def _replace(self, worker: _Worker) -> None:
+        """Kill `worker` and put a fresh one in its slot (or None if none will start)."""
+        self._workers.discard(worker)
+        await asyncio.to_thread(worker.kill)
+        self._counters["restarts"] += 1
+        try:
+            fresh = await self._spawn_with_retry()
+        except Exception:
+            logger.exception("pdf worker could not be replaced; slot left empty")
+            fresh = None
+        self._idle.put_nowait(fresh)
+
+    async def _recycle(self, worker: _Worker, job: asyncio.Future) -> None:
+        """
+        Replace a worker whose job was abandoned. Kills its process first so the
+        thread still polling its pipe returns, and replaces it only after that.
+        """
+        await asyncio.to_thread(worker.process.kill)
+        await asyncio.gather(job, return_exceptions=True)
+        await self._replace(worker)
+
+    async def _checkout(self) -> _Worker:
+        """Take an idle worker, starting one first if its slot is empty."""
+        worker = await self._idle.get()
+        if worker is not None:
+            return worker
+        try:
+            return await self._spawn_with_retry()
+        except Exception as e:
+            self._idle.put_nowait(None)
+            raise PDFExtractionError("PDF worker failed to start") from e
+
+    async def extract(self, source: str | bytes, max_pages: int) -> list[tuple[int, str]]:
+        """
+        Extract [(page_number, text), ...] in worker processes.
+        With a local file path, long documents are split into page ranges that
+        run on separate workers (each opening the same file) and merged in order.
+        Bytes go to a single worker.
+        """
+        return [page async for part in self.iter_extract(source, max_pages) for page in part]
+
+    async def iter_extract(
+        self, source: str | bytes, max_pages: int
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        """
+        Like extract(), but yields each page range's pages, in page order, as soon
+        as that range (and every range before it) is done.
+        """
+        await self.start()
+        if isinstance(source, bytes) or self.size == 1:
+            yield await self._run(("extract", (source, max_pages)))
+            return
+
+        num_pages = min(await self._run(("count", (source,))), max_pages)
+        ranges = split_page_ranges(num_pages, self.size, settings.pdf_min_pages_per_job)
+        if len(ranges) == 1:
+            yield await self._run(("extract", (source, num_pages)))
+            return
+        tasks = [
+            asyncio.ensure_future(self._run(("extract", (source, stop, start))))
+            for start, stop in ranges
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: tuple):
+        """Run one (kind, args) job on the next idle worker."""
+        if self._closing:
+            raise PDFExtractionError("PDF pool is closing")
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            worker = await self._checkout()
+        finally:
+            self._waiting -= 1
+        started = time.perf_counter()
+        self._running += 1
+        running = asyncio.ensure_future(asyncio.to_thread(worker.run, job, self.timeout_s))
+        try:
+            status, payload = await asyncio.shield(running)
+        except TimeoutError:
+            self._finish(queued, started, "timeout")
+            self._counters["timeouts"] += 1
+            await self._replace(worker)
+            raise PDFExtractionError(f"PDF extraction timed out after {self.timeout_s}s")
+        except (EOFError, OSError):
+            self._finish(queued, started, "crashed")
+            await self._replace(worker)
+            exitcode = worker.process.exitcode
+            if exitcode == -getattr(signal, "SIGXCPU", 0):
+                raise PDFExtractionError("PDF extraction exceeded CPU time limit")
+            raise PDFExtractionError(f"PDF extraction worker crashed (exitcode={exitcode})")
+        except asyncio.CancelledError:
+            # Caller went away mid-job; the worker's state is unknown, so recycle it
+            self._finish(queued, started, "cancelled")
+            task = asyncio.ensure_future(self._recycle(worker, running))
+            self._recycling.add(task)
+            task.add_done_callback(self._recycling.discard)
+            raise
+
+        self._idle.put_nowait(worker)
+        self._finish(queued, started, status)
+        if status != "ok":
+            raise PDFExtractionError(str(payload))
+        return payload
+
+    def _finish(self, queued: float, started: float, outcome: str) -> None:
+        self._running -= 1
+        self._counters["completed" if outcome == "ok" else "failed"] += 1
+        now = time.perf_counter()
+        job = {
+            "wait_ms": round((started - queued) * 1000, 1),
+            "run_ms": round((now - started) * 1000, 1),
+            "outcome": outcome,
+        }
+        self._recent.append(job)
+        logger.info(
+            "pdf job %s: wait_ms=%s run_ms=%s queue_depth=%s",
+            outcome,
+            job["wait_ms"],
+            job["run_ms"],
+            self._waiting,
+        )
+
+    def stats(self) -> dict:
+        """Queue depth, worker counts and recent per-job timings."""
+        return {
+            "workers": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "running": self._running,
+            "queue_depth": self._waiting,
+            **self._counters,
+            "recent_jobs": list(self._recent),
+        }
+
+    async def close(self) -> None:
+        """
+        Stop taking jobs, let queued and running ones finish (each is bounded by
+        timeout_s), then stop the workers. Waits for every slot to come back, so
+        no job hands a worker to a pool that is gone.
+        """
+        if self._idle is None or self._closing:
+            return
+        self._closing = True
+        idle = self._idle
+        slots = [await idle.get() for _ in range(self.size)]
+        self._workers.clear()
+        self._idle = None
+        await asyncio.gather(*(asyncio.to_thread(w.stop) for w in slots if w is not None))
+
+
+_pool: ExtractionPool | None = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide extraction pool (workers start on first use)."""
+    global _pool
+    if _pool is None:
+        _pool = ExtractionPool()
+    return _pool
+
+
+def extraction_pool_stats() -> dict | None:
+    """stats() of the process-wide pool, or None if it was never created."""
+    return _pool.stats() if _pool is not None else None
+
+
+async def shutdown_extraction_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -0,0 +1,99 @@
+"""
+Dictionary phrase matcher: Aho-Corasick over word tokens.
+
+Phrases ("python", "machine learning", "google cloud platform") are tokenized
+like the text and compiled once into a token trie with failure links, so one
+left-to-right pass over the text's tokens reports every occurrence of every
+phrase, overlapping ones included. Matching works on whole tokens, so "aws"
+never fires inside "laws". Cost is linear in the text and independent of how
+many phrases are loaded.
+
+Words of a phrase may be separated by spaces, tabs, hyphens or slashes in the
+text; any other separator (newline, comma, bullet, ...) ends the phrase.
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Hashable
+
+# Same token shape the skill extractor always used: a letter, then letters, digits or .#+
+TOKEN_RE = re.compile(r"\b[A-Za-z][a-zA-Z0-9.#+]+\b")
+_PHRASE_JOINERS = " \t-/"
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased tokens of text (phrases are tokenized the same way)."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class PhraseMatcher:
+    """Finds (phrase, label) entries in text. A phrase may carry several labels."""
+
+    def __init__(self, entries: Iterable[tuple[str, Hashable]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._max_tokens = 1
+        # Per node: (phrase length in tokens, label) for every phrase ending here
+        self._out: list[list[tuple[int, Hashable]]] = [[]]
+        for phrase, label in entries:
+            tokens = tokenize(phrase)
+            if not tokens:
+                raise ValueError(f"Phrase {phrase!r} has no tokens")
+            self._max_tokens = max(self._max_tokens, len(tokens))
+            node = 0
+            for tok in tokens:
+                nxt = self._goto[node].get(tok)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][tok] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                node = nxt
+            if (len(tokens), label) not in self._out[node]:
+                self._out[node].append((len(tokens), label))
+        self._fail = self._build_failure_links()
+
+    def _build_failure_links(self) -> list[int]:
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())  # depth-1 nodes fail to the root
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                f = fail[node]
+                while f and tok not in self._goto[f]:
+                    f = fail[f]
+                fail[child] = self._goto[f].get(tok, 0)
+                # A node also reports everything its longest proper suffix reports
+                self._out[child] = self._out[child] + self._out[fail[child]]
+                queue.append(child)
+        return fail
+
+    def __len__(self) -> int:
+        """Number of trie nodes (grows with the phrase dictionary, not the text)."""
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, Hashable]]:
+        """Yield (start, end, label) char spans (in text.lower()) in order of match end."""
+        goto, fail, out = self._goto, self._fail, self._out
+        lowered = text.lower()
+        # Char starts of the last few tokens since the last phrase break
+        starts: deque[int] = deque(maxlen=self._max_tokens)
+        node = 0
+        prev_end = 0
+        for m in TOKEN_RE.finditer(lowered):
+            tok = m.group()
+            if starts and lowered[prev_end : m.start()].strip(_PHRASE_JOINERS):
+                node = 0
+                starts.clear()
+            starts.append(m.start())
+            prev_end = m.end()
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for n_tokens, label in out[node]:
+                yield starts[-n_tokens], m.end(), label
+
+    def find(self, text: str) -> list[Hashable]:
+        """Distinct labels, by first occurrence (earlier start first, longer phrase first on ties)."""
+        hits = sorted(self.iter_matches(text), key=lambda h: (h[0], -h[1]))
+        return list(dict.fromkeys(label for _, _, label in hits))
@@ -1,13 +1,12 @@
 """Grounded Q&A: retrieval + LLM with citation markers."""
 
-from openai import OpenAI
-
 from app.core.config import settings
+from app.services.openai_client import get_openai_client
 from app.services.jd_sections import normalize_jd_text
 
 # Chunks are list of {chunk_id, page_number, snippet, ...}
 # Returns (answer, citations)
-def generate_grounded_answer(
+async def generate_grounded_answer(
     question: str,
     chunks: list[dict],
     max_tokens: int | None = None,
@@ -50,8 +49,7 @@ Question: {question}
 
 Answer (cite with [pN-cM] markers when using an excerpt):"""
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    response = client.chat.completions.create(
+    response = await get_openai_client().chat.completions.create(
         model=settings.openai_chat_model,
         messages=[
             {"role": "system", "content": system_prompt},
@@ -3,12 +3,13 @@
 import re
 import uuid
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models import DocumentChunk
-from app.services.ingestion import _create_embeddings
+from app.services.embeddings import get_embedding_engine, shorten_embeddings
 
 # Query keywords -> suggested section types for JD filtering
 QUERY_SECTION_HINTS: dict[str, list[str]] = {
@@ -38,17 +39,12 @@ def suggest_section_filters(query: str) -> list[str] | None:
     return list(suggested) if suggested else None
 
 
-def embed_query(query: str) -> list[float]:
+async def embed_query(query: str) -> list[float]:
     """Embed a single query string. Returns embedding vector."""
-    embeddings = _create_embeddings([query])
+    embeddings = await get_embedding_engine().embed([query])
     return embeddings[0]
 
 
-def _cosine_sim(a: list[float], b: list[float]) -> float:
-    """Cosine similarity (dot product for normalized vectors)."""
-    return sum(x * y for x, y in zip(a, b))
-
-
 def _mmr_select(
     candidates: list[dict],
     query_embedding: list[float],
@@ -58,39 +54,101 @@ def _mmr_select(
     """
     Maximal Marginal Relevance: select diverse top_k from candidates.
     candidates have: id, page_number, content, embedding, score (sim to query).
+
+    Candidate embeddings go into one float32 matrix and a single product gives
+    every pairwise cosine similarity (embeddings are normalized). Each round picks
+    the first candidate with the highest lambda*score - (1-lambda)*max_sim, where
+    max_sim (floored at 0) is updated from the chosen candidate's row only.
     """
     if len(candidates) <= top_k:
         for c in candidates[:top_k]:
             c.pop("embedding", None)
         return candidates[:top_k]
 
+    matrix = np.array([c["embedding"] for c in candidates], dtype=np.float32)
+    pairwise = matrix @ matrix.T
+    relevance = lambda_ * np.array([c["score"] for c in candidates], dtype=np.float64)
+    max_sim = np.zeros(len(candidates), dtype=np.float64)
+    taken = np.zeros(len(candidates), dtype=bool)
+
     selected: list[dict] = []
-    remaining = list(candidates)
-
-    while len(selected) < top_k and remaining:
-        best_idx = -1
-        best_mmr = float("-inf")
-        for i, c in enumerate(remaining):
-            sim_q = c["score"]
-            max_sim_sel = 0.0
-            if selected:
-                for s in selected:
-                    sim_d = _cosine_sim(c["embedding"], s["embedding"])
-                    max_sim_sel = max(max_sim_sel, sim_d)
-            mmr = lambda_ * sim_q - (1 - lambda_) * max_sim_sel
-            if mmr > best_mmr:
-                best_mmr = mmr
-                best_idx = i
-        if best_idx < 0:
-            break
-        chosen = remaining.pop(best_idx)
-        selected.append(chosen)
+    while len(selected) < top_k:
+        mmr = relevance - (1 - lambda_) * max_sim
+        mmr[taken] = -np.inf
+        best = int(np.argmax(mmr))
+        taken[best] = True
+        selected.append(candidates[best])
+        np.maximum(max_sim, pairwise[best], out=max_sim)
 
     for c in selected:
         c.pop("embedding", None)
     return selected
 
 
+QUANTIZATION_MODES = ("none", "short")
+# hnsw.ef_search caps how many rows one HNSW scan can return
+_MAX_EF_SEARCH = 1000
+
+
+def _quantized_distance(query_embedding: list[float], mode: str):
+    """Candidate-pass distance; must match the ANN index expression (see DocumentChunk)."""
+    if mode == "short":
+        return DocumentChunk.embedding_short.cosine_distance(shorten_embeddings([query_embedding])[0])
+    raise ValueError(f"Unknown RETRIEVAL_QUANTIZATION {mode!r}; expected one of {QUANTIZATION_MODES}")
+
+
+def build_retrieval_query(
+    document_id: uuid.UUID,
+    query_embedding: list[float],
+    limit: int,
+    include_low_signal: bool = False,
+    section_types: list[str] | None = None,
+    doc_domain: str | None = None,
+    quantization: str = "none",
+    candidates: int | None = None,
+):
+    """
+    Top `limit` chunks by full-precision cosine distance. With quantization, a first
+    pass picks `candidates` ids over the embedding_short index and only those
+    are reranked on the full vectors. "none" is an exact scan of the
+    document's chunks: the float32 column has no ANN index.
+    """
+    distance_col = DocumentChunk.embedding.cosine_distance(query_embedding)
+    score_col = (1 - distance_col).label("score")
+
+    filters = [
+        DocumentChunk.document_id == document_id,
+        DocumentChunk.embedding.isnot(None),
+    ]
+    if not include_low_signal:
+        filters.append(DocumentChunk.is_low_signal == False)
+    if section_types:
+        filters.append(DocumentChunk.section_type.in_(section_types))
+    if doc_domain:
+        filters.append(DocumentChunk.doc_domain == doc_domain)
+
+    stmt = select(
+        DocumentChunk.id,
+        DocumentChunk.page_number,
+        DocumentChunk.content,
+        DocumentChunk.embedding,
+        DocumentChunk.is_low_signal,
+        DocumentChunk.section_type,
+        score_col,
+    )
+    if quantization == "none":
+        stmt = stmt.where(*filters)
+    else:
+        candidate_ids = (
+            select(DocumentChunk.id)
+            .where(*filters)
+            .order_by(_quantized_distance(query_embedding, quantization))
+            .limit(candidates or limit)
+        )
+        stmt = stmt.where(DocumentChunk.id.in_(candidate_ids))
+    return stmt.order_by(distance_col.asc()).limit(limit)
+
+
 async def retrieve_chunks(
     db: AsyncSession,
     document_id: uuid.UUID,
@@ -103,34 +161,28 @@ async def retrieve_chunks(
     """
     Search document_chunks by cosine similarity.
     Fetches top top_n_candidates, filters low-signal, applies MMR for diversity.
+    With RETRIEVAL_QUANTIZATION=short the candidates come from a compact
+    index scan and are reranked on full-precision vectors.
     By default excludes is_low_signal chunks; pass include_low_signal=true for contact queries.
     Returns list of {chunk_id, page_number, snippet, score, is_low_signal}.
     """
-    distance_col = DocumentChunk.embedding.cosine_distance(query_embedding)
-    score_col = (1 - distance_col).label("score")
     limit = max(top_k, settings.top_n_candidates)
-
-    stmt = (
-        select(
-            DocumentChunk.id,
-            DocumentChunk.page_number,
-            DocumentChunk.content,
-            DocumentChunk.embedding,
-            DocumentChunk.is_low_signal,
-            DocumentChunk.section_type,
-            score_col,
-        )
-        .where(DocumentChunk.document_id == document_id)
-        .where(DocumentChunk.embedding.isnot(None))
-        .order_by(distance_col.asc())
-        .limit(limit)
+    quantization = settings.retrieval_quantization
+    n_candidates = limit * max(1, settings.retrieval_rerank_factor)
+    if quantization != "none":
+        # Let the candidate index scan return the whole candidate set (default is 40)
+        await db.execute(text(f"SET LOCAL hnsw.ef_search = {min(n_candidates, _MAX_EF_SEARCH)}"))
+
+    stmt = build_retrieval_query(
+        document_id,
+        query_embedding,
+        limit,
+        include_low_signal=include_low_signal,
+        section_types=section_types,
+        doc_domain=doc_domain,
+        quantization=quantization,
+        candidates=n_candidates,
     )
-    if not include_low_signal:
-        stmt = stmt.where(DocumentChunk.is_low_signal == False)
-    if section_types:
-        stmt = stmt.where(DocumentChunk.section_type.in_(section_types))
-    if doc_domain:
-        stmt = stmt.where(DocumentChunk.doc_domain == doc_domain)
 
     result = await db.execute(stmt)
     rows = result.all()
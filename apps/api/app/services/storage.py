@@ -1,6 +1,13 @@
 """Deployment-friendly file storage abstraction. S3 in production, local for dev only."""
 
+import os
+import re
+import tempfile
+import uuid
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 
 class StorageBackend(ABC):
@@ -24,6 +31,34 @@ class StorageBackend(ABC):
         """Download object content as bytes."""
         ...
 
+    @abstractmethod
+    def upload_file(self, key: str, path: str) -> None:
+        """Store a local file under key (bulk ingestion)."""
+        ...
+
+    @abstractmethod
+    def local_path(self, key: str) -> AbstractContextManager[str]:
+        """Context manager yielding a local file path for the object (valid inside the block)."""
+        ...
+
+
+def make_document_key(user_id: uuid.UUID, document_id: uuid.UUID, filename: str) -> str:
+    safe_name = re.sub(r"[^\w\.\-]", "_", filename)
+    return f"documents/{user_id}/{document_id}/{safe_name}"
+
+
+# Read size for streaming S3 bodies into the temp file
+_STREAM_BLOCK = 1024 * 1024
+
+
+def _write_at(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    if hasattr(os, "pwrite"):
+        os.pwrite(fd, data, offset)
+        return
+    with lock:  # Windows: no pwrite
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+
 
 class S3Storage(StorageBackend):
     def __init__(self, bucket: str, region: str, access_key: str, secret_key: str):
@@ -66,6 +101,52 @@ class S3Storage(StorageBackend):
         resp = self._client.get_object(Bucket=self._bucket, Key=key)
         return resp["Body"].read()
 
+    def upload_file(self, key: str, path: str) -> None:
+        # boto3's transfer manager switches to parallel multipart for large files
+        self._client.upload_file(path, self._bucket, key, ExtraArgs={"ContentType": "application/pdf"})
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        """Stream the object into a temp file (parallel ranged GETs when large); removed on exit."""
+        from app.core.config import settings
+
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        try:
+            size = self._client.head_object(Bucket=self._bucket, Key=key)["ContentLength"]
+            if size >= settings.s3_parallel_threshold_mb * 1024 * 1024:
+                self._ranged_download(key, fd, size)
+            else:
+                resp = self._client.get_object(Bucket=self._bucket, Key=key)
+                for block in resp["Body"].iter_chunks(_STREAM_BLOCK):
+                    os.write(fd, block)
+            os.close(fd)
+            fd = -1
+            yield path
+        finally:
+            if fd >= 0:
+                os.close(fd)
+            os.unlink(path)
+
+    def _ranged_download(self, key: str, fd: int, size: int) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from app.core.config import settings
+
+        part = settings.s3_part_size_mb * 1024 * 1024
+        os.ftruncate(fd, size)
+        write_lock = threading.Lock()
+
+        def _fetch(start: int) -> None:
+            end = min(start + part, size) - 1
+            resp = self._client.get_object(Bucket=self._bucket, Key=key, Range=f"bytes={start}-{end}")
+            offset = start
+            for block in resp["Body"].iter_chunks(_STREAM_BLOCK):
+                _write_at(fd, block, offset, write_lock)
+                offset += len(block)
+
+        with ThreadPoolExecutor(max_workers=settings.s3_download_concurrency) as pool:
+            list(pool.map(_fetch, range(0, size, part)))
+
 
 class LocalStorage(StorageBackend):
     """Dev only. Stores in local dir. Upload via API endpoint, not presigned URL."""
@@ -100,6 +181,17 @@ class LocalStorage(StorageBackend):
         path = Path(self._base) / key
         return path.read_bytes()
 
+    def upload_file(self, key: str, path: str) -> None:
+        import shutil
+        dest = self.get_path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(path, dest)
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        """The stored file itself; nothing is copied."""
+        yield self.get_path(key)
+
 
 def get_storage():
     """Return storage backend: S3 if configured, else local (dev only)."""
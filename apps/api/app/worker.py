@@ -0,0 +1,181 @@
+"""
+Ingestion worker. Claims jobs from ingestion_jobs and runs them.
+
+    python -m app.worker [--concurrency N]
+
+Run as many worker processes (on as many hosts) as needed; SKIP LOCKED keeps
+them from claiming the same job. SIGTERM/SIGINT stop new claims and drain
+in-flight jobs; anything still running after WORKER_DRAIN_TIMEOUT_S is handed
+back to the queue. With --concurrency > 1, the jobs in flight share one
+coalescing embedding engine (WORKER_COALESCE_MS), so chunks from different
+documents (e.g. an /ingest-batch backfill) go out in the same API batches.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.models import Document
+from app.services.embedding_cache import get_cache_stats
+from app.services.embeddings import CoalescingEmbeddingEngine, EmbeddingEngine
+from app.services.ingestion import run_ingestion
+from app.services.job_queue import (
+    ClaimedJob,
+    claim_next_job,
+    complete_job,
+    fail_job,
+    heartbeat,
+    release_job,
+)
+from app.services.openai_client import close_openai_client
+from app.services.pdf_pool import shutdown_extraction_pool
+
+logger = logging.getLogger("app.worker")
+
+
+async def _heartbeat_loop(job: ClaimedJob, worker_id: str, task: asyncio.Task) -> None:
+    """Renew the lease every lease/3; cancel the job if the lease was lost."""
+    while True:
+        await asyncio.sleep(settings.job_lease_s / 3)
+        async with async_session_maker() as db:
+            owned = await heartbeat(db, job.id, worker_id)
+        if not owned:
+            logger.warning("job %s: lease lost, abandoning", job.id)
+            task.cancel()
+            return
+
+
+async def _mark_processing(document_id: uuid.UUID) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(status="processing", error_message=None)
+        )
+        await db.commit()
+
+
+async def _process(job: ClaimedJob, worker_id: str, engine: EmbeddingEngine | None = None) -> None:
+    logger.info(
+        "job %s claimed: document_id=%s attempt=%s/%s",
+        job.id,
+        job.document_id,
+        job.attempts,
+        job.max_attempts,
+    )
+    if job.attempts > 1:
+        await _mark_processing(job.document_id)
+
+    task = asyncio.ensure_future(run_ingestion(job.document_id, raise_errors=True, engine=engine))
+    beat = asyncio.create_task(_heartbeat_loop(job, worker_id, task))
+    try:
+        await task
+    except asyncio.CancelledError:
+        if not asyncio.current_task().cancelling():
+            # Lease lost to another worker; it owns the job now
+            return
+        # Shutdown past the drain timeout: hand the job back
+        task.cancel()
+        async with async_session_maker() as db:
+            await release_job(db, job, worker_id)
+        raise
+    except Exception as e:
+        async with async_session_maker() as db:
+            requeued = await fail_job(db, job, worker_id, str(e))
+        if requeued:
+            await _mark_processing(job.document_id)
+        return
+    finally:
+        beat.cancel()
+
+    async with async_session_maker() as db:
+        await complete_job(db, job.id, worker_id)
+    logger.info("job %s done: document_id=%s", job.id, job.document_id)
+
+
+async def _worker_loop(worker_id: str, stop: asyncio.Event, engine: EmbeddingEngine | None = None) -> None:
+    while not stop.is_set():
+        try:
+            async with async_session_maker() as db:
+                job = await claim_next_job(db, worker_id)
+        except Exception:
+            logger.exception("%s: claim failed", worker_id)
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.job_poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await _process(job, worker_id, engine)
+
+
+def worker_engine(concurrency: int) -> EmbeddingEngine | None:
+    """
+    Embedding engine shared by a worker's jobs: coalescing when several run at once
+    and WORKER_COALESCE_MS > 0, else None (run_ingestion's default engine).
+    """
+    if concurrency > 1 and settings.worker_coalesce_ms > 0:
+        return CoalescingEmbeddingEngine(window_ms=settings.worker_coalesce_ms)
+    return None
+
+
+async def run_worker(concurrency: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    engine = worker_engine(concurrency)
+    tasks = [
+        asyncio.create_task(_worker_loop(f"{base_id}:{i}", stop, engine))
+        for i in range(concurrency)
+    ]
+    logger.info(
+        "worker started: id=%s concurrency=%s coalescing=%s",
+        base_id,
+        concurrency,
+        engine is not None,
+    )
+
+    await stop.wait()
+    logger.info("worker draining: timeout=%ss", settings.worker_drain_timeout_s)
+    _, pending = await asyncio.wait(tasks, timeout=settings.worker_drain_timeout_s)
+    for t in pending:
+        t.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    await shutdown_extraction_pool()
+    await close_openai_client()
+    logger.info("worker stopped: embedding_cache=%s", get_cache_stats())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run ingestion workers.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.worker_concurrency,
+        help="Jobs processed concurrently by this process",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(levelname)s:     %(name)s - %(message)s",
+    )
+    asyncio.run(run_worker(max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
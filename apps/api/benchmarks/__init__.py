@@ -0,0 +1 @@
+"""Benchmarks. Run from apps/api, e.g. `python -m benchmarks.embedding_batches`."""
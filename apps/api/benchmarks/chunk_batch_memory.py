@@ -0,0 +1,125 @@
+"""
+Ingestion hot-path memory: row dicts + float lists vs ChunkBatch + float32 matrix.
+
+Runs the path from embedding API response to COPY records for N new chunks
+(no database, no network):
+
+  lists:  JSON float arrays decoded to list[list[float]], one dict per row,
+          Matryoshka prefix as lists, encode_vector per row (the asyncpg codec)
+  matrix: base64 float32 decoded into one matrix, ChunkBatch columns,
+          shorten_matrix, encode_vectors over the whole matrix
+
+Reports best-of-N time, tracemalloc peak and garbage-collector runs.
+
+    python -m benchmarks.chunk_batch_memory --rows 300
+"""
+
+import argparse
+import base64
+import gc
+import json
+import time
+import tracemalloc
+import uuid
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_writer import encode_vector, encode_vectors
+from app.services.embeddings import shorten_embeddings, shorten_matrix
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {
+            "chunk_index": i,
+            "content": f"Chunk {i}: " + "lorem ipsum dolor sit amet " * 15,
+            "page_number": 1 + i // 20,
+            "section": "responsibilities",
+            "is_boilerplate": False,
+            "quality_score": 0.8,
+            "is_low_signal": False,
+            "content_hash": uuid.uuid4().hex,
+            "section_type": "responsibilities",
+            "skills_detected": ["python", "sql"],
+            "doc_domain": "job_description",
+        }
+        for i in range(n)
+    ]
+
+
+def _payloads(n: int, dim: int) -> tuple[list[str], list[str]]:
+    """Per-row embedding as the API sends it: a JSON float array, or base64 float32."""
+    vectors = np.random.default_rng(0).normal(size=(n, dim)).astype("<f4")
+    as_json = [json.dumps(v.tolist()) for v in vectors]
+    as_b64 = [base64.b64encode(v.tobytes()).decode() for v in vectors]
+    return as_json, as_b64
+
+
+def _lists_path(rows: list[dict], payloads: list[str]) -> list:
+    embeddings = [json.loads(p) for p in payloads]
+    new_rows = [dict(r) for r in rows]
+    short = shorten_embeddings(embeddings)
+    return [
+        (r["chunk_index"], r["content"], encode_vector(e), encode_vector(s))
+        for r, e, s in zip(new_rows, embeddings, short)
+    ]
+
+
+def _matrix_path(rows: list[dict], payloads: list[str]) -> list:
+    batch = ChunkBatch.from_rows(rows)
+    matrix = np.empty((len(payloads), settings.openai_embedding_dim), dtype=np.float32)
+    for i, p in enumerate(payloads):
+        matrix[i] = np.frombuffer(base64.b64decode(p), dtype="<f4")
+    batch.set_embeddings(matrix)
+    cols = batch.columns
+    return list(
+        zip(
+            cols["chunk_index"],
+            cols["content"],
+            encode_vectors(batch.embeddings),
+            encode_vectors(shorten_matrix(batch.embeddings)),
+        )
+    )
+
+
+def _gc_runs() -> int:
+    return sum(s["collections"] for s in gc.get_stats())
+
+
+def _measure(fn, rows, payloads, repeat: int) -> tuple[float, int, int]:
+    fn(rows, payloads)  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows, payloads)
+        best = min(best, time.perf_counter() - started)
+    gc_before = _gc_runs()
+    tracemalloc.start()
+    try:
+        out = fn(rows, payloads)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del out
+    return best, peak, _gc_runs() - gc_before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    as_json, as_b64 = _payloads(args.rows, settings.openai_embedding_dim)
+    print(f"rows={args.rows} dim={settings.openai_embedding_dim}")
+    print(f"{'path':>7} {'best ms':>9} {'peak MiB':>9} {'gc runs':>8}")
+    for name, fn, payloads in (("lists", _lists_path, as_json), ("matrix", _matrix_path, as_b64)):
+        best, peak, gc_runs = _measure(fn, rows, payloads, args.repeat)
+        print(f"{name:>7} {best * 1000:>9.1f} {peak / 2**20:>9.1f} {gc_runs:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+document_chunks write throughput: per-row ORM adds vs the bulk writer (binary COPY).
+
+Needs a migrated database at DATABASE_URL. Every run is rolled back.
+
+    python -m benchmarks.chunk_writes --rows 300 --repeat 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.models import Document, DocumentChunk, User
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_writer import insert_chunk_rows
+
+
+def _rows(n: int, dim: int, seed: int = 0) -> tuple[list[dict], list[list[float]]]:
+    rng = random.Random(seed)
+    rows = [
+        {
+            "chunk_index": i,
+            "content": f"Chunk {i}: " + "lorem ipsum dolor sit amet " * 15,
+            "page_number": 1 + i // 20,
+            "section": "responsibilities",
+            "is_boilerplate": False,
+            "quality_score": 0.8,
+            "is_low_signal": False,
+            "content_hash": uuid.uuid4().hex,
+            "section_type": "responsibilities",
+            "skills_detected": ["python", "sql"],
+            "doc_domain": "job_description",
+        }
+        for i in range(n)
+    ]
+    embeddings = [[rng.random() for _ in range(dim)] for _ in range(n)]
+    return rows, embeddings
+
+
+async def _orm_path(db, document_id, rows, embeddings) -> None:
+    for r, emb in zip(rows, embeddings):
+        db.add(DocumentChunk(document_id=document_id, **r, embedding=emb))
+    await db.flush()
+
+
+async def _bulk_path(db, document_id, rows, embeddings) -> None:
+    await insert_chunk_rows(db, document_id, ChunkBatch.from_rows(rows, embeddings))
+
+
+async def _time(path, rows, embeddings) -> float:
+    async with async_session_maker() as db:
+        user = User(email="bench@local")
+        db.add(user)
+        await db.flush()
+        doc = Document(user_id=user.id, filename="bench.pdf", s3_key="bench", status="processing")
+        db.add(doc)
+        await db.flush()
+        started = time.perf_counter()
+        await path(db, doc.id, rows, embeddings)
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows, embeddings = _rows(args.rows, settings.openai_embedding_dim)
+    for name, path in (("orm add+flush", _orm_path), ("bulk COPY", _bulk_path)):
+        await _time(path, rows, embeddings)  # warm-up
+        best = min([await _time(path, rows, embeddings) for _ in range(args.repeat)])
+        print(f"{name:>14}: {best * 1000:8.1f} ms  {args.rows / best:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
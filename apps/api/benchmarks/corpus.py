@@ -0,0 +1,95 @@
+"""
+Seeded synthetic job-description corpus for benchmarks.
+
+Documents look like PDF text extraction output: a title block, sections under
+varied headings (aliases, casing, trailing colons), bullet lists in several
+styles, prose paragraphs, salary/location/contact lines, and the artifacts
+normalize_jd_text cleans up (bullet mojibake, stray Â, non-breaking spaces,
+"Page X of Y" footers and lone page numbers). Same seed, same text.
+
+    from benchmarks.corpus import generate_jd
+    pages = generate_jd(pages=20, seed=7)   # [(page_number, text), ...]
+"""
+
+import random
+
+COMPANIES = ["Acme Scientific Inc", "Northwind Data LLC", "Globex Corp", "Initech Ltd", "Umbrella Analytics Inc"]
+TITLES = ["Senior Data Engineer", "Machine Learning Engineer", "Backend Software Engineer",
+          "Analytics Manager", "Platform Engineer", "Data Analyst"]
+HEADINGS = {
+    "position_summary": ["Position Summary", "Job Summary", "Overview", "Role Summary"],
+    "responsibilities": ["Responsibilities", "Key Responsibilities", "What You'll Do", "Duties"],
+    "tools_technologies": ["Tools & Technologies", "Tech Stack", "Technologies"],
+    "qualifications": ["Qualifications", "Requirements", "Minimum Qualifications", "Required Skills", "Must Have"],
+    "preferred_qualifications": ["Preferred Qualifications", "Nice to Have", "Preferred", "Pluses"],
+    "compensation": ["Compensation", "Salary Range", "Benefits", "Total Rewards"],
+    "location": ["Location", "Work Location"],
+    "company_info": ["About Us", "Who We Are", "Company Information"],
+}
+_SKILLS = ["Python", "SQL", "Spark", "AWS", "Azure", "GCP", "Google Cloud Platform", "machine learning",
+           "TensorFlow", "PyTorch", "React", "REST API", "Docker", "Kubernetes", "Airflow", "Postgres",
+           "Redis", "Jenkins", "pandas", "NumPy"]
+_VERBS = ["Design", "Build", "Own", "Operate", "Scale", "Partner on", "Mentor engineers on", "Review", "Automate"]
+_OBJECTS = ["data pipelines", "model serving", "batch and streaming jobs", "internal APIs", "dashboards",
+            "the experimentation platform", "cost reporting", "observability tooling", "feature stores"]
+_PROSE = (
+    "We are an equal opportunity employer and value diversity at our company. We do not discriminate "
+    "on the basis of race, religion, color, national origin, gender, sexual orientation, age, marital "
+    "status, veteran status, or disability status. Our team works across time zones and values clear "
+    "written communication, thoughtful reviews and shipping small changes often"
+).split(". ")
+_BULLET_STYLES = ["• ", "- ", "* ", "‣ ", "â€¢ ", "ΓÇó ", "  •\t", "1. "]
+
+
+def _bullet(rng: random.Random) -> str:
+    text = (
+        f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} with {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}"
+        if rng.random() < 0.7
+        else f"{rng.randint(2, 8)}+ years of experience with {rng.choice(_SKILLS)}"
+    )
+    style = rng.choice(_BULLET_STYLES)
+    if rng.random() < 0.1:
+        text = text.replace(" ", "\u00a0", 1)  # non-breaking space
+    if rng.random() < 0.05:
+        text += "Â"
+    return style + text
+
+
+def _heading(section: str, rng: random.Random) -> str:
+    h = rng.choice(HEADINGS[section])
+    return rng.choice([h, h.upper(), h + ":", h.title()])
+
+
+def _section_lines(section: str, rng: random.Random) -> list[str]:
+    lines = [_heading(section, rng)]
+    if section == "compensation":
+        low = rng.randrange(80, 180) * 1000
+        lines.append(f"Salary range: ${low:,} - ${low + rng.randrange(20, 60) * 1000:,} per year")
+        lines.extend(_bullet(rng) for _ in range(rng.randint(0, 3)))
+    elif section == "location":
+        lines.append(rng.choice(["Hybrid - San Francisco, CA", "Remote - US", "Austin, TX", "New York, NY (onsite)"]))
+    elif section in ("position_summary", "company_info"):
+        lines.append(". ".join(rng.sample(_PROSE, k=rng.randint(2, len(_PROSE)))) + ".")
+    else:
+        lines.extend(_bullet(rng) for _ in range(rng.randint(3, 12)))
+    if rng.random() < 0.1:
+        lines.append("Contact recruiting@example.com or visit https://example.com/careers")
+    return lines
+
+
+def generate_jd(pages: int = 1, seed: int = 0) -> list[tuple[int, str]]:
+    """One JD of `pages` pages, as (page_number, text) like PDF extraction returns."""
+    rng = random.Random(f"{seed}:{pages}")
+    sections = list(HEADINGS)
+    out: list[tuple[int, str]] = []
+    for page in range(1, pages + 1):
+        lines: list[str] = []
+        if page == 1:
+            lines += [rng.choice(COMPANIES), rng.choice(TITLES), "Job ID: " + str(rng.randrange(10**5, 10**6)), ""]
+        for _ in range(rng.randint(2, 4)):
+            lines += _section_lines(rng.choice(sections), rng)
+            lines += [""] * rng.choice([1, 1, 2, 3])
+        lines.append(rng.choice([f"Page {page} of {pages}", str(page), "Confidential"]))
+        out.append((page, "\n".join(lines)))
+    return out
+
@@ -0,0 +1,76 @@
+"""
+Embedding engine: wall-clock time vs batch size and concurrency.
+
+Default transport simulates the embeddings API (fixed round-trip + per-token cost),
+so it runs offline. Pass --live to hit OpenAI (needs OPENAI_API_KEY), or --hashing
+for the local deterministic provider.
+
+    python -m benchmarks.embedding_batches
+    python -m benchmarks.embedding_batches --chunks 300 --live
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.embedding_providers import HashingEmbeddingProvider, OpenAIEmbeddingProvider
+from app.services.embeddings import EmbeddingEngine, estimate_tokens
+
+BATCH_SIZES = [16, 64, 256]
+CONCURRENCY = [1, 2, 4, 8]
+
+
+def _make_texts(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    words = "python data model pipeline deploy team cloud experience design build".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(30, 90))) for _ in range(n)]
+
+
+def _simulated_transport(rtt_ms: float, per_token_us: float, dim: int):
+    async def _embed(texts: list[str]) -> list[list[float]]:
+        tokens = sum(estimate_tokens(t) for t in texts)
+        await asyncio.sleep(rtt_ms / 1000 + tokens * per_token_us / 1e6)
+        return [[0.0] * dim for _ in texts]
+
+    return _embed
+
+
+async def _time_once(engine: EmbeddingEngine, texts: list[str]) -> float:
+    started = time.perf_counter()
+    await engine.embed(texts)
+    return (time.perf_counter() - started) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=300)
+    parser.add_argument("--rtt-ms", type=float, default=120.0)
+    parser.add_argument("--per-token-us", type=float, default=15.0)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--hashing", action="store_true", help="Local hashing provider (real CPU cost, no network)")
+    args = parser.parse_args()
+
+    texts = _make_texts(args.chunks)
+    if args.live:
+        transport = OpenAIEmbeddingProvider().embed_batch
+    elif args.hashing:
+        transport = HashingEmbeddingProvider().embed_batch
+    else:
+        transport = _simulated_transport(args.rtt_ms, args.per_token_us, 1536)
+
+    # Baseline: everything in one request (previous behaviour)
+    single = EmbeddingEngine(transport, max_tokens=10**9, max_inputs=10**9, concurrency=1)
+    baseline = await _time_once(single, texts)
+    print(f"chunks={len(texts)} single-request baseline: {baseline:8.1f} ms")
+    print(f"{'batch':>6} {'conc':>5} {'batches':>8} {'ms':>9} {'speedup':>8}")
+    for batch in BATCH_SIZES:
+        for conc in CONCURRENCY:
+            engine = EmbeddingEngine(transport, max_tokens=10**9, max_inputs=batch, concurrency=conc)
+            ms = await _time_once(engine, texts)
+            n_batches = -(-len(texts) // batch)
+            print(f"{batch:>6} {conc:>5} {n_batches:>8} {ms:>9.1f} {baseline / ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+JD sectionisation on long, heading-dense documents: original linear alias scan vs
+the indexed heading matcher. Checks both produce identical sections.
+
+    python -m benchmarks.jd_headings
+    python -m benchmarks.jd_headings --lines 50000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+from unittest import mock
+
+from app.services import jd_sections
+from app.services.jd_sections import JD_SECTION_ALIASES, sectionize_jd_text
+from tests.test_jd_headings import _reference_match
+
+_CONTENT = [
+    "• Design and build data pipelines in Python and SQL",
+    "• Partner with product teams",
+    "Remote - US. Some travel required.",
+    "Hybrid - San Francisco, CA",
+    "Salary: $120,000 - $150,000",
+    "Experience with Kubernetes and Terraform",
+    "Payroll systems experience a plus",
+]
+
+
+def _make_document(lines: int, seed: int = 0) -> str:
+    """About one line in three is a heading (alias, alias variant or near miss)."""
+    rng = random.Random(seed)
+    headings = list(JD_SECTION_ALIASES)
+    out = []
+    for _ in range(lines):
+        r = rng.random()
+        if r < 0.15:
+            out.append(rng.choice(headings).title() + ":")
+        elif r < 0.33:
+            out.append(rng.choice(headings).split()[0].upper() + " details")
+        else:
+            out.append(rng.choice(_CONTENT))
+    return "\n".join(out)
+
+
+def _best_ms(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sectionize_jd_text(text)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    doc = _make_document(args.lines)
+    current_sections = sectionize_jd_text(doc)
+    current = _best_ms(doc, args.repeat)
+    with mock.patch.object(jd_sections, "_match_section_heading", _reference_match):
+        baseline_sections = sectionize_jd_text(doc)
+        baseline = _best_ms(doc, args.repeat)
+    print(f"lines={args.lines} sections={len(current_sections)} identical={current_sections == baseline_sections}")
+    print(f"baseline: {baseline:8.1f} ms  ({args.lines / baseline:6.1f} lines/ms)")
+    print(f"indexed:  {current:8.1f} ms  ({args.lines / current:6.1f} lines/ms)  {baseline / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
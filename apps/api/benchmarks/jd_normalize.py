@@ -0,0 +1,71 @@
+"""
+normalize_jd_text on long documents: original multi-pass version vs the current one.
+
+Builds synthetic JDs (bullets, mojibake, page footers, blank-line runs) of
+increasing size and checks both produce identical output.
+
+    python -m benchmarks.jd_normalize
+    python -m benchmarks.jd_normalize --pages 200 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+from app.services.jd_sections import normalize_jd_text
+from tests.test_jd_normalize import _reference_normalize
+
+_LINES = [
+    "Responsibilities",
+    "- Design and build data pipelines in Python and SQL",
+    "* Partner with product and analytics teams",
+    "â€¢ Own services end to end, including on-call",
+    "ΓÇó Mentor engineers and review designs",
+    "‣ Experience with Kubernetes,\tTerraform and AWS",
+    "Salary range: $120,000Â - $150,000",
+    "We are an equal opportunity employer and value diversity at our company.",
+    "",
+    "",
+]
+
+
+def _make_document(pages: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = []
+    for p in range(1, pages + 1):
+        out.extend(rng.choice(_LINES) for _ in range(45))
+        out.append(f"Page {p} of {pages}")
+        out.append(str(p))
+        out.append("\n\n")
+    return "\n".join(out)
+
+
+def _best_ms(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="Largest document, in pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'chars':>9} {'baseline ms':>12} {'current ms':>11} {'speedup':>8} identical")
+    for pages in sorted({max(1, args.pages // 10), max(1, args.pages // 2), args.pages}):
+        doc = _make_document(pages)
+        identical = normalize_jd_text(doc) == _reference_normalize(doc)
+        baseline = _best_ms(_reference_normalize, doc, args.repeat)
+        current = _best_ms(normalize_jd_text, doc, args.repeat)
+        print(
+            f"{pages:>6} {len(doc):>9} {baseline:>12.2f} {current:>11.2f} "
+            f"{baseline / current:>7.2f}x {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Ingestion CPU for the JD text stages: parse per stage (normalise + sectionise in
+extraction and again in chunking) vs one shared ParsedJD.
+
+Checks that chunks and the extracted structure are identical on both paths.
+
+    python -m benchmarks.jd_parse_once
+    python -m benchmarks.jd_parse_once --docs 200 --pages 8
+"""
+
+import argparse
+import time
+
+from app.services.jd_chunking import iter_jd_chunks
+from app.services.jd_extraction import extract_jd_fields, extract_jd_struct, parse_jd
+from app.services.jd_sections import normalize_jd_text
+from benchmarks.corpus import generate_jd
+
+def _per_stage(pages):
+    jd = extract_jd_struct(normalize_jd_text("\n\n".join(t for _, t in pages)))
+    return jd, list(iter_jd_chunks(pages))
+
+
+def _shared(pages):
+    parsed = parse_jd("\n\n".join(t for _, t in pages))
+    return extract_jd_fields(parsed), list(iter_jd_chunks(pages, parsed=parsed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = [generate_jd(args.pages, seed) for seed in range(args.docs)]
+    identical = sum(_per_stage(d) == _shared(d) for d in corpus)
+
+    timings = {}
+    for name, fn in (("per-stage", _per_stage), ("shared", _shared)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for d in corpus:
+                fn(d)
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best * 1000
+
+    print(f"docs={args.docs} pages/doc={args.pages} identical={identical}/{args.docs}")
+    for name, ms in timings.items():
+        print(f"{name:>10}: {ms:8.1f} ms  ({ms / args.docs:6.2f} ms/doc)")
+    print(f"speedup: {timings['per-stage'] / timings['shared']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Matryoshka candidates: recall@k and latency of short-prefix search + full rescore
+vs. exact search on the full vectors (the single-vector setup).
+
+By default both sides are exact brute force in NumPy: recall reflects only what
+truncating to the prefix loses, and neither pgvector nor its HNSW index is involved.
+--db measures the deployed path instead: the corpus goes into document_chunks as one
+document (needs a migrated database at DATABASE_URL; rolled back afterwards) and each
+query runs the retrieval SQL with RETRIEVAL_QUANTIZATION=short, i.e. the HNSW index on
+embedding_short (256 dims) plus the float32 rerank. It also reports whether the
+planner used that index. The default corpus is embedded with the
+local hashing provider, which is not Matryoshka-trained (its prefix is just a subset
+of hash buckets), so treat its recall as a lower bound; --live embeds with OpenAI
+(needs OPENAI_API_KEY) for text-embedding-3 numbers.
+
+    python -m benchmarks.matryoshka_recall
+    python -m benchmarks.matryoshka_recall --chunks 2000 --queries 50 --live
+    python -m benchmarks.matryoshka_recall --chunks 5000 --db
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import SHORT_EMBEDDING_DIM
+from app.db.base import async_session_maker
+from app.models import Document, DocumentChunk, User
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_writer import insert_chunk_rows
+from app.services.embedding_providers import HashingEmbeddingProvider, OpenAIEmbeddingProvider
+from app.services.embeddings import EmbeddingEngine, shorten_matrix
+from app.services.retrieval import _MAX_EF_SEARCH, build_retrieval_query
+
+SHORT_DIMS = [64, 128, 256, 512]
+RERANK_FACTORS = [2, 4, 8]
+
+_WORDS = (
+    "python sql spark airflow kubernetes docker aws gcp terraform data pipeline model "
+    "analytics dashboard stakeholder roadmap customer security compliance design review "
+    "mentor team deploy monitoring latency scale api backend frontend react product"
+).split()
+
+
+def _make_texts(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 60))) for _ in range(n)]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def _exact(full: np.ndarray, q: np.ndarray, k: int) -> np.ndarray:
+    return _top_k(full @ q, k)
+
+
+def _two_stage(full: np.ndarray, short: np.ndarray, q: np.ndarray, q_short: np.ndarray, k: int, n: int):
+    candidates = _top_k(short @ q_short, min(n, len(short)))
+    return candidates[_top_k(full[candidates] @ q, k)]
+
+
+def _mean_ms(fn, queries) -> tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - started) * 1000 / len(queries), results
+
+
+async def _explain(db, stmt) -> str:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return "\n".join(row[0] for row in await db.execute(text(f"EXPLAIN {sql}")))
+
+
+async def _db_two_stage(full: np.ndarray, queries: np.ndarray, k: int) -> None:
+    """Recall@k and latency of the retrieval SQL over the embedding_short HNSW index."""
+    _, truth = _mean_ms(lambda q: _exact(full, q, k), queries)
+    rows = [
+        {"chunk_index": i, "content": f"chunk {i}", "page_number": 1, "is_boilerplate": False, "is_low_signal": False}
+        for i in range(len(full))
+    ]
+    async with async_session_maker() as db:
+        user = User(email="bench@local")
+        db.add(user)
+        await db.flush()
+        doc = Document(user_id=user.id, filename="bench.pdf", s3_key="bench", status="processing")
+        db.add(doc)
+        await db.flush()
+        await insert_chunk_rows(db, doc.id, ChunkBatch.from_rows(rows, full))
+        ids = dict(
+            (
+                await db.execute(
+                    select(DocumentChunk.id, DocumentChunk.chunk_index).where(DocumentChunk.document_id == doc.id)
+                )
+            ).all()
+        )
+        await db.execute(text("ANALYZE document_chunks"))
+
+        print(f"pgvector HNSW on embedding_short ({SHORT_EMBEDDING_DIM} dims) + float32 rerank:")
+        print(f"{'factor':>7} {'recall@k':>9} {'ms/query':>9} {'index':>6}")
+        for factor in RERANK_FACTORS:
+            n = k * factor
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {min(n, _MAX_EF_SEARCH)}"))
+
+            def stmt(q: np.ndarray, n: int = n):
+                return build_retrieval_query(doc.id, q.tolist(), k, quantization="short", candidates=n)
+
+            plan = await _explain(db, stmt(queries[0]))
+            found = []
+            started = time.perf_counter()
+            for q in queries:
+                found.append([ids[row.id] for row in (await db.execute(stmt(q))).all()])
+            ms = (time.perf_counter() - started) * 1000 / len(queries)
+            recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+            used = "ix_document_chunks_embedding_short_hnsw" in plan
+            print(f"{factor:>7} {recall:>9.3f} {ms:>9.2f} {'yes' if used else 'no':>6}")
+        await db.rollback()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--live", action="store_true", help="Embed with OpenAI instead of the hashing provider")
+    parser.add_argument("--db", action="store_true", help="Measure the pgvector index path instead of NumPy")
+    args = parser.parse_args()
+
+    provider = OpenAIEmbeddingProvider() if args.live else HashingEmbeddingProvider()
+    engine = EmbeddingEngine(provider.embed_batch)
+    full = await engine.embed_matrix(_make_texts(args.chunks, seed=0))
+    queries = await engine.embed_matrix(_make_texts(args.queries, seed=1))
+    full /= np.linalg.norm(full, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    k = args.k
+    if args.db:
+        print(f"provider={provider.model_name} chunks={len(full)} queries={len(queries)} k={k}")
+        await _db_two_stage(full, queries, k)
+        return
+    exact_ms, truth = _mean_ms(lambda q: _exact(full, q, k), queries)
+    print(f"provider={provider.model_name} chunks={len(full)} queries={len(queries)} k={k}")
+    print(f"full {full.shape[1]}-dim exact: {exact_ms:7.2f} ms/query (recall 1.000)")
+    print(f"{'dims':>5} {'factor':>7} {'recall@k':>9} {'ms/query':>9} {'speedup':>8}")
+    for dim in SHORT_DIMS:
+        short = shorten_matrix(full, dim)
+        q_short = shorten_matrix(queries, dim)
+        for factor in RERANK_FACTORS:
+            pairs = list(zip(queries, q_short))
+            ms, found = _mean_ms(lambda p: _two_stage(full, short, p[0], p[1], k, k * factor), pairs)
+            recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+            print(f"{dim:>5} {factor:>7} {recall:>9.3f} {ms:>9.2f} {exact_ms / ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Per-query MMR latency: the original pure-Python loop vs the NumPy _mmr_select.
+
+Candidates look like retrieval rows: normalized float32 embeddings (as pgvector
+returns them) with scores rounded to 6 places. Both paths must select the same
+chunks; reports best-of-N milliseconds per query.
+
+    python -m benchmarks.mmr_select --candidates 50 --top-k 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.retrieval import _mmr_select
+
+
+def _loop_mmr(candidates: list[dict], top_k: int, lambda_: float) -> list[dict]:
+    """The previous implementation: Python cosine per (candidate, selected) pair per round."""
+    selected: list[dict] = []
+    remaining = list(candidates)
+    while len(selected) < top_k and remaining:
+        best_idx = -1
+        best_mmr = float("-inf")
+        for i, c in enumerate(remaining):
+            max_sim_sel = 0.0
+            for s in selected:
+                max_sim_sel = max(max_sim_sel, sum(x * y for x, y in zip(c["embedding"], s["embedding"])))
+            mmr = lambda_ * c["score"] - (1 - lambda_) * max_sim_sel
+            if mmr > best_mmr:
+                best_mmr = mmr
+                best_idx = i
+        selected.append(remaining.pop(best_idx))
+    return selected
+
+
+def _candidates(n: int, dim: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = np.round(rng.uniform(0.2, 0.9, size=n), 6)
+    return [{"chunk_id": str(i), "score": float(scores[i]), "embedding": vectors[i]} for i in range(n)]
+
+
+def _best_ms(fn, candidates: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        rows = [dict(c) for c in candidates]
+        started = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=settings.top_n_candidates)
+    parser.add_argument("--top-k", type=int, default=settings.top_k_max)
+    parser.add_argument("--lambda", dest="lambda_", type=float, default=settings.mmr_lambda)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    candidates = _candidates(args.candidates, settings.openai_embedding_dim, args.seed)
+    loop = lambda rows: _loop_mmr(rows, args.top_k, args.lambda_)  # noqa: E731
+    vectorised = lambda rows: _mmr_select(rows, [], args.top_k, args.lambda_)  # noqa: E731
+    same = [c["chunk_id"] for c in loop([dict(c) for c in candidates])] == [
+        c["chunk_id"] for c in vectorised([dict(c) for c in candidates])
+    ]
+    print(f"candidates={args.candidates} top_k={args.top_k} dim={settings.openai_embedding_dim} same={same}")
+    for name, fn in (("loop", loop), ("numpy", vectorised)):
+        print(f"{name:>6}: {_best_ms(fn, candidates, args.repeat):8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+PDF extraction throughput (pages/s) vs number of pool workers.
+
+Builds a synthetic text-heavy PDF with PyMuPDF, then extracts it from disk with
+pools of increasing size. One worker is the serial baseline.
+
+    python -m benchmarks.pdf_extraction
+    python -m benchmarks.pdf_extraction --pages 400 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from app.core.config import settings
+from app.services.pdf_pool import ExtractionPool
+
+WORDS = "python data model pipeline deploy team cloud experience design build requirements".split()
+
+
+def _write_pdf(path: str, pages: int, seed: int = 0) -> None:
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        lines = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(50)]
+        page.insert_textbox(page.rect + (36, 36, -36, -36), f"Page {n + 1}\n" + "\n".join(lines), fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+async def _time(workers: int, path: str, pages: int, repeat: int) -> float:
+    pool = ExtractionPool(size=workers, timeout_s=600)
+    try:
+        await pool.start()
+        await pool.extract(path, pages)  # warm-up
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await pool.extract(path, pages)
+            best = min(best, time.perf_counter() - started)
+        assert len(result) == pages
+        return best
+    finally:
+        await pool.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        _write_pdf(path, args.pages)
+        print(f"pages={args.pages} min_pages_per_job={settings.pdf_min_pages_per_job} cpus={os.cpu_count()}")
+        print(f"{'workers':>8} {'ms':>9} {'pages/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            secs = await _time(workers, path, args.pages, args.repeat)
+            baseline = baseline or secs
+            print(f"{workers:>8} {secs * 1000:>9.1f} {args.pages / secs:>9.0f} {baseline / secs:>7.2f}x")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Chunk quality metrics: original per-character implementation vs the current one.
+
+Synthetic JD-like chunks (mostly prose, some with contact details, some non-ASCII).
+Also checks that both give identical metrics on every chunk.
+
+    python -m benchmarks.quality_metrics
+    python -m benchmarks.quality_metrics --chunks 20000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import time
+
+from app.services.chunking import EMAIL_RE, PHONE_RE, URL_RE, _compute_quality_metrics
+
+_WORDS = (
+    "build scalable data pipelines with python and sql partner with product teams "
+    "own services end to end mentor engineers design apis monitor latency in production"
+).split()
+_EXTRAS = [
+    "Apply at careers@example.com",
+    "https://example.com/jobs/123",
+    "Call 555-123-4567",
+    "Salary $120,000 - $150,000",
+    "Zürich · São Paulo · Kraków",
+]
+
+
+def _baseline_metrics(text: str) -> dict:
+    """Pre-optimisation implementation (list of non-space chars + four regex passes)."""
+    non_ws = [c for c in text if not c.isspace()]
+    total = len(non_ws)
+    alpha = sum(1 for c in non_ws if c.isalpha())
+    digit = sum(1 for c in non_ws if c.isdigit())
+    words = re.findall(r"\b\w+\b", text.lower())
+    return {
+        "alpha_ratio": alpha / total if total else 0.0,
+        "digit_ratio": digit / total if total else 0.0,
+        "url_count": len(URL_RE.findall(text)),
+        "email_count": len(EMAIL_RE.findall(text)),
+        "phone_count": len(PHONE_RE.findall(text)),
+        "unique_word_ratio": len(set(words)) / len(words) if words else 0.0,
+        "length_chars": len(text),
+    }
+
+
+def _make_chunks(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(n):
+        lines = [
+            "• " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 18)))
+            for _ in range(rng.randint(2, 10))
+        ]
+        if rng.random() < 0.2:
+            lines.append(rng.choice(_EXTRAS))
+        chunks.append("\n".join(lines))
+    return chunks
+
+
+def _time(fn, chunks: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for c in chunks:
+            fn(c)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks = _make_chunks(args.chunks)
+    mismatches = sum(_baseline_metrics(c) != _compute_quality_metrics(c) for c in chunks)
+    chars = sum(len(c) for c in chunks)
+    baseline = _time(_baseline_metrics, chunks, args.repeat)
+    current = _time(_compute_quality_metrics, chunks, args.repeat)
+    print(f"chunks={len(chunks)} chars={chars} mismatches={mismatches}")
+    print(f"baseline: {baseline * 1000:8.1f} ms  ({chars / baseline / 1e6:6.2f} Mchar/s)")
+    print(f"current:  {current * 1000:8.1f} ms  ({chars / current / 1e6:6.2f} Mchar/s)  {baseline / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Skill/tool/cloud extraction: Aho-Corasick phrase matcher vs taxonomy size.
+
+Builds synthetic taxonomies (1-3 word phrases) of increasing size and times
+matching over a long JD-like text. The automaton's scan time should stay flat
+as the taxonomy grows; a per-phrase substring scan is shown for contrast.
+
+    python -m benchmarks.skill_matcher
+    python -m benchmarks.skill_matcher --sizes 100 10000 50000 --chars 200000
+"""
+
+import argparse
+import random
+import time
+
+from app.services.jd_extraction import SKILL_KEYWORDS, TOOL_KEYWORDS
+from app.services.phrase_matcher import PhraseMatcher
+
+
+def _make_taxonomy(size: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    syllables = "ka lo mi nu pe ra so ti vu xe ya zo".split()
+    base = sorted(SKILL_KEYWORDS | TOOL_KEYWORDS)
+    phrases = set(base)
+    while len(phrases) < size:
+        words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        phrases.add(" ".join(words))
+    return sorted(phrases)
+
+
+def _make_text(chars: int, taxonomy: list[str], seed: int = 1) -> str:
+    rng = random.Random(seed)
+    filler = "build scalable services with the team and ship to production".split()
+    out: list[str] = []
+    size = 0
+    while size < chars:
+        piece = rng.choice(taxonomy) if rng.random() < 0.1 else rng.choice(filler)
+        out.append(piece)
+        size += len(piece) + 1
+    return " ".join(out)
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000, 10000, 50000])
+    parser.add_argument("--chars", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'phrases':>8} {'nodes':>8} {'build ms':>9} {'match ms':>9} {'hits':>6} {'substring ms':>13}")
+    for size in args.sizes:
+        taxonomy = _make_taxonomy(size)
+        text = _make_text(args.chars, taxonomy[:50])  # same hit density at every size
+        started = time.perf_counter()
+        matcher = PhraseMatcher((p, p) for p in taxonomy)
+        build_ms = (time.perf_counter() - started) * 1000
+        match_ms = _best_ms(lambda: matcher.find(text), args.repeat)
+        hits = len(matcher.find(text))
+        lowered = text.lower()
+        naive_ms = _best_ms(lambda: [p for p in taxonomy if p in lowered], 1)
+        print(f"{size:>8} {len(matcher):>8} {build_ms:>9.1f} {match_ms:>9.2f} {hits:>6} {naive_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
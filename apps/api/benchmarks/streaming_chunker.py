@@ -0,0 +1,76 @@
+"""
+JD chunking of long documents: chunk_jd_pages over the whole text vs iter_jd_chunks
+consuming pages one at a time (JDChunkStream), on the seeded synthetic corpus.
+
+  eager:  join all pages, normalize, sectionize, then chunk; returns the full list
+  stream: pages fed as they are read, chunks handed on (and dropped) as sections close
+
+Reports best-of-N time to the first chunk and to the last, and the tracemalloc peak
+of a separate untimed run (the page list itself is allocated before tracing starts).
+
+    python -m benchmarks.streaming_chunker --pages 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from app.services.jd_chunking import chunk_jd_pages, iter_jd_chunks
+from benchmarks.corpus import generate_jd
+
+
+def _eager(pages: list[tuple[int, str]]) -> int:
+    return len(chunk_jd_pages(pages, max_chunks=10**6))
+
+
+def _stream(pages: list[tuple[int, str]]) -> int:
+    return sum(1 for _ in iter_jd_chunks(iter(pages), max_chunks=10**6))
+
+
+def _first_eager(pages: list[tuple[int, str]]) -> None:
+    chunk_jd_pages(pages, max_chunks=10**6)[0]
+
+
+def _first_stream(pages: list[tuple[int, str]]) -> None:
+    next(iter_jd_chunks(iter(pages), max_chunks=10**6))
+
+
+def _best(fn, pages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(pages)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _peak(fn, pages) -> int:
+    tracemalloc.start()
+    try:
+        fn(pages)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = generate_jd(args.pages, args.seed)
+    chars = sum(len(t) for _, t in pages)
+    assert _eager(pages) == _stream(pages)
+    print(f"pages={args.pages} chars={chars} chunks={_eager(pages)}")
+    print(f"{'path':>7} {'first ms':>9} {'total ms':>9} {'peak MiB':>9}")
+    for name, fn, first in (("eager", _eager, _first_eager), ("stream", _stream, _first_stream)):
+        first_s = _best(first, pages, args.repeat)
+        total_s = _best(fn, pages, args.repeat)
+        print(f"{name:>7} {first_s * 1000:>9.1f} {total_s * 1000:>9.1f} {_peak(fn, pages) / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
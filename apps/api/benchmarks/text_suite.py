@@ -0,0 +1,152 @@
+"""
+Text-stage micro-benchmarks: normalize_jd_text, sectionize_jd_text, chunk_jd_pages,
+chunk_pages and extract_jd_struct over the seeded synthetic corpus (benchmarks.corpus)
+at several document sizes.
+
+Reports best-of-N wall time, throughput (input chars/s) and allocations (tracemalloc
+peak and allocated block count, measured in a separate untimed run). --out writes
+JSON; --compare prints the change against an earlier JSON file, e.g. from another
+commit:
+
+    python -m benchmarks.text_suite --out /tmp/before.json
+    git checkout <other> && python -m benchmarks.text_suite --compare /tmp/before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.services.chunking import chunk_pages
+from app.services.jd_chunking import chunk_jd_pages
+from app.services.jd_extraction import extract_jd_struct
+from app.services.jd_sections import normalize_jd_text, sectionize_jd_text
+from benchmarks.corpus import generate_jd
+
+SIZES = [1, 10, 50, 200]
+
+
+def _joined(pages: list[tuple[int, str]]) -> str:
+    return "\n\n".join(t for _, t in pages)
+
+
+def _cases(pages: list[tuple[int, str]]) -> dict:
+    """name -> zero-arg callable over one document. Inputs are prepared outside the timing."""
+    raw = _joined(pages)
+    norm = normalize_jd_text(raw)
+    return {
+        "normalize_jd_text": lambda: normalize_jd_text(raw),
+        "sectionize_jd_text": lambda: sectionize_jd_text(norm),
+        "chunk_jd_pages": lambda: chunk_jd_pages(pages, max_chunks=10**6),
+        "chunk_pages": lambda: chunk_pages(pages, max_chunks=10**6),
+        "extract_jd_struct": lambda: extract_jd_struct(raw),
+    }
+
+
+def _best_s(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _allocations(fn) -> tuple[int, int]:
+    """(peak bytes, blocks allocated and still live at the end of the call)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = fn()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+    return peak, blocks
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(sizes: list[int], repeat: int, seed: int) -> dict:
+    results = []
+    for size in sizes:
+        pages = generate_jd(size, seed)
+        chars = len(_joined(pages))
+        for name, fn in _cases(pages).items():
+            fn()  # warm caches (compiled regexes, lazy imports)
+            best = _best_s(fn, repeat)
+            peak, blocks = _allocations(fn)
+            results.append(
+                {
+                    "name": name,
+                    "pages": size,
+                    "chars": chars,
+                    "best_ms": round(best * 1000, 3),
+                    "mchars_per_s": round(chars / best / 1e6, 3),
+                    "peak_kib": round(peak / 1024, 1),
+                    "live_blocks": blocks,
+                }
+            )
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _print(report: dict, baseline: dict | None) -> None:
+    base = {(r["name"], r["pages"]): r for r in (baseline or {}).get("results", [])}
+    header = f"{'benchmark':<20} {'pages':>5} {'chars':>9} {'best ms':>9} {'Mchar/s':>8} {'peak KiB':>9} {'blocks':>7}"
+    if baseline:
+        header += f" {'vs ' + str(baseline.get('commit') or 'baseline'):>14}"
+    print(f"commit={report['commit']} python={report['python']} seed={report['seed']} repeat={report['repeat']}")
+    print(header)
+    for r in report["results"]:
+        line = (
+            f"{r['name']:<20} {r['pages']:>5} {r['chars']:>9} {r['best_ms']:>9.2f} "
+            f"{r['mchars_per_s']:>8.2f} {r['peak_kib']:>9.1f} {r['live_blocks']:>7}"
+        )
+        prev = base.get((r["name"], r["pages"]))
+        if prev:
+            line += f" {(r['best_ms'] / prev['best_ms'] - 1) * 100:>+13.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Document sizes in pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON results to diff best_ms against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    _print(report, baseline)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
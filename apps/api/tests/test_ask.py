@@ -112,7 +112,7 @@ async def test_ask_no_chunks_returns_fallback(client, demo_key_off, monkeypatch)
 
     # Mock retrieval to return empty chunks; generate_grounded_answer returns fallback
     with patch("app.routers.ask.retrieve_chunks", new_callable=AsyncMock, return_value=[]):
-        with patch("app.routers.ask.embed_query", return_value=[0.1] * 1536):
+        with patch("app.routers.ask.embed_query", new_callable=AsyncMock, return_value=[0.1] * 1536):
             resp = await client.post(
                 "/ask",
                 json={
@@ -0,0 +1,122 @@
+"""Unit tests for incremental chunk sync planning."""
+
+import uuid
+
+from sqlalchemy.sql import Delete, Select
+
+from app.core.config import settings
+from app.services.chunk_sync import (
+    META_FIELDS,
+    chunk_row_values,
+    load_existing_chunks,
+    plan_chunk_sync,
+    stored_chunks_reusable,
+)
+from app.services.doc_dedupe import current_pipeline_version
+from app.services.jd_chunking import chunk_jd_pages
+
+JD = """
+Acme Corp
+
+Responsibilities
+
+• Build data pipelines in Python and SQL for analytics teams
+• Own deployment of machine learning models to production
+
+Qualifications
+
+• 3+ years of experience with Python, Spark and AWS
+• Bachelor's degree in Computer Science or related field
+
+Benefits
+
+Health, dental and vision coverage. 401k matching and generous paid time off.
+"""
+
+
+def _stored(new_rows: list[dict]) -> list[dict]:
+    """Simulate rows as they come back from load_existing_chunks."""
+    return [
+        {"id": uuid.uuid4(), "content_hash": r["content_hash"], **{f: r[f] for f in META_FIELDS}}
+        for r in new_rows
+    ]
+
+
+def _rows(text: str) -> list[dict]:
+    return [chunk_row_values(cr, i) for i, cr in enumerate(chunk_jd_pages([(1, text)]))]
+
+
+def test_unchanged_document_is_a_no_op():
+    rows = _rows(JD)
+    plan = plan_chunk_sync(_stored(rows), rows)
+    assert plan.kept == len(rows)
+    assert plan.inserts == [] and plan.deletes == [] and plan.updates == []
+
+
+def test_first_ingest_inserts_everything():
+    rows = _rows(JD)
+    plan = plan_chunk_sync([], rows)
+    assert plan.inserts == list(range(len(rows)))
+    assert plan.kept == 0
+
+
+def test_edit_only_touches_changed_chunks():
+    old_rows = _rows(JD)
+    stored = _stored(old_rows)
+    new_text = JD.replace(
+        "Health, dental and vision coverage.",
+        "Full medical coverage.",
+    )
+    new_rows = _rows(new_text)
+    plan = plan_chunk_sync(stored, new_rows)
+    assert len(plan.inserts) == 1
+    assert len(plan.deletes) == 1
+    assert plan.kept == len(new_rows) - 1
+    assert "Full medical coverage" in new_rows[plan.inserts[0]]["content"]
+
+
+def test_moved_chunk_is_updated_in_place():
+    a = {"content_hash": "a", **{f: None for f in META_FIELDS}, "chunk_index": 0}
+    b = {"content_hash": "b", **{f: None for f in META_FIELDS}, "chunk_index": 1}
+    stored = [{"id": uuid.uuid4(), **a}, {"id": uuid.uuid4(), **b}]
+    new_rows = [{**b, "chunk_index": 0}, {**a, "chunk_index": 1}]
+    plan = plan_chunk_sync(stored, new_rows)
+    assert plan.inserts == [] and plan.deletes == []
+    assert sorted(u["chunk_index"] for u in plan.updates) == [0, 1]
+    assert all(set(u) == {"id", "chunk_index"} for u in plan.updates)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+        class _Result:
+            rowcount = 2
+
+            def mappings(self):
+                return []
+
+        return _Result()
+
+
+def test_rows_from_another_embedding_model_are_not_reusable(monkeypatch):
+    stored_version = current_pipeline_version()
+    assert stored_chunks_reusable(stored_version)
+    monkeypatch.setattr(settings, "openai_embedding_model", "other-model")
+    assert not stored_chunks_reusable(stored_version)
+    assert not stored_chunks_reusable(None)
+
+
+async def test_stale_rows_are_deleted_instead_of_diffed(monkeypatch):
+    db = _RecordingSession()
+    assert await load_existing_chunks(db, uuid.uuid4(), current_pipeline_version()) == []
+    assert isinstance(db.statements[0], Select)
+
+    stale = current_pipeline_version()
+    monkeypatch.setattr(settings, "openai_embedding_model", "other-model")
+    db = _RecordingSession()
+    assert await load_existing_chunks(db, uuid.uuid4(), stale) == []
+    assert [type(s) for s in db.statements] == [Delete]
@@ -0,0 +1,38 @@
+"""Unit tests for the bulk chunk writer's vector encoding and the ChunkBatch it writes."""
+
+from array import array
+
+import numpy as np
+import pytest
+from pgvector import Vector
+
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_writer import decode_vector, encode_vector, encode_vectors
+
+
+def test_encode_vector_matches_pgvector_binary_format():
+    values = [0.5, -1.25, 3.0, 0.0]
+    assert encode_vector(values) == Vector(values).to_binary()
+
+
+def test_encode_decode_roundtrip():
+    values = [i / 7 for i in range(1536)]
+    decoded = decode_vector(encode_vector(values))
+    assert len(decoded) == 1536
+    assert decoded == array("f", values).tolist()  # exact at float32 precision
+
+
+def test_encode_vectors_matches_per_row_encoding():
+    matrix = np.random.default_rng(0).normal(size=(5, 16)).astype(np.float32)
+    assert encode_vectors(matrix) == [encode_vector(row.tolist()) for row in matrix]
+
+
+def test_chunk_batch_is_columnar_with_float32_embeddings():
+    rows = [{"chunk_index": i, "content": f"c{i}", "is_low_signal": False} for i in range(3)]
+    batch = ChunkBatch.from_rows(rows, [[float(i)] * 4 for i in range(3)])
+    assert len(batch) == 3
+    assert batch.columns["chunk_index"] == [0, 1, 2]
+    assert batch.row(1)["content"] == "c1" and batch.row(1)["minhash"] is None
+    assert batch.embeddings.dtype == np.float32 and batch.embeddings.shape == (3, 4)
+    with pytest.raises(ValueError):
+        batch.set_embeddings([[0.0] * 4])
@@ -3,7 +3,9 @@
 import pytest
 
 from app.services.chunking import (
+    RepeatedContentMarker,
     chunk_pages,
+    iter_chunk_pages,
     normalize_text,
 )
 
@@ -89,3 +91,23 @@ def test_long_repeated_content_not_marked_low_signal():
     assert len(dupes) >= 3
     # length>200 so repetition rule does NOT apply
     assert not any(r.is_low_signal for r in dupes)
+
+
+def test_iter_chunk_pages_is_lazy_and_leaves_repeats_to_marker():
+    """Each page's chunks are yielded before the next page is read; repeats are a follow-up pass."""
+    identical = "Page footer."
+    page_texts = [(n, f"Section {n} body text.\n\n{identical}") for n in range(1, 4)]
+
+    def _pages():
+        yield from page_texts
+        raise AssertionError("read past the last page")
+
+    first = next(iter_chunk_pages(_pages(), chunk_size=20, overlap_paragraphs=0, min_chars=5))
+    assert first.page_number == 1
+
+    marker = RepeatedContentMarker()
+    for r in iter_chunk_pages(page_texts, chunk_size=20, overlap_paragraphs=0, min_chars=5):
+        marker.add(r)
+    eager = chunk_pages(page_texts, chunk_size=20, overlap_paragraphs=0, min_chars=5)
+    assert marker.finish() == [r.chunk_index for r in eager if r.content == identical]
+    assert all(eager[i].is_low_signal for i in marker.finish())
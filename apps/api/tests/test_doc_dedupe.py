@@ -0,0 +1,75 @@
+"""Tests for whole-document dedupe (fingerprint + clone)."""
+
+import hashlib
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models import Document
+from app.services.doc_dedupe import (
+    clone_document_results,
+    current_pipeline_version,
+    find_ready_duplicate,
+    sha256_file,
+)
+
+
+def test_sha256_file_streams_whole_file(tmp_path):
+    data = b"%PDF-1.4 " * 300_000  # > one hash block
+    path = tmp_path / "a.pdf"
+    path.write_bytes(data)
+    assert sha256_file(str(path)) == hashlib.sha256(data).hexdigest()
+
+
+def test_pipeline_version_tracks_output_settings(monkeypatch):
+    before = current_pipeline_version()
+    monkeypatch.setattr(settings, "openai_embedding_model", "other-model")
+    assert current_pipeline_version() != before
+    monkeypatch.undo()
+    monkeypatch.setattr(settings, "max_chunks_per_doc", settings.max_chunks_per_doc + 1)
+    assert current_pipeline_version() != before
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+        class _Result:
+            rowcount = 3
+
+            def scalar_one_or_none(self):
+                return None
+
+        return _Result()
+
+
+async def test_duplicate_lookup_is_scoped_to_the_uploading_user():
+    doc = Document(id=uuid.uuid4(), user_id=uuid.uuid4(), content_sha256="ab" * 32, pipeline_version="v")
+    db = _RecordingSession()
+
+    assert await find_ready_duplicate(db, doc) is None
+    (stmt,) = db.statements
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "documents.user_id = %(user_id_1)s" in sql
+    assert stmt.compile().params["user_id_1"] == doc.user_id
+
+
+async def test_clone_is_set_based_and_copies_document_fields():
+    source = Document(id=uuid.uuid4(), page_count=4, jd_extraction_json={"role_title": "X"})
+    target = Document(id=uuid.uuid4())
+    db = _RecordingSession()
+
+    assert await clone_document_results(db, source, target) == 3
+    assert target.page_count == 4
+    assert target.jd_extraction_json == {"role_title": "X"}
+
+    delete_stmt, insert_stmt = db.statements
+    sql = str(insert_stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO document_chunks (document_id, chunk_index,")
+    assert "SELECT" in sql and "embedding" in sql
+    assert " id," not in sql.split("SELECT")[0]  # new rows get fresh ids
+    assert "created_at" not in sql
@@ -160,3 +160,104 @@ async def test_upload_local_creates_file(client, demo_key_off, use_local_storage
     from pathlib import Path
     path = Path(use_local_storage.get_path(s3_key))
     assert path.read_bytes() == pdf_content
+
+
+@pytest.mark.asyncio
+async def test_ingest_batch_queues_uploaded_and_skips_others(client, demo_key_off, monkeypatch):
+    """Batch ingest enqueues uploaded docs in one call and reports skipped ones."""
+    from app.db.base import async_session_maker
+    from app.models import Document, User
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    user_id = uuid.uuid4()
+    async with async_session_maker() as db:
+        db.add(User(id=user_id, email=f"{user_id}@t.local"))
+        await db.flush()
+        uploaded = [Document(user_id=user_id, filename=f"{i}.pdf", s3_key=f"k{i}", status="uploaded") for i in range(3)]
+        ready = Document(user_id=user_id, filename="r.pdf", s3_key="r", status="ready")
+        db.add_all([*uploaded, ready])
+        await db.commit()
+        ids = [str(d.id) for d in uploaded]
+        ready_id = str(ready.id)
+
+    missing = str(uuid.uuid4())
+    resp = await client.post(
+        "/documents/ingest-batch",
+        json={"user_id": str(user_id), "document_ids": [*ids, ready_id, missing]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["queued"] == 3
+    assert data["document_ids"] == ids
+    assert {s["document_id"] for s in data["skipped"]} == {ready_id, missing}
+
+    status = await client.post(
+        "/documents/ingest-batch/status",
+        json={"user_id": str(user_id), "document_ids": [*ids, ready_id]},
+    )
+    assert status.status_code == 200
+    assert status.json()["by_status"] == {"processing": 3, "ready": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_ingest_has_its_own_document_budget(client, demo_key_off, monkeypatch):
+    """Batches draw from INGEST_BATCH_DOCUMENTS_PER_DAY; one that doesn't fit is rejected whole."""
+    from app.db.base import async_session_maker
+    from app.models import Document, User
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "ingest_documents_per_day", 1)
+    monkeypatch.setattr(settings, "ingest_batch_documents_per_day", 3)
+    user_id = uuid.uuid4()
+    async with async_session_maker() as db:
+        db.add(User(id=user_id, email=f"{user_id}@t.local"))
+        await db.flush()
+        docs = [Document(user_id=user_id, filename=f"{i}.pdf", s3_key=f"b{i}", status="uploaded") for i in range(6)]
+        db.add_all(docs)
+        await db.commit()
+        ids = [str(d.id) for d in docs]
+
+    resp = await client.post(f"/documents/{ids[0]}/ingest", json={"user_id": str(user_id)})
+    assert resp.status_code == 200
+
+    # The single-ingest budget is spent; the batch budget is untouched
+    resp = await client.post("/documents/ingest-batch", json={"user_id": str(user_id), "document_ids": ids[1:3]})
+    assert resp.status_code == 200 and resp.json()["queued"] == 2
+
+    resp = await client.post("/documents/ingest-batch", json={"user_id": str(user_id), "document_ids": ids[3:]})
+    assert resp.status_code == 429
+    assert resp.json()["detail"]["remaining"] == 1
+    assert resp.json()["detail"]["limit"] == 3
+    assert "Retry-After" in resp.headers
+
+    status = await client.post(
+        "/documents/ingest-batch/status", json={"user_id": str(user_id), "document_ids": ids[3:]}
+    )
+    assert status.json()["by_status"] == {"uploaded": 3}
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_enqueue_gives_the_budget_back(client, demo_key_off, monkeypatch):
+    from app.core.rate_limit import consume_ingest_budget
+    from app.db.base import async_session_maker
+    from app.models import Document, User
+    from app.routers import documents
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "ingest_batch_documents_per_day", 2)
+    user_id = uuid.uuid4()
+    async with async_session_maker() as db:
+        db.add(User(id=user_id, email=f"{user_id}@t.local"))
+        await db.flush()
+        docs = [Document(user_id=user_id, filename=f"{i}.pdf", s3_key=f"f{i}", status="uploaded") for i in range(2)]
+        db.add_all(docs)
+        await db.commit()
+        ids = [str(d.id) for d in docs]
+
+    async def _fail(db, document_ids):
+        raise RuntimeError("queue unavailable")
+
+    monkeypatch.setattr(documents, "enqueue_ingestions", _fail)
+    with pytest.raises(RuntimeError):
+        await client.post("/documents/ingest-batch", json={"user_id": str(user_id), "document_ids": ids})
+    assert consume_ingest_budget(str(user_id), 0, batch=True) == (True, None, 2)
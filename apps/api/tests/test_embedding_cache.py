@@ -0,0 +1,57 @@
+"""Tests for embedding cache bookkeeping, and a hit/miss round trip on Postgres."""
+
+import uuid
+
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCacheStats, _unique_in_order, embed_with_cache
+from app.services.embedding_providers import get_embedding_provider
+
+
+def test_unique_in_order_sends_repeats_once():
+    texts = ["EEO statement", "Python skills", "EEO statement", "Benefits"]
+    hashes = ["h1", "h2", "h1", "h3"]
+    unique = _unique_in_order(texts, hashes)
+    assert list(unique) == ["h1", "h2", "h3"]
+    assert unique["h1"] == "EEO statement"
+
+
+def test_stats_hit_rate_and_savings():
+    stats = EmbeddingCacheStats(texts=10, deduped=2, hits=6, misses=2, api_calls=1, api_ms=400.0)
+    assert stats.hit_rate == 0.75
+    # 200 ms per embedded text; 6 hits + 2 in-call repeats avoided
+    assert stats.est_ms_saved == 1600.0
+    assert stats.to_dict()["hit_rate"] == 0.75
+
+
+def test_stats_empty():
+    stats = EmbeddingCacheStats()
+    assert stats.hit_rate == 0.0
+    assert stats.est_ms_saved == 0.0
+
+
+class _CountingEngine:
+    """Stands in for the embedding API: row i of a call is filled with its call-wide index."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        start = sum(len(c) for c in self.calls[:-1])
+        dim = get_embedding_provider().dim
+        return np.array([[float(start + i)] * dim for i in range(len(texts))], dtype=np.float32)
+
+
+async def test_misses_are_embedded_once_then_served_from_the_cache():
+    engine = _CountingEngine()
+    hashes = [uuid.uuid4().hex for _ in range(2)]
+    texts = ["first", "second", "first"]
+
+    first = await embed_with_cache(texts, [hashes[0], hashes[1], hashes[0]], engine=engine)
+    assert engine.calls == [["first", "second"]]
+    assert first[:, 0].tolist() == [0.0, 1.0, 0.0]
+
+    second = await embed_with_cache(["second", "first"], [hashes[1], hashes[0]], engine=engine)
+    assert len(engine.calls) == 1
+    assert second.dtype == np.float32 and second[:, 0].tolist() == [1.0, 0.0]
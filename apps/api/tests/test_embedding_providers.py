@@ -0,0 +1,111 @@
+"""Tests for embedding providers (selection and the local hashing backend)."""
+
+import base64
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import embedding_providers
+from app.services.embedding_providers import (
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    get_embedding_provider,
+)
+from app.services.embeddings import EmbeddingEngine
+
+
+def test_provider_selected_by_settings(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    assert isinstance(get_embedding_provider(), HashingEmbeddingProvider)
+    monkeypatch.setattr(settings, "embedding_provider", "openai")
+    assert isinstance(get_embedding_provider(), OpenAIEmbeddingProvider)
+    monkeypatch.setattr(settings, "embedding_provider", "nope")
+    with pytest.raises(ValueError, match="EMBEDDING_PROVIDER"):
+        get_embedding_provider()
+
+
+def test_hashing_vectors_are_deterministic_unit_and_full_size():
+    provider = HashingEmbeddingProvider()
+    texts = ["Build data pipelines in Python", "", "Python"]
+    a = provider.embed_texts(texts)
+    b = provider.embed_texts(texts)
+    assert a.shape == (3, settings.openai_embedding_dim)
+    assert np.array_equal(a, b)
+    assert np.allclose(np.linalg.norm(a, axis=1), 1.0, atol=1e-5)
+
+
+def test_hashing_similarity_tracks_overlap():
+    v = HashingEmbeddingProvider().embed_texts(
+        [
+            "Experience with Python and SQL for data pipelines",
+            "Python and SQL experience building data pipelines",
+            "Comprehensive dental and vision benefits package",
+        ]
+    )
+    assert v[0] @ v[1] > 0.5
+    assert v[0] @ v[1] > v[0] @ v[2] + 0.3
+
+
+def test_hashing_provider_needs_no_key(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    assert HashingEmbeddingProvider().is_configured()
+    assert not OpenAIEmbeddingProvider().is_configured()
+
+
+async def test_unconfigured_provider_503_names_its_requirement(client, monkeypatch):
+    monkeypatch.setattr(settings, "demo_key", None)
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    assert "OPENAI_API_KEY" in OpenAIEmbeddingProvider().not_configured_detail
+
+    class _KeyedProvider(HashingEmbeddingProvider):
+        def is_configured(self) -> bool:
+            return False
+
+    monkeypatch.setattr(settings, "embedding_provider", "keyed")
+    monkeypatch.setitem(embedding_providers._PROVIDERS, "keyed", _KeyedProvider)
+    body = {"user_id": str(uuid.uuid4()), "document_ids": [str(uuid.uuid4())]}
+    resp = await client.post("/documents/ingest-batch", json=body)
+    assert resp.status_code == 503
+    assert resp.json()["detail"] == "Embedding provider 'keyed' not configured"
+
+
+@pytest.mark.asyncio
+async def test_engine_uses_configured_provider(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    vectors = await EmbeddingEngine(max_inputs=2).embed(["a b c", "d e f", "g h i"])
+    expected = HashingEmbeddingProvider().embed_texts(["a b c", "d e f", "g h i"])
+    assert np.allclose(np.array(vectors, dtype=np.float32), expected)
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_decodes_base64_into_float32_matrix(monkeypatch):
+    vectors = np.random.default_rng(0).normal(size=(2, settings.openai_embedding_dim)).astype("<f4")
+    seen: dict = {}
+
+    class _Embeddings:
+        async def create(self, **kwargs):
+            seen.update(kwargs)
+            data = [
+                SimpleNamespace(index=i, embedding=base64.b64encode(vectors[i].tobytes()).decode())
+                for i in (1, 0)  # out of order
+            ]
+            return SimpleNamespace(data=data)
+
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(embedding_providers, "get_openai_client", lambda: SimpleNamespace(embeddings=_Embeddings()))
+    out = await OpenAIEmbeddingProvider().embed_batch(["a", "b"])
+    assert seen["encoding_format"] == "base64"
+    assert out.dtype == np.float32 and np.array_equal(out, vectors)
+
+
+@pytest.mark.asyncio
+async def test_engine_embed_matrix_matches_embed(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    texts = ["a b c", "d e f", "g h i"]
+    engine = EmbeddingEngine(max_inputs=2)
+    matrix = await engine.embed_matrix(texts)
+    assert matrix.dtype == np.float32 and matrix.shape == (3, settings.openai_embedding_dim)
+    assert np.array_equal(matrix, np.array(await engine.embed(texts), dtype=np.float32))
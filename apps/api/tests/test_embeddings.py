@@ -0,0 +1,144 @@
+"""Unit tests for the batched embedding engine."""
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from app.services.embeddings import (
+    CoalescingEmbeddingEngine,
+    EmbeddingEngine,
+    estimate_tokens,
+    pack_batches,
+    shorten_embeddings,
+)
+
+
+def test_pack_batches_respects_input_cap():
+    texts = ["short text"] * 10
+    batches = pack_batches(texts, max_tokens=10_000, max_inputs=4)
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [i for b in batches for i in b] == list(range(10))
+
+
+def test_pack_batches_respects_token_budget():
+    texts = ["x" * 300] * 6  # ~101 estimated tokens each
+    budget = estimate_tokens(texts[0]) * 2
+    batches = pack_batches(texts, max_tokens=budget, max_inputs=100)
+    assert all(len(b) <= 2 for b in batches)
+    assert sum(len(b) for b in batches) == 6
+
+
+def test_pack_batches_oversized_text_gets_own_batch():
+    texts = ["a", "x" * 10_000, "b"]
+    batches = pack_batches(texts, max_tokens=50, max_inputs=100)
+    assert batches == [[0], [1], [2]]
+
+
+def test_shorten_embeddings_truncates_and_renormalises():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(3, 1536)).tolist()
+    short = shorten_embeddings(vectors, dim=256)
+    assert len(short) == 3 and all(len(v) == 256 for v in short)
+    assert np.allclose(np.linalg.norm(short, axis=1), 1.0, atol=1e-6)
+    # Same direction as the prefix
+    prefix = np.asarray(vectors[0][:256])
+    assert np.allclose(np.asarray(short[0]), prefix / np.linalg.norm(prefix), atol=1e-6)
+
+
+def test_shorten_embeddings_keeps_zero_prefix():
+    short = shorten_embeddings([[0.0] * 256 + [1.0] * 10], dim=256)
+    assert short == [[0.0] * 256]
+
+
+@pytest.mark.asyncio
+async def test_engine_preserves_order_under_concurrency():
+    """Batches finish out of order; results still line up with inputs."""
+    rng = random.Random(1)
+
+    async def _fake(texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(rng.random() / 100)
+        return [[float(t)] for t in texts]
+
+    texts = [str(i) for i in range(50)]
+    engine = EmbeddingEngine(_fake, max_tokens=10_000, max_inputs=3, concurrency=4)
+    vectors = await engine.embed(texts)
+    assert vectors == [[float(i)] for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_engine_bounds_in_flight_batches():
+    in_flight = 0
+    peak = 0
+
+    async def _fake(texts: list[str]) -> list[list[float]]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return [[0.0] for _ in texts]
+
+    engine = EmbeddingEngine(_fake, max_tokens=10_000, max_inputs=1, concurrency=3)
+    await engine.embed(["t"] * 12)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_empty_input_makes_no_calls():
+    async def _fail(texts: list[str]) -> list[list[float]]:
+        raise AssertionError("should not be called")
+
+    assert await EmbeddingEngine(_fail).embed([]) == []
+    for engine in (EmbeddingEngine(_fail), CoalescingEmbeddingEngine(_fail)):
+        empty = await engine.embed_matrix([])
+        assert empty.shape == (0, engine.dim) and empty.dtype == np.float32
+
+
+@pytest.mark.asyncio
+async def test_coalescing_engine_merges_concurrent_callers():
+    calls: list[list[str]] = []
+
+    async def _fake(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(t)] for t in texts]
+
+    engine = CoalescingEmbeddingEngine(_fake, max_inputs=100, concurrency=1, window_ms=20)
+    a, b = await asyncio.gather(engine.embed(["1", "2"]), engine.embed(["3"]))
+    assert a == [[1.0], [2.0]]
+    assert b == [[3.0]]
+    assert calls == [["1", "2", "3"]]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_engine_flushes_when_full_and_propagates_errors():
+    async def _fail(texts: list[str]) -> list[list[float]]:
+        raise RuntimeError("api down")
+
+    engine = CoalescingEmbeddingEngine(_fail, max_inputs=2, concurrency=1, window_ms=10_000)
+    results = await asyncio.wait_for(
+        asyncio.gather(engine.embed(["a"]), engine.embed(["b"]), return_exceptions=True),
+        timeout=1,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_coalescing_engine_cancels_callers_when_the_flush_is_cancelled():
+    started = asyncio.Event()
+
+    async def _slow(texts: list[str]) -> list[list[float]]:
+        started.set()
+        await asyncio.sleep(60)
+        return [[0.0] for _ in texts]
+
+    engine = CoalescingEmbeddingEngine(_slow, max_inputs=100, concurrency=1, window_ms=10_000)
+    callers = [asyncio.ensure_future(engine.embed(["a"])), asyncio.ensure_future(engine.embed(["b"]))]
+    await asyncio.sleep(0)
+    engine._flush()
+    await started.wait()
+    (flush,) = engine._inflight
+    flush.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1)
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
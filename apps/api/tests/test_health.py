@@ -22,6 +22,7 @@ async def test_health_response_structure(client):
     """Health response has expected structure."""
     resp = await client.get("/health")
     data = resp.json()
+    assert "pdf_pool" in data
     if resp.status_code == 200:
         assert data["status"] == "ok"
         assert data["database"] == "connected"
@@ -0,0 +1,105 @@
+"""Tests for the overlapped extract -> chunk -> embed -> write pipeline."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.services import ingest_pipeline
+from app.services.chunk_sync import META_FIELDS, chunk_row_values
+from app.services.ingest_pipeline import run_ingest_pipeline
+from app.services.jd_chunking import chunk_jd_pages
+
+SECTION = """
+{title}
+
+• Build data pipelines in Python and SQL for analytics team number {n}
+• Own deployment of machine learning models to production for group {n}
+"""
+TITLES = ["Responsibilities", "Qualifications", "Benefits", "About the Role", "Requirements"]
+PAGES = [(i + 1, SECTION.format(title=t, n=i)) for i, t in enumerate(TITLES)]
+
+
+async def _parts(pages, per_part=2):
+    for i in range(0, len(pages), per_part):
+        await asyncio.sleep(0)
+        yield pages[i : i + per_part]
+
+
+@pytest.fixture
+def events(monkeypatch):
+    log: list[tuple[str, int]] = []
+
+    async def _embed(texts, hashes, engine=None):
+        log.append(("embed", len(texts)))
+        await asyncio.sleep(0.01)
+        return [[0.0] * 3 for _ in texts]
+
+    async def _insert(db, document_id, batch):
+        assert batch.embeddings.shape == (len(batch), 3)
+        log.append(("write", len(batch)))
+        return len(batch)
+
+    monkeypatch.setattr(ingest_pipeline, "embed_with_cache", _embed)
+    monkeypatch.setattr(ingest_pipeline, "insert_chunk_rows", _insert)
+    return log
+
+
+async def test_all_chunks_embedded_and_written_in_batches(events):
+    expected = chunk_jd_pages(PAGES, min_chars=25)
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _parts(PAGES), [], min_chars=25, max_chunks=300,
+        batch_size=2, queue_size=1, embed_workers=1,
+    )
+    assert run.pages == len(PAGES)
+    assert run.chunks == len(expected)
+    assert run.plan.inserts == list(range(len(expected)))
+    assert run.jd_struct is not None
+    writes = [n for kind, n in events if kind == "write"]
+    assert sum(writes) == len(expected) and max(writes) <= 2
+    # Writing starts before the last embedding batch is requested
+    first_write = events.index(("write", writes[0]))
+    last_embed = max(i for i, (kind, _) in enumerate(events) if kind == "embed")
+    assert first_write < last_embed
+
+
+async def test_chunks_are_embedded_before_the_last_page_arrives(events):
+    async def _logged_parts():
+        for page in PAGES:
+            events.append(("page", page[0]))
+            await asyncio.sleep(0.005)
+            yield [page]
+
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _logged_parts(), [], min_chars=25, max_chunks=300,
+        batch_size=1, queue_size=1, embed_workers=1,
+    )
+    assert run.chunks == len(chunk_jd_pages(PAGES, min_chars=25))
+    first_embed = next(i for i, (kind, _) in enumerate(events) if kind == "embed")
+    assert first_embed < events.index(("page", len(PAGES)))
+
+
+async def test_unchanged_rows_are_not_reembedded_and_leftovers_deleted(events):
+    new_rows = [chunk_row_values(cr, i) for i, cr in enumerate(chunk_jd_pages(PAGES, min_chars=25))]
+    existing = [
+        {"id": uuid.uuid4(), "content_hash": r["content_hash"], **{f: r[f] for f in META_FIELDS}}
+        for r in new_rows
+    ]
+    stale = {**existing[0], "id": uuid.uuid4(), "content_hash": "gone", "chunk_index": 99}
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _parts(PAGES), existing + [stale], min_chars=25, max_chunks=300,
+    )
+    assert events == []
+    assert run.plan.kept == len(new_rows)
+    assert run.plan.deletes == [stale["id"]]
+
+
+async def test_stage_error_propagates_unwrapped(monkeypatch, events):
+    async def _short(texts, hashes, engine=None):
+        return []
+
+    monkeypatch.setattr(ingest_pipeline, "embed_with_cache", _short)
+    with pytest.raises(RuntimeError, match="Embedding count mismatch"):
+        await run_ingest_pipeline(
+            None, uuid.uuid4(), _parts(PAGES), [], min_chars=25, max_chunks=300, batch_size=2,
+        )
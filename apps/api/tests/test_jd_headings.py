@@ -0,0 +1,72 @@
+"""Indexed heading matcher must agree with the original linear alias scan."""
+
+import random
+import re
+
+import pytest
+
+from app.services.jd_sections import JD_SECTION_ALIASES, _match_section_heading
+
+
+def _reference_match(line: str) -> str | None:
+    """The original implementation, kept verbatim as the oracle."""
+    t = line.strip().lower()
+    t = re.sub(r"[^\w\s&]", "", t)
+    norm = re.sub(r"\s+", " ", t).strip()
+    if not norm or len(norm) > 60:
+        return None
+    if norm in JD_SECTION_ALIASES:
+        return JD_SECTION_ALIASES[norm]
+    stripped_len = len(line.strip())
+    if norm.startswith("salary") and stripped_len < 60:
+        return "compensation"
+    if stripped_len > 35:
+        return None
+    words = norm.split()
+    first = words[0] if words else ""
+    if first in ("remote", "hybrid") and stripped_len > 15:
+        return None
+    for alias, canonical in JD_SECTION_ALIASES.items():
+        if alias == first or alias.startswith(first + " "):
+            return canonical
+        if len(alias) <= len(norm) and norm.startswith(alias):
+            return canonical
+    return None
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "About Us:",
+        "ABOUT THE ROLE",
+        "Key Responsibilities",
+        "What You'll Do",
+        "Tools & Technologies",
+        "Salary Range: $100k - $150k depending on experience",
+        "Remote - US. Some travel required.",
+        "Hybrid",
+        "Payroll",
+        "Preferred skills",
+        "Company culture",
+        "Summary of benefits and perks offered",
+        "---",
+        "",
+    ],
+)
+def test_matches_reference_on_headings(line):
+    assert _match_section_heading(line) == _reference_match(line)
+
+
+def test_matches_reference_on_random_lines():
+    rng = random.Random(18)
+    words = [w for alias in JD_SECTION_ALIASES for w in alias.split()]
+    words += ["engineer", "data", "the", "us", "payroll", "sal", "tool", "&", "-", ":", "You'll", "Full-Time"]
+    for _ in range(20000):
+        tokens = [rng.choice(words) for _ in range(rng.randint(1, 8))]
+        if rng.random() < 0.3:
+            tokens[0] = tokens[0][: rng.randint(1, len(tokens[0]))]  # partial first word
+        line = rng.choice([" ", "  ", " - "]).join(tokens)
+        if rng.random() < 0.5:
+            line = line.title()
+        line += rng.choice(["", ":", " :", "."])
+        assert _match_section_heading(line) == _reference_match(line), line
@@ -10,8 +10,8 @@ Uses synthetic JDs: Thermo Fisher–style and a differently formatted JD.
 
 import pytest
 
-from app.services.jd_chunking import chunk_jd_pages, JDChunkResult, JD_DOMAIN
-from app.services.jd_extraction import extract_jd_struct
+from app.services.jd_chunking import chunk_jd_pages, iter_jd_chunks, JDChunkResult, JDChunkStream, JD_DOMAIN
+from app.services.jd_extraction import extract_jd_fields, extract_jd_struct, extract_scanned_fields, parse_jd
 from app.services.jd_sections import normalize_jd_text, sectionize_jd_text
 
 
@@ -251,3 +251,32 @@ def test_bullets_not_broken_across_chunks():
     for c in resp_chunks:
         # Should see full bullets, not cut mid-sentence
         assert "•" in c.content or "-" in c.content or len(c.content) > 50
+
+
+def test_shared_parse_matches_per_stage_parse():
+    """One ParsedJD feeds extraction and chunking with the same results as parsing per stage."""
+    page_texts = [(1, THERMO_FISHER_JD), (2, STARTUP_JD)]
+    parsed = parse_jd("\n\n".join(t for _, t in page_texts))
+    assert parsed.line_offsets[1] == len(parsed.lines[0]) + 1
+    assert extract_jd_fields(parsed) == extract_jd_struct("\n\n".join(t for _, t in page_texts))
+    assert list(iter_jd_chunks(page_texts, parsed=parsed)) == chunk_jd_pages(page_texts)
+
+
+def test_chunk_stream_matches_whole_document():
+    """Pages fed one at a time give the same chunks and the same extraction as the whole document."""
+    page_texts = [(1, THERMO_FISHER_JD), (2, STARTUP_JD)]
+    stream = JDChunkStream(scan_fields=True)
+    chunks = [c for n, t in page_texts for c in stream.feed(n, t)] + stream.finish()
+    assert chunks == chunk_jd_pages(page_texts)
+    assert extract_scanned_fields(stream.fields) == extract_jd_struct("\n\n".join(t for _, t in page_texts))
+
+
+def test_iter_jd_chunks_yields_before_reading_every_page():
+    """Closed sections are chunked without waiting for later pages."""
+    def _pages():
+        yield 1, STARTUP_JD
+        yield 2, THERMO_FISHER_JD
+        raise AssertionError("read past the second page")
+
+    first = next(iter_jd_chunks(_pages()))
+    assert first == chunk_jd_pages([(1, STARTUP_JD)])[0]
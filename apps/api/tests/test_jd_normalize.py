@@ -0,0 +1,160 @@
+"""normalize_jd_text must stay byte-identical to the original multi-pass version, fed whole or in pieces;
+the streaming field scan must extract what the whole-text extraction does."""
+
+import random
+import re
+
+import pytest
+
+from app.services import jd_extraction, jd_sections
+from app.services.jd_extraction import _SEARCHES, JDFieldScan, _FirstSearch, extract_jd_struct, extract_scanned_fields
+from app.services.jd_sections import JDSectionStream, _NormalizeStream, normalize_jd_text, sectionize_jd_text
+from tests.test_jd_ingestion import STARTUP_JD, THERMO_FISHER_JD
+
+
+def _reference_normalize(text: str) -> str:
+    """The original implementation, kept verbatim as the oracle."""
+    if not text:
+        return ""
+    t = text.replace("\u00a0", " ")
+    t = t.replace("Â", "")
+    t = t.replace("â€¢", "•")
+    t = t.replace("â¢", "•")
+    t = t.replace("ΓÇó", "•")
+    t = re.sub(r"â¢|â€¢|ΓÇó", "•", t)
+    t = re.sub(r"[ \t]+", " ", t)
+    t = re.sub(r"\n{3,}", "\n\n", t)
+    t = re.sub(r"^\s*[•\-*]\s+", "• ", t, flags=re.MULTILINE)
+    t = re.sub(r"^\s*[•‣]\s+", "• ", t, flags=re.MULTILINE)
+    t = re.sub(r"(?m)^\s*Page\s+\d+\s+of\s+\d+\s*$", "", t)
+    t = re.sub(r"(?m)^\s*\d+\s*$", "", t)
+    t = re.sub(r"\n{3,}", "\n\n", t)
+    return t.strip()
+
+
+# Every character class the passes care about, plus multi-char tokens they match
+_PIECES = [
+    " ", "\t", "\n", "\n", "\n", "\r", "\f", "\v", "\u00a0", "Â", "â", "€", "¢", "Γ", "Ç", "ó",
+    "•", "‣", "-", "*", "Page", " of ", "Page 1 of 2", "Page 12 of 3 ", "1", "23", " 7 ",
+    "\n\n\n", "x", "ab", "â€¢", "âÂ¢",
+]
+# Line-sized pieces so streams find breaks they can cut at
+_LINES = ["Responsibilities", "Build things.", "team number 0", "Page", "3 of 5", "of", "Page 2", "foo)", "About Us"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        THERMO_FISHER_JD,
+        STARTUP_JD,
+        "Respâ€¢ one\nΓÇó two\n\n\n\nPage 3 of 9\n  12  \n‣ three",
+        "-\n‣ a\n\n* b\n\u00a0\u00a0\t- c\n\n\n\n4\n",
+    ],
+)
+def test_matches_reference_on_documents(text):
+    assert normalize_jd_text(text) == _reference_normalize(text)
+
+
+def test_matches_reference_on_random_text():
+    rng = random.Random(17)
+    for _ in range(20000):
+        text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 25)))
+        assert normalize_jd_text(text) == _reference_normalize(text), repr(text)
+
+
+def _split(text: str, rng: random.Random) -> list[str]:
+    cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 6)))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_stream_matches_whole_text_under_any_split():
+    rng = random.Random(23)
+    for _ in range(20000):
+        text = "".join(rng.choice(_PIECES + _LINES) + rng.choice(["", "\n"]) for _ in range(rng.randint(0, 25)))
+        stream = _NormalizeStream()
+        segments = [seg for piece in _split(text, rng) for seg in stream.feed(piece)] + stream.finish()
+        assert "\n".join(segments) == normalize_jd_text(text), repr(text)
+
+
+@pytest.mark.parametrize("text", [THERMO_FISHER_JD, STARTUP_JD])
+def test_section_stream_matches_sectionize(text):
+    segments: list[str] = []
+    stream = JDSectionStream(on_text=segments.append)
+    sections = [s for line in text.splitlines(keepends=True) for s in stream.feed(line)]
+    sections += stream.finish()
+    assert "\n".join(segments) == normalize_jd_text(text)
+    assert sections == sectionize_jd_text(normalize_jd_text(text))
+
+
+def test_stream_buffer_is_capped_without_safe_breaks(monkeypatch):
+    monkeypatch.setattr(jd_sections, "MAX_NORMALIZE_BUFFER", 64)
+    stream = _NormalizeStream()
+    segments = []
+    for _ in range(200):
+        segments += stream.feed("\u2022\n")  # bullet-only lines never give a safe break
+        assert len(stream._buf) < 64 + 2
+    segments += stream.finish()
+    assert segments and "".join(segments).replace("\n", "").strip("\u2022 ") == ""
+
+    stream = _NormalizeStream()
+    for _ in range(200):
+        stream.feed("word ")  # one huge line
+        assert len(stream._buf) < 64 + 5
+
+
+# Text the extraction searches care about, so fuzzed documents hit them
+_FIELD_LINES = [
+    "Acme Robotics Inc.", "Senior ML Engineer", "Job Summary", "Requirements", "Qualifications",
+    "Tools & Technologies", "Location", "Preferred Qualifications", "Compensation",
+    "$120,000 - $150,000 per year", "$90,000 to", "$95,000", "100k - 140k USD", "5+ years of", "experience",
+    "3 years exp", "Bachelor's degree in Computer Science", "MBA", "Austin, TX", "Remote", "hybrid",
+    "• Python, SQL, AWS", "• Azure and GCP", "Kubernetes, Docker", "Page 1 of 2", "7", "", "",
+]
+
+
+def test_search_char_classes_cover_every_match():
+    """Each search's barrier class matches every char its pattern consumed (what _FirstSearch relies on)."""
+    rng = random.Random(31)
+    texts = [THERMO_FISHER_JD, STARTUP_JD] + [
+        "\n".join(rng.choice(_FIELD_LINES) for _ in range(rng.randint(1, 30))) for _ in range(2000)
+    ]
+    for text in texts:
+        for name, (pattern, chars) in _SEARCHES.items():
+            for m in pattern.finditer(text):
+                assert all(chars.fullmatch(c) for c in m.group(0)), (name, m.group(0))
+
+
+def test_first_search_matches_whole_text_search_under_any_split():
+    rng = random.Random(37)
+    for _ in range(3000):
+        text = "\n".join(rng.choice(_FIELD_LINES + _LINES) for _ in range(rng.randint(0, 30)))
+        for pattern, chars in _SEARCHES.values():
+            search = _FirstSearch(pattern, chars)
+            for piece in _split(text, rng):
+                search.feed(piece)
+            m = pattern.search(text)
+            assert search.finish() == (m.group(0) if m else None), repr(text)
+
+
+def test_first_search_tail_is_capped(monkeypatch):
+    monkeypatch.setattr(jd_extraction, "MAX_SEARCH_TAIL", 32)
+    pattern, chars = _SEARCHES["education"]
+    search = _FirstSearch(pattern, chars)
+    for _ in range(100):
+        search.feed("plain words ")
+        assert len(search._tail) <= 32
+
+
+def test_field_scan_matches_whole_text_extraction_under_any_split():
+    rng = random.Random(41)
+    docs = [THERMO_FISHER_JD, STARTUP_JD] + [
+        "\n".join(rng.choice(_FIELD_LINES + _LINES) for _ in range(rng.randint(0, 40))) for _ in range(500)
+    ]
+    for text in docs:
+        scan = JDFieldScan()
+        stream = JDSectionStream(on_text=scan.feed)
+        sections = [s for piece in _split(text, rng) for s in stream.feed(piece)] + stream.finish()
+        for section_type, content in sections:
+            scan.add_section(section_type, content, lambda c=content: jd_extraction._extract_skills_from_text(c))
+        assert extract_scanned_fields(scan) == extract_jd_struct(text), repr(text)
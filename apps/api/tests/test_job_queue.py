@@ -0,0 +1,183 @@
+"""Tests for the ingestion job queue: pure helpers, then claim/lease behaviour on Postgres."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql
+
+from app import worker
+from app.core.config import settings
+from app.db.base import async_session_maker
+from app.models import Document, IngestionJob, User
+from app.services.embeddings import CoalescingEmbeddingEngine
+from app.services.job_queue import (
+    backoff_seconds,
+    claim_next_job,
+    claim_statement,
+    complete_job,
+    enqueue_ingestion,
+    fail_job,
+    heartbeat,
+    release_job,
+)
+
+
+def test_backoff_doubles_and_caps():
+    assert backoff_seconds(1, base=5, cap=600) == 5
+    assert backoff_seconds(2, base=5, cap=600) == 10
+    assert backoff_seconds(4, base=5, cap=600) == 40
+    assert backoff_seconds(20, base=5, cap=600) == 600
+
+
+def test_concurrent_worker_coalesces_embeddings(monkeypatch):
+    assert worker.worker_engine(1) is None
+    assert isinstance(worker.worker_engine(4), CoalescingEmbeddingEngine)
+    monkeypatch.setattr(settings, "worker_coalesce_ms", 0)
+    assert worker.worker_engine(4) is None
+
+
+async def test_worker_jobs_run_on_the_shared_engine(monkeypatch):
+    engines = []
+
+    async def _run_ingestion(document_id, raise_errors=False, engine=None):
+        engines.append(engine)
+
+    async def _complete(db, job_id, worker_id):
+        pass
+
+    monkeypatch.setattr(worker, "run_ingestion", _run_ingestion)
+    monkeypatch.setattr(worker, "complete_job", _complete)
+    engine = worker.worker_engine(2)
+    jobs = [worker.ClaimedJob(uuid.uuid4(), uuid.uuid4(), 1, 5) for _ in range(2)]
+    await asyncio.gather(*(worker._process(job, "w", engine) for job in jobs))
+    assert engines == [engine, engine]
+
+
+def test_claim_uses_skip_locked_and_reclaims_expired_leases():
+    sql = str(claim_statement("host:1:0", 120).compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "LIMIT" in sql
+    assert "lease_expires_at <" in sql
+    assert "RETURNING" in sql
+    assert "attempts=(ingestion_jobs.attempts +" in sql.replace(" = ", "=")
+    assert "ingestion_jobs.attempts < ingestion_jobs.max_attempts" in sql
+
+
+# --- Against the database (needs a migrated DATABASE_URL, like the route tests) ---
+
+# Test jobs run_after this epoch-era window so they sort ahead of any real work
+_TEST_RUN_AFTER = datetime(1970, 1, 1)
+
+
+@pytest.fixture
+async def queued_jobs():
+    """Three documents of a throwaway user, each with one queued job. Yields [(job_id, doc_id)]."""
+    async with async_session_maker() as db:
+        await db.execute(delete(IngestionJob).where(IngestionJob.run_after < datetime(1971, 1, 1)))
+        user = User(email=f"queue-{uuid.uuid4().hex[:8]}@t.local")
+        db.add(user)
+        await db.flush()
+        jobs = []
+        for i in range(3):
+            doc = Document(user_id=user.id, filename=f"q{i}.pdf", s3_key=f"q{i}", status="processing")
+            db.add(doc)
+            await db.flush()
+            job_id = await enqueue_ingestion(db, doc.id)
+            await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == job_id)
+                .values(run_after=_TEST_RUN_AFTER + timedelta(seconds=i), max_attempts=2)
+            )
+            jobs.append((job_id, doc.id))
+        await db.commit()
+        user_id = user.id
+    yield jobs
+    async with async_session_maker() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def _job(job_id):
+    async with async_session_maker() as db:
+        return await db.get(IngestionJob, job_id)
+
+
+async def _claim(worker_id: str):
+    async with async_session_maker() as db:
+        return await claim_next_job(db, worker_id)
+
+
+async def _expire_lease(job_id) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id)
+            .values(lease_expires_at=func.now() - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+async def test_claim_heartbeat_and_complete(queued_jobs):
+    job_id, _ = queued_jobs[0]
+    job = await _claim("w1")
+    assert job.id == job_id and job.attempts == 1
+    async with async_session_maker() as db:
+        assert await heartbeat(db, job.id, "w1") is True
+        assert await heartbeat(db, job.id, "w2") is False
+        await complete_job(db, job.id, "w1")
+    row = await _job(job_id)
+    assert row.status == "succeeded" and row.locked_by is None
+
+
+async def test_concurrent_claimers_get_different_jobs(queued_jobs):
+    claimed = await asyncio.gather(_claim("w1"), _claim("w2"))
+    ids = {j.id for j in claimed}
+    assert ids == {queued_jobs[0][0], queued_jobs[1][0]}
+
+
+async def test_fail_requeues_with_backoff_then_fails_permanently(queued_jobs):
+    job_id, _ = queued_jobs[0]
+    job = await _claim("w1")
+    async with async_session_maker() as db:
+        assert await fail_job(db, job, "w1", "boom") is True
+    row = await _job(job_id)
+    assert row.status == "queued" and row.last_error == "boom"
+    async with async_session_maker() as db:
+        assert await db.scalar(select(IngestionJob.run_after > func.now()).where(IngestionJob.id == job_id))
+
+    async with async_session_maker() as db:
+        await db.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(run_after=_TEST_RUN_AFTER))
+        await db.commit()
+    job = await _claim("w1")
+    assert job.id == job_id and job.attempts == 2
+    async with async_session_maker() as db:
+        assert await fail_job(db, job, "w1", "boom again") is False
+    assert (await _job(job_id)).status == "failed"
+
+
+async def test_release_hands_job_back_without_counting_the_attempt(queued_jobs):
+    job = await _claim("w1")
+    async with async_session_maker() as db:
+        await release_job(db, job, "w1")
+    row = await _job(job.id)
+    assert row.status == "queued" and row.attempts == 0 and row.locked_by is None
+
+
+async def test_expired_lease_is_reclaimed_until_attempts_run_out(queued_jobs):
+    job_id, doc_id = queued_jobs[0]
+    first = await _claim("w1")
+    await _expire_lease(job_id)
+    second = await _claim("w2")
+    assert second.id == job_id and second.attempts == 2
+
+    # The worker dies again on its last attempt: the job and document fail, not retried
+    await _expire_lease(job_id)
+    third = await _claim("w3")
+    assert third is None or third.id != job_id
+    row = await _job(job_id)
+    assert first.attempts == 1 and row.status == "failed" and row.locked_by is None
+    async with async_session_maker() as db:
+        assert (await db.get(Document, doc_id)).status == "failed"
@@ -0,0 +1,59 @@
+"""The NumPy _mmr_select must pick the same chunks, in the same order, as the original loop."""
+
+import numpy as np
+import pytest
+
+from app.services.retrieval import _mmr_select
+
+
+def _reference_mmr(candidates: list[dict], top_k: int, lambda_: float) -> list[dict]:
+    """The original pure-Python implementation, kept as the oracle."""
+    if len(candidates) <= top_k:
+        return candidates[:top_k]
+    selected: list[dict] = []
+    remaining = list(candidates)
+    while len(selected) < top_k and remaining:
+        best_idx = -1
+        best_mmr = float("-inf")
+        for i, c in enumerate(remaining):
+            max_sim_sel = 0.0
+            for s in selected:
+                max_sim_sel = max(max_sim_sel, sum(x * y for x, y in zip(c["embedding"], s["embedding"])))
+            mmr = lambda_ * c["score"] - (1 - lambda_) * max_sim_sel
+            if mmr > best_mmr:
+                best_mmr = mmr
+                best_idx = i
+        selected.append(remaining.pop(best_idx))
+    return selected
+
+
+def _candidates(rng: np.random.Generator, n: int, dim: int, exact: bool) -> list[dict]:
+    if exact:
+        # Multiples of 1/8 keep every dot product exact, so ties really are ties
+        vectors = rng.integers(-2, 3, size=(n, dim)).astype(np.float32) / 8
+        vectors[n // 2 :] = vectors[: n - n // 2]  # duplicate rows
+        scores = rng.integers(0, 4, size=n) / 4
+    else:
+        vectors = rng.normal(size=(n, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = np.round(rng.uniform(0.2, 0.9, size=n), 6)
+    return [
+        {"chunk_id": str(i), "score": float(scores[i]), "embedding": vectors[i]} for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@pytest.mark.parametrize("lambda_", [0.0, 0.3, 0.7, 1.0])
+def test_matches_reference_selection(exact, lambda_):
+    rng = np.random.default_rng(7)
+    for n, top_k in [(50, 8), (12, 5), (9, 8), (20, 1)]:
+        candidates = _candidates(rng, n, 32, exact)
+        expected = [c["chunk_id"] for c in _reference_mmr([dict(c) for c in candidates], top_k, lambda_)]
+        got = _mmr_select([dict(c) for c in candidates], [], top_k, lambda_)
+        assert [c["chunk_id"] for c in got] == expected
+        assert all("embedding" not in c for c in got)
+
+
+def test_fewer_candidates_than_top_k_are_returned_as_is():
+    candidates = [{"chunk_id": "a", "score": 0.1, "embedding": [1.0, 0.0]}]
+    assert _mmr_select(candidates, [], 3, 0.7) == [{"chunk_id": "a", "score": 0.1}]
@@ -0,0 +1,288 @@
+"""Tests for MinHash/LSH near-duplicate signatures and their use in the ingest pipeline."""
+
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import delete
+
+from app.db.base import async_session_maker
+from app.models import Document, DocumentChunk, User
+from app.services import ingest_pipeline
+from app.services.chunk_batch import ChunkBatch
+from app.services.chunk_sync import META_FIELDS, ChunkSyncPlanner, chunk_row_values, resolve_boilerplate
+from app.services.doc_dedupe import current_pipeline_version
+from app.services.ingest_pipeline import run_ingest_pipeline
+from app.services.jd_chunking import chunk_jd_pages
+from app.services.near_dup import (
+    BANDS,
+    NUM_PERM,
+    NearDupMatch,
+    _shingles,
+    estimate_similarity,
+    find_near_duplicates,
+    lsh_bands,
+    minhash_signature,
+    signature_columns,
+)
+
+EEO = (
+    "{company} is an equal opportunity employer. We do not discriminate on the basis of race, "
+    "religion, color, national origin, gender, sexual orientation, age, marital status, veteran "
+    "status, or disability status. All qualified applicants will receive consideration for employment."
+)
+OTHER = "Design and build batch and streaming data pipelines in Python, SQL and Spark with the analytics team."
+
+
+def _jaccard(a: str, b: str) -> float:
+    sa, sb = _shingles(a), _shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def test_signature_is_deterministic_and_compact():
+    sig = signature_columns(EEO.format(company="Acme"))
+    assert sig == signature_columns(EEO.format(company="Acme"))
+    assert len(sig["minhash"]) == NUM_PERM * 4
+    assert len(sig["minhash_bands"]) == BANDS
+    assert all(-(2**63) <= k < 2**63 for k in sig["minhash_bands"])
+
+
+def test_similarity_estimates_jaccard():
+    a, b = EEO.format(company="Acme Inc"), EEO.format(company="Globex Corp")
+    sa, sb, so = (signature_columns(t)["minhash"] for t in (a, b, OTHER))
+    assert estimate_similarity(sa, sa) == 1.0
+    assert abs(estimate_similarity(sa, sb) - _jaccard(a, b)) < 0.15
+    assert estimate_similarity(sa, so) < 0.1
+
+
+def test_near_duplicates_share_a_band_and_unrelated_text_does_not():
+    a = set(signature_columns(EEO.format(company="Acme Inc"))["minhash_bands"])
+    b = set(signature_columns(EEO.format(company="Globex Corp"))["minhash_bands"])
+    o = set(signature_columns(OTHER)["minhash_bands"])
+    assert a & b
+    assert not a & o
+
+
+def test_band_keys_depend_on_band_position():
+    sig = minhash_signature(OTHER)
+    sig[:] = sig[0]  # every band has identical rows
+    assert len(set(lsh_bands(sig))) == BANDS
+
+
+def test_short_and_empty_text():
+    assert estimate_similarity(signature_columns("")["minhash"], signature_columns("")["minhash"]) == 1.0
+    assert signature_columns("Python SQL")["minhash"] != signature_columns("")["minhash"]
+
+
+def test_planner_keeps_boilerplate_low_signal_and_backfills_signatures():
+    row = chunk_row_values(chunk_jd_pages([(1, "Benefits\n\n" + EEO.format(company="Acme"))], min_chars=25)[0], 0)
+    old = {
+        "id": uuid.uuid4(),
+        "content_hash": row["content_hash"],
+        **{f: row[f] for f in META_FIELDS},
+        "is_low_signal": True,
+        "is_boilerplate": True,
+        "has_minhash": False,
+    }
+    planner = ChunkSyncPlanner([old])
+    assert planner.add(0, row) is False
+    plan = planner.finish()
+    [update] = plan.updates
+    assert "is_low_signal" not in update
+    assert update["minhash"] == signature_columns(row["content"])["minhash"]
+    assert resolve_boilerplate(plan, [True]) == 0
+    assert "is_boilerplate" not in update
+
+
+def test_resolve_boilerplate_clears_rows_that_no_longer_qualify():
+    rows = [
+        chunk_row_values(c, i)
+        for i, c in enumerate(chunk_jd_pages([(1, "Benefits\n\n" + EEO.format(company="Acme"))], min_chars=25))
+    ]
+    old = [{"id": uuid.uuid4(), "content_hash": r["content_hash"], **{f: r[f] for f in META_FIELDS}} for r in rows]
+    for o in old:
+        o.update(is_low_signal=True, is_boilerplate=True)
+    planner = ChunkSyncPlanner(old)
+    for pos, row in enumerate(rows):
+        planner.add(pos, row)
+    plan = planner.finish()
+    assert not plan.updates and len(plan.boilerplate_checks) == len(rows)
+    assert resolve_boilerplate(plan, [False] * len(rows)) == len(rows)
+    assert plan.updates == [
+        {"id": o["id"], "is_boilerplate": False, "is_low_signal": r["is_low_signal"]} for o, r in zip(old, rows)
+    ]
+
+
+SECTION = """
+{title}
+
+• Build data pipelines in Python and SQL for analytics team number {n}
+• Own deployment of machine learning models to production for group {n}
+"""
+PAGES = [(i + 1, SECTION.format(title=t, n=i)) for i, t in enumerate(["Responsibilities", "Qualifications"])]
+
+
+async def _parts(pages):
+    await asyncio.sleep(0)
+    yield pages
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    log: dict[str, list] = {"embed": [], "write": []}
+
+    async def _embed(texts, hashes, engine=None):
+        log["embed"].extend(texts)
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    async def _insert(db, document_id, batch):
+        log["write"].extend((batch.row(i), batch.embeddings[i].tolist()) for i in range(len(batch)))
+        return len(batch)
+
+    monkeypatch.setattr(ingest_pipeline, "embed_with_cache", _embed)
+    monkeypatch.setattr(ingest_pipeline, "insert_chunk_rows", _insert)
+    return log
+
+
+async def test_pipeline_reuses_near_duplicate_embeddings_and_marks_boilerplate(calls):
+    chunks = chunk_jd_pages(PAGES, min_chars=25)
+    assert len(chunks) == 2
+
+    async def _lookup(document_id, batch):
+        assert None not in batch.columns["minhash"] and None not in batch.columns["minhash_bands"]
+        # First chunk: twin in 5 other documents; second: none
+        return [NearDupMatch(5, uuid.uuid4(), 0.9, np.array([0.0, 1.0, 0.0], dtype=np.float32)), None]
+
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _parts(PAGES), [], min_chars=25, max_chunks=300, near_dup_lookup=_lookup,
+    )
+    assert calls["embed"] == [chunks[1].content]
+    (first, first_emb), (second, second_emb) = calls["write"]
+    assert first_emb == [0.0, 1.0, 0.0] and second_emb == [1.0, 0.0, 0.0]
+    assert first["is_boilerplate"] and first["is_low_signal"]
+    assert not second["is_boilerplate"]
+    assert run.near_dup_reused == 1 and run.boilerplate == 1
+    assert run.low_signal == sum(c.is_low_signal for c in chunks) + 1
+
+
+async def test_pipeline_near_dup_without_reusable_embedding_is_still_embedded(calls):
+    async def _lookup(document_id, batch):
+        return [NearDupMatch(1) for _ in range(len(batch))]
+
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _parts(PAGES), [], min_chars=25, max_chunks=300, near_dup_lookup=_lookup,
+    )
+    assert len(calls["embed"]) == run.chunks
+    assert run.near_dup_reused == 0 and run.boilerplate == 0
+    assert not any(row["is_boilerplate"] for row, _ in calls["write"])
+
+
+async def test_pipeline_rechecks_kept_boilerplate_rows(calls):
+    rows = [chunk_row_values(c, i) for i, c in enumerate(chunk_jd_pages(PAGES, min_chars=25))]
+    existing = [
+        {"id": uuid.uuid4(), "content_hash": r["content_hash"], **{f: r[f] for f in META_FIELDS},
+         "is_low_signal": True, "is_boilerplate": True}
+        for r in rows
+    ]
+    looked_up: list[str] = []
+
+    async def _lookup(document_id, batch):
+        looked_up.extend(batch.columns["content"])
+        # First row is still in 5 other sources, the second in none
+        return [NearDupMatch(5), None]
+
+    run = await run_ingest_pipeline(
+        None, uuid.uuid4(), _parts(PAGES), existing, min_chars=25, max_chunks=300, near_dup_lookup=_lookup,
+    )
+    assert not calls["embed"] and looked_up == [r["content"] for r in rows]
+    assert run.boilerplate_cleared == 1
+    assert run.plan.updates == [
+        {"id": existing[1]["id"], "is_boilerplate": False, "is_low_signal": rows[1]["is_low_signal"]}
+    ]
+
+
+# --- find_near_duplicates against the database (needs a migrated DATABASE_URL) ---
+
+
+@pytest.fixture
+async def corpus():
+    """
+    EEO variants in two users' documents. Yields (user_id, document_id, sha256) of the
+    document being ingested and the chunk ids of the two copies of sha-a.
+    """
+    version = current_pipeline_version()
+    async with async_session_maker() as db:
+        owner = User(email=f"nd-{uuid.uuid4().hex[:8]}@t.local")
+        other = User(email=f"nd-{uuid.uuid4().hex[:8]}@t.local")
+        db.add_all([owner, other])
+        await db.flush()
+
+        async def _doc(user: User, sha: str, company: str, pipeline_version: str = version):
+            doc = Document(
+                user_id=user.id,
+                filename=f"{sha}.pdf",
+                s3_key=sha,
+                status="ready",
+                content_sha256=sha,
+                pipeline_version=pipeline_version,
+            )
+            db.add(doc)
+            await db.flush()
+            content = EEO.format(company=company)
+            chunk = DocumentChunk(
+                document_id=doc.id,
+                chunk_index=0,
+                content=content,
+                page_number=1,
+                embedding=[0.5] * 1536,
+                **signature_columns(content),
+            )
+            db.add(chunk)
+            await db.flush()
+            return doc.id, chunk.id
+
+        current, _ = await _doc(owner, "sha-current", "Acme Inc")
+        await _doc(owner, "sha-current", "Acme Inc")  # re-upload of the file being ingested
+        twins = [(await _doc(owner, "sha-a", "Globex Corp"))[1] for _ in range(2)]  # original + clone
+        await _doc(owner, "sha-b", "Initech LLC", pipeline_version="old-model")
+        await _doc(other, "sha-c", "Umbrella Co")  # another user's upload
+        await db.commit()
+        user_ids = [owner.id, other.id]
+    yield (owner.id, current, "sha-current"), twins
+    async with async_session_maker() as db:
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+
+def _batch(*texts: str) -> ChunkBatch:
+    return ChunkBatch.from_rows([{"content": t, **signature_columns(t)} for t in texts])
+
+
+async def _find(scope, batch: ChunkBatch, threshold: float | None = 0.5):
+    user_id, document_id, sha = scope
+    async with async_session_maker() as db:
+        return await find_near_duplicates(
+            db, document_id, batch, user_id=user_id, content_sha256=sha, threshold=threshold
+        )
+
+
+async def test_find_near_duplicates_counts_distinct_sources_of_the_same_user(corpus):
+    scope, twins = corpus
+    near, unrelated = await _find(scope, _batch(EEO.format(company="Hooli Corp"), OTHER))
+    assert unrelated is None
+    # sha-a (original + clone) and sha-b; not the re-upload of this file, not the other user's upload
+    assert near.other_sources == 2
+    # Only sha-a is on the current pipeline version; its copies tie, so the lower id wins
+    assert near.chunk_id == min(twins)
+    assert near.similarity == estimate_similarity(
+        signature_columns(EEO.format(company="Hooli Corp"))["minhash"],
+        signature_columns(EEO.format(company="Globex Corp"))["minhash"],
+    )
+    assert near.embedding.dtype == np.float32 and near.embedding.shape == (1536,)
+
+
+async def test_find_near_duplicates_threshold_and_empty_batch(corpus):
+    scope, _ = corpus
+    assert await _find(scope, _batch(EEO.format(company="Hooli Corp")), threshold=1.01) == [None]
+    assert await _find(scope, _batch()) == []
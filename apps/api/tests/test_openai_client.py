@@ -0,0 +1,40 @@
+"""Tests for the shared AsyncOpenAI client and its users."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import openai_client, qa
+from app.services.openai_client import close_openai_client, get_openai_client
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_and_closed(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    await close_openai_client()
+    client = get_openai_client()
+    assert get_openai_client() is client
+    await close_openai_client()
+    assert client.is_closed()
+    assert openai_client._client is None
+
+
+@pytest.mark.asyncio
+async def test_grounded_answer_awaits_shared_client(monkeypatch):
+    calls = []
+
+    async def _create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content=" Python [p1-c1] ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(qa, "get_openai_client", lambda: fake)
+
+    chunks = [{"chunk_id": "c1", "page_number": 1, "snippet": "Requires Python"}]
+    answer, citations = await qa.generate_grounded_answer("Which language?", chunks)
+    assert answer == "Python [p1-c1]"
+    assert citations[0]["chunk_id"] == "c1"
+    assert calls[0]["model"] == settings.openai_chat_model
@@ -0,0 +1,171 @@
+"""Tests for the PDF extraction process pool."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import pdf_pool
+from app.services.pdf_pool import ExtractionPool, PDFExtractionError, split_page_ranges
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    import fitz
+
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+async def pool():
+    p = ExtractionPool(size=1, timeout_s=20)
+    yield p
+    await p.close()
+
+
+@pytest.mark.asyncio
+async def test_extracts_pages_in_order(pool):
+    pdf = _make_pdf(["First page", "Second page", "Third page"])
+    pages = await pool.extract(pdf, max_pages=2)
+    assert [n for n, _ in pages] == [1, 2]
+    assert "First page" in pages[0][1]
+    assert "Second page" in pages[1][1]
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["recent_jobs"][-1]["outcome"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_bad_pdf_reports_error_and_worker_survives(pool):
+    with pytest.raises(PDFExtractionError):
+        await pool.extract(b"not a pdf", max_pages=5)
+    pages = await pool.extract(_make_pdf(["Still works"]), max_pages=5)
+    assert "Still works" in pages[0][1]
+    assert pool.stats()["restarts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_is_replaced(pool):
+    await pool.start()
+    (worker,) = pool._workers
+    worker.process.kill()
+    worker.process.join()
+
+    with pytest.raises(PDFExtractionError, match="crashed"):
+        await pool.extract(_make_pdf(["x"]), max_pages=1)
+    assert pool.stats()["restarts"] == 1
+
+    pages = await pool.extract(_make_pdf(["After restart"]), max_pages=1)
+    assert "After restart" in pages[0][1]
+
+
+@pytest.mark.asyncio
+async def test_failed_respawn_keeps_slot_and_raises_instead_of_blocking(pool, monkeypatch):
+    monkeypatch.setattr(pdf_pool, "_SPAWN_BACKOFF_S", 0)
+    await pool.start()
+    (worker,) = pool._workers
+    worker.process.kill()
+    worker.process.join()
+    spawn = pool._spawn
+
+    def _broken():
+        raise PDFExtractionError("PDF worker failed to start")
+
+    monkeypatch.setattr(pool, "_spawn", _broken)
+    with pytest.raises(PDFExtractionError, match="crashed"):
+        await pool.extract(_make_pdf(["x"]), max_pages=1)
+    with pytest.raises(PDFExtractionError, match="failed to start"):
+        await asyncio.wait_for(pool.extract(_make_pdf(["x"]), max_pages=1), timeout=10)
+
+    monkeypatch.setattr(pool, "_spawn", spawn)
+    pages = await pool.extract(_make_pdf(["Recovered"]), max_pages=1)
+    assert "Recovered" in pages[0][1]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_replaces_worker_after_its_thread_returns(pool, monkeypatch):
+    await pool.start()
+    (worker,) = pool._workers
+    events: list[str] = []
+
+    def _hang(job, timeout_s):
+        # A job that never answers: the thread polls until the process dies
+        try:
+            if not worker.conn.poll(timeout_s):
+                raise TimeoutError
+            return worker.conn.recv()
+        finally:
+            events.append("thread returned")
+
+    kill = worker.kill
+
+    def _kill():
+        events.append("pipe closed")
+        kill()
+
+    monkeypatch.setattr(worker, "run", _hang)
+    monkeypatch.setattr(worker, "kill", _kill)
+    job = asyncio.ensure_future(pool.extract(_make_pdf(["x"]), max_pages=1))
+    while pool.stats()["running"] == 0:
+        await asyncio.sleep(0)
+    job.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await job
+    await asyncio.wait_for(asyncio.gather(*pool._recycling), timeout=10)
+
+    assert events == ["thread returned", "pipe closed"]
+    assert pool.stats()["restarts"] == 1
+    assert pool.stats()["recent_jobs"][-1]["outcome"] == "cancelled"
+    pages = await pool.extract(_make_pdf(["After cancel"]), max_pages=1)
+    assert "After cancel" in pages[0][1]
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_running_job(pool):
+    await pool.start()
+    job = asyncio.ensure_future(pool.extract(_make_pdf(["In flight"]), max_pages=1))
+    while pool.stats()["running"] == 0:
+        await asyncio.sleep(0)
+    await pool.close()
+    pages = await job
+    assert "In flight" in pages[0][1]
+    assert not pool._workers
+
+
+@pytest.mark.asyncio
+async def test_extracts_from_file_path(pool, tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(_make_pdf(["From disk"]))
+    pages = await pool.extract(str(path), max_pages=5)
+    assert len(pages) == 1
+    assert "From disk" in pages[0][1]
+
+
+def test_split_page_ranges_contiguous_and_bounded():
+    assert split_page_ranges(5, workers=4, min_pages=10) == [(0, 5)]
+    assert split_page_ranges(25, workers=4, min_pages=10) == [(0, 13), (13, 25)]
+    ranges = split_page_ranges(103, workers=4, min_pages=10)
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == 103
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.asyncio
+async def test_page_ranges_split_across_workers_merge_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_min_pages_per_job", 2)
+    path = tmp_path / "long.pdf"
+    path.write_bytes(_make_pdf([f"Page {i}" for i in range(1, 10)]))
+    pool = ExtractionPool(size=3, timeout_s=20)
+    try:
+        pages = await pool.extract(str(path), max_pages=8)
+        assert [n for n, _ in pages] == list(range(1, 9))
+        assert all(f"Page {n}" in text for n, text in pages)
+        assert pool.stats()["completed"] == 4  # page count + 3 ranges
+    finally:
+        await pool.close()
@@ -0,0 +1,69 @@
+"""Unit tests for the Aho-Corasick phrase matcher and JD skill/cloud extraction."""
+
+import random
+
+import pytest
+
+from app.services.jd_extraction import _extract_cloud, _extract_skills_from_text
+from app.services.phrase_matcher import PhraseMatcher, tokenize
+
+
+def test_finds_phrases_and_overlaps():
+    m = PhraseMatcher(
+        [("machine learning", "ml"), ("learning", "learning"), ("google cloud", "gcp"), ("cloud", "cloud")]
+    )
+    assert m.find("Machine Learning on Google Cloud") == ["ml", "learning", "gcp", "cloud"]
+
+
+def test_whole_tokens_only():
+    m = PhraseMatcher([("aws", "aws"), ("node", "node")])
+    assert m.find("Labor laws, nodejs") == []
+    assert m.find("AWS / Node") == ["aws", "node"]
+
+
+def test_phrase_joiners_and_breaks():
+    m = PhraseMatcher([("machine learning", "ml")])
+    assert m.find("machine-learning") == ["ml"]
+    assert m.find("machine  learning") == ["ml"]
+    assert m.find("machine\nlearning") == []
+    assert m.find("machine, learning") == []
+
+
+def test_failure_links_recover_suffix_matches():
+    m = PhraseMatcher([("aa bb cc", "abc"), ("bb cc dd", "bcd"), ("cc", "c")])
+    assert m.find("aa bb aa bb cc dd") == ["abc", "bcd", "c"]
+
+
+def test_rejects_untokenizable_phrase():
+    with pytest.raises(ValueError):
+        PhraseMatcher([("!!", "x")])
+
+
+def test_matches_naive_ngram_scan():
+    rng = random.Random(19)
+    vocab = ["py", "ml", "ops", "data", "eng", "cloud", "go"]
+    phrases = {" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 3))) for _ in range(40)}
+    m = PhraseMatcher((p, p) for p in phrases)
+    for _ in range(500):
+        tokens = [rng.choice(vocab) for _ in range(rng.randint(0, 30))]
+        text = " ".join(tokens)
+        found = {p for p in phrases if f" {p} " in f" {' '.join(tokenize(text))} "}
+        assert set(m.find(text)) == found
+
+
+def test_skill_extraction_includes_phrases():
+    text = "Strong Python and Machine Learning background; REST API design; Docker and Kubernetes"
+    assert _extract_skills_from_text(text) == [
+        "python",
+        "machine learning",
+        "rest api",
+        "api",
+        "docker",
+        "kubernetes",
+    ]
+
+
+def test_cloud_extraction_is_canonical_and_bounded():
+    text = "Deploy to Google Cloud Platform and Amazon Web Services; know labor laws"
+    assert _extract_cloud(text) == ["gcp", "aws"]
+    assert _extract_cloud("AWS, Azure, GCP") == ["aws", "azure", "gcp"]
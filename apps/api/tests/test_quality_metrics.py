@@ -0,0 +1,78 @@
+"""Quality metrics must match the original per-character implementation exactly."""
+
+import random
+import re
+
+import pytest
+
+from app.services.chunking import (
+    EMAIL_RE,
+    PHONE_RE,
+    URL_RE,
+    _compute_quality_metrics,
+    _is_low_signal,
+    _quality_score,
+)
+
+
+def _reference_metrics(text: str) -> dict:
+    """The original implementation, kept verbatim as the oracle."""
+    non_ws = [c for c in text if not c.isspace()]
+    total = len(non_ws)
+    alpha = sum(1 for c in non_ws if c.isalpha())
+    digit = sum(1 for c in non_ws if c.isdigit())
+    words = re.findall(r"\b\w+\b", text.lower())
+    return {
+        "alpha_ratio": alpha / total if total else 0.0,
+        "digit_ratio": digit / total if total else 0.0,
+        "url_count": len(URL_RE.findall(text)),
+        "email_count": len(EMAIL_RE.findall(text)),
+        "phone_count": len(PHONE_RE.findall(text)),
+        "unique_word_ratio": len(set(words)) / len(words) if words else 0.0,
+        "length_chars": len(text),
+    }
+
+
+FIXTURES = [
+    "",
+    "   \n\t ",
+    "Contact us at jobs@acme.com or visit https://acme.com/careers",
+    "Call 555-123-4567 or 555.987.6543 today",
+    "Phone: ５５５１２３４５６７ and ²³⁴ superscripts",
+    "Senior Data Engineer\n\n• Build pipelines in Python and SQL\n• Mentor the team",
+    "Café résumé naïve İstanbul straße ǅemal",
+    "www.example.org/a@b.co http://x.io mail:a.b@c.de",
+    "Aug 2024Â -Â August 2024  　tabs\tand\x0bvt\x1c\x1d",
+    "x" * 500,
+]
+
+_ALPHABET = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJ0123456789     \n\t.,-@:/_+%"
+    "éüßİıΣσ٣５²  ​́"
+)
+_TOKENS = ["http://a.io/x", "www.b.com", "me@site.org", "555-123-4567", "5551234567", "Python", "SQL"]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 40)):
+        if rng.random() < 0.15:
+            parts.append(rng.choice(_TOKENS))
+        else:
+            parts.append("".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12))))
+    return rng.choice(["", " ", "\n"]).join(parts)
+
+
+@pytest.mark.parametrize("text", FIXTURES)
+def test_metrics_match_reference_on_fixtures(text):
+    assert _compute_quality_metrics(text) == _reference_metrics(text)
+
+
+def test_metrics_and_decisions_match_reference_on_random_text():
+    rng = random.Random(16)
+    for _ in range(2000):
+        text = _random_text(rng)
+        got, want = _compute_quality_metrics(text), _reference_metrics(text)
+        assert got == want, text
+        assert _quality_score(got) == _quality_score(want)
+        assert _is_low_signal(got) == _is_low_signal(want)
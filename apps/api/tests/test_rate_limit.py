@@ -160,3 +160,35 @@ async def test_different_users_separate_limits(client, monkeypatch):
             # user-b still has quota
             resp = await client.post("/ask", json=body, headers={"x-user-id": "user-b"})
             assert resp.status_code == 200
+
+
+def test_batch_ingest_path_has_its_own_limit():
+    from app.core.rate_limit import _path_to_route
+
+    assert _path_to_route("/documents/ingest-batch") == "documents/ingest-batch"
+    assert _path_to_route("/documents/ingest-batch/status") is None
+
+
+def test_ingest_document_budget_is_all_or_nothing(monkeypatch):
+    from app.core.rate_limit import consume_ingest_budget
+
+    monkeypatch.setattr(settings, "ingest_documents_per_day", 5)
+    assert consume_ingest_budget("u1", 3) == (True, None, 2)
+    allowed, retry_after, remaining = consume_ingest_budget("u1", 3)
+    assert not allowed and retry_after > 0 and remaining == 2
+    assert consume_ingest_budget("u1", 2) == (True, None, 0)
+    assert consume_ingest_budget("u2", 5) == (True, None, 0)
+    assert consume_ingest_budget("u3", 6)[0] is False
+
+
+def test_batch_ingest_budget_is_separate_and_releasable(monkeypatch):
+    from app.core.rate_limit import consume_ingest_budget, release_ingest_budget
+
+    monkeypatch.setattr(settings, "ingest_documents_per_day", 1)
+    monkeypatch.setattr(settings, "ingest_batch_documents_per_day", 4)
+    assert consume_ingest_budget("u4", 1) == (True, None, 0)
+    assert consume_ingest_budget("u4", 4, batch=True) == (True, None, 0)
+    assert consume_ingest_budget("u4", 1, batch=True)[0] is False
+    release_ingest_budget("u4", 3, batch=True)
+    assert consume_ingest_budget("u4", 3, batch=True) == (True, None, 0)
+    assert consume_ingest_budget("u4", 1)[0] is False
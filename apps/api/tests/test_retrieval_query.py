@@ -0,0 +1,66 @@
+"""Tests for the retrieval SQL (full-precision and quantized two-stage)."""
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models import DocumentChunk
+from app.services.retrieval import _quantized_distance, build_retrieval_query
+
+DOC_ID = uuid.UUID("11111111-1111-1111-1111-111111111111")
+QUERY = [0.1] * 1536
+
+
+def _sql(**kwargs) -> str:
+    stmt = build_retrieval_query(DOC_ID, QUERY, 10, **kwargs)
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_full_precision_query_has_no_candidate_pass():
+    sql = _sql()
+    assert "<=>" in sql
+    assert " IN (SELECT" not in sql
+    assert "is_low_signal = false" in sql
+
+
+def test_short_candidates_use_matryoshka_prefix():
+    stmt = build_retrieval_query(DOC_ID, QUERY, 10, quantization="short", candidates=40)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ORDER BY document_chunks.embedding_short <=> " in sql
+    assert ") ORDER BY (document_chunks.embedding <=> " in sql
+    # Filters are applied in the candidate pass; the outer query orders on the full vectors
+    inner = sql.split(" IN (SELECT", 1)[1]
+    assert "document_chunks.document_id =" in inner
+    # Query side is the re-normalised 256-dim prefix
+    short_query = next(v for k, v in stmt.compile().params.items() if k.startswith("embedding_short"))
+    assert len(short_query) == 256
+
+
+def _index_expression(name: str) -> str:
+    """The indexed expression of a DocumentChunk index, as Postgres receives it."""
+    (index,) = [ix for ix in DocumentChunk.__table__.indexes if ix.name == name]
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    element = ddl.split(" USING hnsw (", 1)[1].rsplit(") WITH", 1)[0]
+    return element.rsplit(" ", 1)[0]  # drop the operator class
+
+
+def test_short_candidate_pass_orders_by_the_index_expression():
+    # The planner only uses the HNSW index when ORDER BY repeats its expression exactly
+    indexed = _index_expression("ix_document_chunks_embedding_short_hnsw")
+    assert indexed == "embedding_short"
+    distance = str(_quantized_distance(QUERY, "short").compile(dialect=postgresql.dialect()))
+    assert distance.startswith(f"document_chunks.{indexed} <=> ")
+    assert f"ORDER BY document_chunks.{indexed} <=> " in _sql(quantization="short", candidates=40)
+
+
+def test_embedding_short_is_the_only_ann_index():
+    # Rerank reads full vectors by id; another HNSW index would only add writes
+    hnsw = [ix.name for ix in DocumentChunk.__table__.indexes if ix.dialect_options["postgresql"]["using"] == "hnsw"]
+    assert hnsw == ["ix_document_chunks_embedding_short_hnsw"]
+
+
+def test_unknown_quantization_rejected():
+    with pytest.raises(ValueError, match="RETRIEVAL_QUANTIZATION"):
+        _sql(quantization="halfvec")
@@ -129,7 +129,7 @@ async def test_retrieve_success_returns_chunks(client, demo_key_off, monkeypatch
     dim = 1536
     mock_vec = [0.1] * dim
 
-    def _mock_embed(q: str):
+    async def _mock_embed(q: str):
         return mock_vec
 
     monkeypatch.setattr("app.services.retrieval.embed_query", _mock_embed)
@@ -193,7 +193,7 @@ async def test_retrieve_returns_section_type_for_jd_doc(client, demo_key_off, mo
     dim = 1536
     mock_vec = [0.1] * dim
 
-    def _mock_embed(q: str):
+    async def _mock_embed(q: str):
         return mock_vec
 
     monkeypatch.setattr("app.services.retrieval.embed_query", _mock_embed)
@@ -0,0 +1,83 @@
+"""Tests for file-backed storage access (local_path)."""
+
+import os
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.services.storage import LocalStorage, S3Storage
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def iter_chunks(self, size: int):
+        for i in range(0, len(self._data), size):
+            yield self._data[i : i + size]
+
+
+class _FakeS3:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.ranges: list[str | None] = []
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.data)}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.ranges.append(Range)
+        if Range is None:
+            return {"Body": _Body(self.data)}
+        start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", Range).groups())
+        return {"Body": _Body(self.data[start : end + 1])}
+
+
+def _s3(data: bytes) -> tuple[S3Storage, _FakeS3]:
+    storage = S3Storage.__new__(S3Storage)
+    storage._client = _FakeS3(data)
+    storage._bucket = "bucket"
+    return storage, storage._client
+
+
+def test_local_storage_yields_stored_file(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    (tmp_path / "a.pdf").write_bytes(b"%PDF-1.4")
+    with storage.local_path("a.pdf") as path:
+        assert path == storage.get_path("a.pdf")
+    assert (tmp_path / "a.pdf").exists()  # not a copy; nothing removed
+
+
+def test_s3_small_object_single_get(monkeypatch):
+    monkeypatch.setattr(settings, "s3_parallel_threshold_mb", 1)
+    data = os.urandom(1000)
+    storage, client = _s3(data)
+    with storage.local_path("k") as path:
+        with open(path, "rb") as f:
+            assert f.read() == data
+    assert client.ranges == [None]
+    assert not os.path.exists(path)
+
+
+def test_s3_large_object_ranged_gets_reassemble(monkeypatch):
+    monkeypatch.setattr(settings, "s3_parallel_threshold_mb", 1)
+    monkeypatch.setattr(settings, "s3_part_size_mb", 1)
+    monkeypatch.setattr(settings, "s3_download_concurrency", 3)
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    storage, client = _s3(data)
+    with storage.local_path("k") as path:
+        with open(path, "rb") as f:
+            assert f.read() == data
+    assert len(client.ranges) == 4
+    assert "bytes=3145728-3145850" in client.ranges
+    assert not os.path.exists(path)
+
+
+def test_s3_temp_file_removed_on_error(monkeypatch):
+    monkeypatch.setattr(settings, "s3_parallel_threshold_mb", 1)
+    storage, _ = _s3(b"x" * 10)
+    with pytest.raises(RuntimeError):
+        with storage.local_path("k") as path:
+            raise RuntimeError("boom")
+    assert not os.path.exists(path)